@@ -25,6 +25,10 @@ def create_app(config_name=None):
     """Application factory pattern"""
     app = Flask(__name__)
     
+    # JSON 응답은 orjson으로 직렬화
+    from app.utils.json_provider import OrjsonProvider
+    app.json = OrjsonProvider(app)
+    
     # Load configuration
     if config_name is None:
         config_name = os.environ.get('FLASK_ENV', 'development')
@@ -50,8 +54,39 @@ def create_app(config_name=None):
     cache.init_app(app, config={'CACHE_TYPE': 'redis',
                                 'CACHE_REDIS_URL': app.config['REDIS_URL']})
     
+    from app.services.cache import tiered_cache
+    from app.services.entity_cache import entity_cache
+    from app.services.fragment_cache import fragment_cache
+    from app.services.edge_cache import edge_cache
+    from app.services.home_feed import home_feed
+    from app.services.snapshots import snapshots
+    from app.services.sync import register_default_feeds
+    from app.services.click_log import click_log
+    from app.services.click_enrichment import click_enricher
+    from app.services.link_resolver import link_resolver
+    from app.services.affiliate_stats import affiliate_stats
+    from app.services.product_search import product_search
+    from app.services.price_refresh import price_refresher
+    from app.services.link_health import link_health
+    from app.services.conversions import conversion_ingest
+    tiered_cache.init_app(app)
+    entity_cache.init_app(app)
+    fragment_cache.init_app(app)
+    edge_cache.init_app(app)
+    home_feed.init_app(app)
+    snapshots.init_app(app)
+    register_default_feeds()
+    click_log.init_app(app)
+    click_enricher.init_app(app)
+    link_resolver.init_app(app)
+    affiliate_stats.init_app(app)
+    product_search.init_app(app)
+    price_refresher.init_app(app)
+    link_health.init_app(app)
+    conversion_ingest.init_app(app)
+    
     # Register blueprints
-    from app.routes import auth, users, businesses, reviews, blog, admin, affiliate
+    from app.routes import auth, users, businesses, reviews, blog, admin, affiliate, home, snapshots as snapshot_routes, sync, redirects
     
     app.register_blueprint(auth.bp, url_prefix='/api/auth')
     app.register_blueprint(users.bp, url_prefix='/api/users')
@@ -60,6 +95,14 @@ def create_app(config_name=None):
     app.register_blueprint(blog.bp, url_prefix='/api/blog')
     app.register_blueprint(affiliate.bp, url_prefix='/api/affiliate')
     app.register_blueprint(admin.bp, url_prefix='/api/admin')
+    app.register_blueprint(home.bp, url_prefix='/api/home')
+    app.register_blueprint(snapshot_routes.bp, url_prefix='/api/snapshots')
+    app.register_blueprint(sync.bp, url_prefix='/api/sync')
+    app.register_blueprint(redirects.bp, url_prefix='/r')
+    
+    # CLI commands
+    from app.commands import register_commands
+    register_commands(app)
     
     # JWT error handlers
     @jwt.expired_token_loader
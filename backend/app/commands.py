@@ -0,0 +1,246 @@
+"""
+Flask CLI 명령
+
+    flask home-feed rebuild    # 홈 피드 문서 재생성 (cron 등으로 주기 실행)
+    flask snapshots publish [NAME ...]    # 정적 스냅샷 발행 (이름 생략 시 전체)
+    flask sync prune [--days N]    # 보관 기간이 지난 동기화 변경 로그 삭제
+    flask clicks worker    # 클릭 스트림/스풀을 데이터베이스에 반영 (상시 실행)
+    flask clicks flush    # 쌓인 클릭을 한 번 반영하고 종료
+    flask clicks enrich    # 부가 정보(기기/브라우저/OS, 국가/도시)가 비어 있는 기존 클릭 채우기
+    flask links backfill-short-codes    # 단축 코드가 없는 기존 제휴 링크에 코드 할당
+    flask links refresh-prices [--loop]    # 제휴 링크 가격/이미지 갱신 (--loop: 상시 실행)
+    flask links check-health    # 활성 제휴 링크 URL 상태 점검 (cron 등으로 주기 실행)
+    flask affiliate-stats rebuild [--days N]    # 원본 클릭/전환에서 통계 집계 재계산
+    flask conversions import PATH [--format F]    # 제휴사 전환 보고서(CSV/NDJSON/JSON) 반영
+"""
+
+import os
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app import db
+
+from app.services.edge_cache import edge_cache
+from app.services.home_feed import home_feed
+from app.services.snapshots import snapshots
+from app.services import sync
+from app.services.click_log import click_log
+from app.services.click_enrichment import click_enricher
+from app.services.price_refresh import price_refresher
+from app.services.link_health import link_health
+from app.services.affiliate_stats import affiliate_stats
+
+home_feed_cli = AppGroup('home-feed', help='홈 피드 관리')
+snapshots_cli = AppGroup('snapshots', help='정적 스냅샷 관리')
+sync_cli = AppGroup('sync', help='델타 동기화 관리')
+clicks_cli = AppGroup('clicks', help='제휴 링크 클릭 로그')
+links_cli = AppGroup('links', help='제휴 링크 관리')
+affiliate_stats_cli = AppGroup('affiliate-stats', help='제휴 링크 통계 집계')
+conversions_cli = AppGroup('conversions', help='제휴 전환 보고')
+
+
+@home_feed_cli.command('rebuild')
+def rebuild_home_feed():
+    """홈 피드 문서를 다시 계산해 캐시에 저장"""
+    feed = home_feed.rebuild()
+    edge_cache.purge('home')
+    click.echo(f"홈 피드 생성 완료 ({feed['generated_at'].isoformat()})")
+
+
+@snapshots_cli.command('publish')
+@click.argument('names', nargs=-1)
+def publish_snapshots(names):
+    """정적 스냅샷을 렌더링해 공유 볼륨에 발행"""
+    unknown = set(names) - set(snapshots.names)
+    if unknown:
+        raise click.BadParameter(f"알 수 없는 스냅샷: {', '.join(sorted(unknown))} "
+                                 f"(가능: {', '.join(snapshots.names)})")
+    
+    manifest = snapshots.publish(*names)
+    for name in names or snapshots.names:
+        entry = manifest[name]
+        click.echo(f"{name}: {entry['url']} ({entry['size']} bytes)")
+
+
+@sync_cli.command('prune')
+@click.option('--days', type=int, default=None, help='보관 기간 (기본: SYNC_CHANGE_LOG_RETENTION_DAYS)')
+def prune_change_log(days):
+    """보관 기간이 지난 변경 로그 삭제 (더 오래된 토큰은 전체 동기화)"""
+    deleted = sync.prune(days)
+    click.echo(f"변경 로그 {deleted}건 삭제")
+
+
+@clicks_cli.command('worker')
+@click.option('--consumer', default=None, help='스트림 컨슈머 이름 (기본: 호스트명-PID)')
+def run_click_worker(consumer):
+    """클릭 스트림/스풀을 계속 읽어 데이터베이스에 반영"""
+    click_log.run_worker(consumer)
+
+
+@clicks_cli.command('flush')
+def flush_clicks():
+    """쌓여 있는 클릭을 모두 반영하고 종료"""
+    click_log.ensure_group()
+    consumer = f'flush-{os.getpid()}'
+    total = 0
+    while True:
+        processed = click_log.flush_stream(consumer, block=False)
+        total += processed
+        if not processed:
+            break
+    total += click_log.flush_spool()
+    click.echo(f"클릭 {total}건 반영")
+
+
+@clicks_cli.command('enrich')
+@click.option('--batch-size', type=int, default=1000, help='커밋 단위')
+def enrich_clicks(batch_size):
+    """부가 정보가 비어 있는 기존 클릭을 ID 순으로 채움"""
+    from sqlalchemy import bindparam, update
+    from app.models.affiliate_link import AffiliateLinkClick
+    
+    clicks = AffiliateLinkClick.__table__
+    columns = ('country', 'city', 'device_type', 'browser', 'os')
+    last_id = ''
+    total = 0
+    try:
+        while True:
+            rows = [
+                row._asdict() for row in db.session.query(
+                    AffiliateLinkClick.id, AffiliateLinkClick.ip_address, AffiliateLinkClick.user_agent
+                ).filter(
+                    AffiliateLinkClick.id > last_id,
+                    AffiliateLinkClick.device_type.is_(None),
+                    AffiliateLinkClick.country.is_(None)
+                ).order_by(AffiliateLinkClick.id).limit(batch_size)
+            ]
+            if not rows:
+                break
+            
+            click_enricher.enrich(rows)
+            db.session.connection().execute(
+                update(clicks).where(clicks.c.id == bindparam('click_id')).values(
+                    {column: bindparam(f'new_{column}') for column in columns}
+                ),
+                [{'click_id': row['id'], **{f'new_{column}': row[column] for column in columns}} for row in rows]
+            )
+            db.session.commit()
+            last_id = rows[-1]['id']
+            total += len(rows)
+    finally:
+        click_enricher.shutdown()
+    click.echo(f"클릭 {total}건 부가 정보 반영")
+
+
+@links_cli.command('backfill-short-codes')
+@click.option('--batch-size', type=int, default=500, help='커밋 단위')
+def backfill_short_codes(batch_size):
+    """단축 코드가 없는 기존 링크에 코드와 /r/<code> 단축 URL 할당"""
+    from app.models.affiliate_link import AffiliateLink
+    
+    site_url = current_app.config.get('SITE_URL', '')
+    total = 0
+    while True:
+        links = AffiliateLink.query.filter(AffiliateLink.short_code.is_(None)).limit(batch_size).all()
+        if not links:
+            break
+        for link in links:
+            link.assign_short_code(site_url)
+        db.session.commit()
+        total += len(links)
+    click.echo(f"단축 코드 {total}건 할당")
+
+
+@links_cli.command('refresh-prices')
+@click.option('--partner', 'names', multiple=True, help='제휴사 (여러 번 지정 가능, 기본: 설정된 전체)')
+@click.option('--max-links', type=int, default=None, help='제휴사별 최대 확인 링크 수')
+@click.option('--loop', is_flag=True, help='PRICE_REFRESH_POLL_INTERVAL마다 반복 실행')
+def refresh_prices(names, max_links, loop):
+    """확인할 때가 된 제휴 링크의 가격/이미지를 제휴사 API에서 갱신"""
+    import time
+    
+    while True:
+        results = price_refresher.run(names or None, max_links)
+        if not results:
+            click.echo("API가 설정된 제휴사가 없습니다.")
+        for name, stats in results.items():
+            click.echo(
+                f"{name}: 확인 {stats.get('checked', 0)}건, 변경 {stats.get('changed', 0)}건, "
+                f"찾지 못함 {stats.get('missing', 0)}건 (확인 필요 {stats.get('review', 0)}건), 실패 {stats.get('failed', 0)}건"
+            )
+        if not loop:
+            break
+        time.sleep(current_app.config.get('PRICE_REFRESH_POLL_INTERVAL', 300))
+
+
+@links_cli.command('check-health')
+@click.option('--max-links', type=int, default=None, help='최대 점검 링크 수')
+def check_link_health(max_links):
+    """활성 제휴 링크의 affiliate_url/original_url을 동시에 요청해 상태 기록"""
+    import time
+    
+    started = time.monotonic()
+    stats = link_health.run(max_links)
+    click.echo(
+        f"링크 {stats.get('checked', 0)}건 점검 ({time.monotonic() - started:.0f}초): "
+        f"정상 {stats.get('ok', 0)}건, 실패 {stats.get('failing', 0)}건, 깨짐 {stats.get('broken', 0)}건"
+    )
+
+
+@affiliate_stats_cli.command('rebuild')
+@click.option('--days', type=int, default=30, help='오늘부터 거슬러 올라갈 일수')
+def rebuild_affiliate_stats(days):
+    """최근 N일의 시간별/일별 집계를 원본 클릭/전환에서 다시 계산 (날짜별 커밋)"""
+    from datetime import datetime, timedelta
+    
+    end_date = datetime.utcnow().date()
+    rebuilt = affiliate_stats.rebuild(end_date - timedelta(days=days - 1), end_date)
+    click.echo(f"통계 집계 {rebuilt}일 재계산")
+
+
+@conversions_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False, allow_dash=True))
+@click.option('--format', 'report_format', type=click.Choice(['auto', 'csv', 'ndjson', 'json']), default='auto',
+              help='보고서 형식 (auto: 확장자로 판단)')
+def import_conversions(path, report_format):
+    """제휴사 전환 보고서를 스트림으로 읽어 청크 단위로 반영 (.gz 지원, -는 표준 입력)"""
+    import gzip
+    import sys
+    
+    from app.services.conversions import conversion_ingest, read_report
+    
+    name = path[:-3] if path.endswith('.gz') else path
+    if report_format == 'auto':
+        extension = os.path.splitext(name)[1].lower()
+        report_format = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}.get(extension, 'json')
+    
+    if path == '-':
+        stream = sys.stdin.buffer
+    else:
+        stream = gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+    with stream:
+        result = conversion_ingest.ingest(read_report(stream, report_format))
+    
+    click.echo(
+        f"전환 {result['received']}건: 추가 {result['inserted']}건, 변경 {result['updated']}건, "
+        f"동일 {result['unchanged']}건, 상태 역행 무시 {result['skipped']}건, 반영 실패 {result['failed']}건"
+    )
+    for error in result['errors'][:20]:
+        click.echo(f"  {error['row'] + 1}번째 행: {error['message']}", err=True)
+    if result['error_count'] > 20:
+        click.echo(f"  ... 외 {result['error_count'] - 20}건", err=True)
+    if result['read_error']:
+        click.echo(f"보고서를 끝까지 읽지 못했습니다 (앞부분만 반영): {result['read_error']}", err=True)
+
+
+def register_commands(app):
+    """CLI 명령 등록"""
+    app.cli.add_command(home_feed_cli)
+    app.cli.add_command(snapshots_cli)
+    app.cli.add_command(sync_cli)
+    app.cli.add_command(clicks_cli)
+    app.cli.add_command(links_cli)
+    app.cli.add_command(affiliate_stats_cli)
+    app.cli.add_command(conversions_cli)
@@ -6,6 +6,9 @@ from .affiliate_link import AffiliateLink
 from .category import Category, Tag
 from .image import Image
 from .notification import Notification
+from .change_log import ChangeLog
+from .affiliate_stats import AffiliateStatsHourly, AffiliateStatsDaily
+from .partner_catalog import CatalogProduct
 
 __all__ = [
     'User',
@@ -16,5 +19,9 @@ __all__ = [
     'Category',
     'Tag',
     'Image',
-    'Notification'
+    'Notification',
+    'ChangeLog',
+    'AffiliateStatsHourly',
+    'AffiliateStatsDaily',
+    'CatalogProduct'
 ]
\ No newline at end of file
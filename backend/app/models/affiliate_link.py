@@ -3,6 +3,13 @@ from datetime import datetime
 import uuid
 from sqlalchemy.dialects.postgresql import ARRAY
 
+# 단축 코드 시퀀스. nextval 한 번이 SHORT_CODE_BLOCK_SIZE개 값을 예약함 (app/services/short_codes.py)
+SHORT_CODE_BLOCK_SIZE = 1000
+short_code_sequence = db.Sequence(
+    'affiliate_short_code_seq', start=SHORT_CODE_BLOCK_SIZE, increment=SHORT_CODE_BLOCK_SIZE,
+    metadata=db.metadata
+)
+
 class AffiliateLink(db.Model):
     __tablename__ = 'affiliate_links'
     
@@ -15,6 +22,8 @@ class AffiliateLink(db.Model):
     product_image = db.Column(db.String(255), nullable=True)
     product_price = db.Column(db.Integer, nullable=True)  # 원 단위
     product_category = db.Column(db.String(100), nullable=True)
+    price_checked_at = db.Column(db.DateTime, nullable=True)  # 제휴사에서 가격/판매 상태를 마지막으로 확인한 시각
+    price_check_misses = db.Column(db.SmallInteger, default=0, nullable=False)  # 연속으로 상품을 찾지 못한 횟수
     
     # 제휴사 정보
     partner = db.Column(db.Enum('coupang', 'naver_shopping', 'gmarket', 'eleventh_street', 
@@ -25,8 +34,16 @@ class AffiliateLink(db.Model):
     # 링크 정보
     original_url = db.Column(db.String(500), nullable=False)
     affiliate_url = db.Column(db.String(500), nullable=False)
+    short_code = db.Column(db.String(16), unique=True, nullable=True)  # base62 단축 코드 (/r/<code>)
     short_url = db.Column(db.String(100), nullable=True)  # 단축 URL
     
+    # 링크 상태 점검 (app/services/link_health.py)
+    health_status = db.Column(db.String(20), nullable=True)  # ok, failing, broken (연속 실패로 표시됨)
+    health_code = db.Column(db.SmallInteger, nullable=True)  # 마지막 점검의 HTTP 상태 코드 (네트워크 오류면 None)
+    health_error = db.Column(db.String(200), nullable=True)
+    health_failures = db.Column(db.SmallInteger, default=0, nullable=False)  # 연속 실패 횟수
+    health_checked_at = db.Column(db.DateTime, nullable=True)
+    
     # 수수료 정보
     commission_rate = db.Column(db.Float, nullable=False)  # 0.05 = 5%
     commission_type = db.Column(db.Enum('percentage', 'fixed', name='commission_types'), 
@@ -64,6 +81,8 @@ class AffiliateLink(db.Model):
         db.Index('idx_affiliate_partner_active', 'partner', 'is_active'),
         db.Index('idx_affiliate_blog_priority', 'blog_post_id', 'priority'),
         db.Index('idx_affiliate_revenue', 'total_revenue'),
+        db.Index('idx_affiliate_health', 'health_status'),
+        db.Index('idx_affiliate_price_due', 'partner', price_checked_at.asc().nulls_first()),
     )
     
     def __repr__(self):
@@ -80,10 +99,13 @@ class AffiliateLink(db.Model):
             'product_category': self.product_category,
             'partner': self.partner,
             'affiliate_url': self.affiliate_url,
+            'short_code': self.short_code,
             'short_url': self.short_url,
             'commission_rate': self.commission_rate,
             'commission_type': self.commission_type,
             'is_active': self.is_active,
+            'health_status': self.health_status,
+            'health_checked_at': self.health_checked_at.isoformat() if self.health_checked_at else None,
             'is_featured': self.is_featured,
             'priority': self.priority,
             'target_keywords': self.target_keywords,
@@ -122,21 +144,30 @@ class AffiliateLink(db.Model):
         
         return click
     
-    def track_conversion(self, user_id=None, order_amount=None, commission_earned=None):
-        """전환 추적"""
+    def track_conversion(self, user_id=None, order_id=None, order_amount=None, commission_earned=None):
+        """전환 추적 (링크 카운터와 시간별/일별 통계 집계를 같은 트랜잭션에서 갱신)"""
+        from app.services.affiliate_stats import RollupBatch, affiliate_stats
+        
+        now = datetime.utcnow()
         conversion = AffiliateLinkConversion(
             affiliate_link_id=self.id,
             user_id=user_id,
+            order_id=order_id,
             order_amount=order_amount,
-            commission_earned=commission_earned or (order_amount * self.commission_rate if order_amount else 0)
+            commission_earned=commission_earned or (order_amount * self.commission_rate if order_amount else 0),
+            created_at=now
         )
         db.session.add(conversion)
         
         self.conversion_count += 1
-        self.last_conversion_at = datetime.utcnow()
+        self.last_conversion_at = now
         if conversion.commission_earned:
             self.total_revenue += conversion.commission_earned
         
+        batch = RollupBatch()
+        batch.add_conversion(self.id, now, conversion.commission_earned)
+        affiliate_stats.apply(batch)
+        
         db.session.commit()
         return conversion
     
@@ -174,12 +205,13 @@ class AffiliateLink(db.Model):
         
         return query.order_by(AffiliateLink.total_revenue.desc()).limit(limit).all()
     
-    @staticmethod
-    def generate_short_url(original_url):
-        """단축 URL 생성 (실제 구현 시 외부 서비스 사용)"""
-        import hashlib
-        hash_object = hashlib.md5(original_url.encode())
-        return f"pet.ly/{hash_object.hexdigest()[:8]}"
+    def assign_short_code(self, site_url=''):
+        """단축 코드와 단축 URL 할당 (이미 있으면 유지)"""
+        if not self.short_code:
+            from app.services.short_codes import short_codes
+            self.short_code = short_codes.allocate()
+        self.short_url = f"{site_url.rstrip('/')}/r/{self.short_code}"
+        return self.short_code
 
 
 class AffiliateLinkClick(db.Model):
@@ -230,11 +262,38 @@ class AffiliateLinkConversion(db.Model):
     status = db.Column(db.Enum('pending', 'confirmed', 'cancelled', name='conversion_status'), 
                       default='pending', nullable=False)
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)  # 전환(주문) 시각, 통계 버킷 기준
     confirmed_at = db.Column(db.DateTime, nullable=True)
+    cancelled_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=True)  # 제휴사 보고로 마지막 갱신한 시각
     
     # 인덱스
     __table_args__ = (
         db.Index('idx_conversion_link_date', 'affiliate_link_id', 'created_at'),
         db.Index('idx_conversion_status', 'status'),
-    )
\ No newline at end of file
+        # 제휴사 보고의 (링크, 주문) 단위 upsert (app/services/conversions.py)
+        db.Index('uq_conversion_link_order', 'affiliate_link_id', 'order_id', unique=True),
+        db.Index('idx_conversion_order', 'order_id'),
+    )
+
+
+class AffiliatePriceHistory(db.Model):
+    """제휴 상품 가격/판매 상태 이력
+
+    링크가 아니라 제휴사 상품 단위로, 가격이나 판매 상태가 바뀐 시점만 기록합니다.
+    """
+    __tablename__ = 'affiliate_price_history'
+    
+    partner = db.Column(db.String(30), primary_key=True)
+    partner_product_id = db.Column(db.String(100), primary_key=True)
+    changed_at = db.Column(db.DateTime, primary_key=True, default=datetime.utcnow)
+    
+    price = db.Column(db.Integer, nullable=True)  # 원 단위
+    is_available = db.Column(db.Boolean, nullable=False)
+    
+    def to_dict(self):
+        return {
+            'changed_at': self.changed_at.isoformat(),
+            'price': self.price,
+            'is_available': self.is_available
+        }
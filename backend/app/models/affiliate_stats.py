@@ -0,0 +1,56 @@
+from app import db
+
+class AffiliateStatsHourly(db.Model):
+    """제휴 링크 시간별 집계 (클릭/전환 반영 시 증분 갱신)
+
+    작성자별 기간 조회를 인덱스 범위 스캔 한 번으로 처리하도록 링크의 작성자(author_id)와
+    제휴사(partner)를 함께 저장합니다. bucket은 UTC 기준 정시입니다.
+    """
+    __tablename__ = 'affiliate_stats_hourly'
+
+    affiliate_link_id = db.Column(db.String(36), db.ForeignKey('affiliate_links.id', ondelete='CASCADE'),
+                                  primary_key=True)
+    bucket = db.Column(db.DateTime, primary_key=True)
+
+    author_id = db.Column(db.String(36), nullable=False)
+    partner = db.Column(db.String(30), nullable=False)
+
+    # 집계 값
+    clicks = db.Column(db.Integer, default=0, nullable=False)
+    unique_visitors = db.Column(db.Integer, default=0, nullable=False)
+    conversions = db.Column(db.Integer, default=0, nullable=False)
+    revenue = db.Column(db.Float, default=0.0, nullable=False)
+
+    # 인덱스
+    __table_args__ = (
+        db.Index('idx_stats_hourly_author_bucket', 'author_id', 'bucket'),
+    )
+
+    def __repr__(self):
+        return f'<AffiliateStatsHourly {self.affiliate_link_id} {self.bucket}>'
+
+
+class AffiliateStatsDaily(db.Model):
+    """제휴 링크 일별 집계 (bucket은 UTC 기준 날짜)"""
+    __tablename__ = 'affiliate_stats_daily'
+
+    affiliate_link_id = db.Column(db.String(36), db.ForeignKey('affiliate_links.id', ondelete='CASCADE'),
+                                  primary_key=True)
+    bucket = db.Column(db.Date, primary_key=True)
+
+    author_id = db.Column(db.String(36), nullable=False)
+    partner = db.Column(db.String(30), nullable=False)
+
+    # 집계 값
+    clicks = db.Column(db.Integer, default=0, nullable=False)
+    unique_visitors = db.Column(db.Integer, default=0, nullable=False)
+    conversions = db.Column(db.Integer, default=0, nullable=False)
+    revenue = db.Column(db.Float, default=0.0, nullable=False)
+
+    # 인덱스
+    __table_args__ = (
+        db.Index('idx_stats_daily_author_bucket', 'author_id', 'bucket'),
+    )
+
+    def __repr__(self):
+        return f'<AffiliateStatsDaily {self.affiliate_link_id} {self.bucket}>'
@@ -2,6 +2,8 @@ from app import db
 from datetime import datetime
 import uuid
 from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import update
+from sqlalchemy.orm.attributes import set_committed_value
 from slugify import slugify
 
 class BlogPost(db.Model):
@@ -138,9 +140,18 @@ class BlogPost(db.Model):
         db.session.commit()
     
     def increment_view(self):
-        """조회수 증가"""
-        self.view_count += 1
-        db.session.commit()
+        """조회수 증가
+
+        별도 트랜잭션의 원자적 UPDATE로 증가시키며, 조회는 내용 변경이 아니므로
+        updated_at(ETag 검증자)은 유지합니다.
+        """
+        with db.engine.begin() as connection:
+            connection.execute(
+                update(BlogPost)
+                .where(BlogPost.id == self.id)
+                .values(view_count=BlogPost.view_count + 1, updated_at=BlogPost.updated_at)
+            )
+        set_committed_value(self, 'view_count', (self.view_count or 0) + 1)
     
     def add_like(self, user_id):
         """좋아요 추가"""
@@ -2,7 +2,8 @@ from app import db
 from datetime import datetime
 import uuid
 from sqlalchemy.dialects.postgresql import ARRAY
-from sqlalchemy import text
+from sqlalchemy import text, update, func
+from sqlalchemy.orm.attributes import set_committed_value
 
 class Business(db.Model):
     __tablename__ = 'businesses'
@@ -145,9 +146,19 @@ class Business(db.Model):
         db.session.commit()
     
     def increment_view(self):
-        """조회수 증가"""
-        self.view_count += 1
-        db.session.commit()
+        """조회수 증가
+
+        캐시에서 복원된 인스턴스의 오래된 값으로 덮어쓰지 않도록 별도 트랜잭션의
+        원자적 UPDATE로 증가시키고, 세션은 만료시키지 않습니다.
+        조회는 내용 변경이 아니므로 updated_at(프래그먼트 캐시 버전)은 유지합니다.
+        """
+        with db.engine.begin() as connection:
+            connection.execute(
+                update(Business)
+                .where(Business.id == self.id)
+                .values(view_count=Business.view_count + 1, updated_at=Business.updated_at)
+            )
+        set_committed_value(self, 'view_count', (self.view_count or 0) + 1)
     
     def get_distance_from(self, lat, lng):
         """지정된 위치로부터의 거리 계산 (km 단위)"""
@@ -169,6 +180,8 @@ class Business(db.Model):
     @staticmethod
     def search_nearby(lat, lng, radius_km=10, category=None, pet_type=None, limit=20):
         """근처 사업체 검색"""
+        from math import cos, radians
+        
         # PostgreSQL의 지리 함수 사용 (실제로는 PostGIS 필요)
         # 여기서는 간단한 박스 검색 사용
         lat_range = radius_km / 111.0  # 위도 1도 ≈ 111km
@@ -188,6 +201,27 @@ class Business(db.Model):
         
         return query.order_by(Business.average_rating.desc()).limit(limit).all()
     
+    @staticmethod
+    def get_category_counts():
+        """카테고리별 승인된 사업체 수 (단일 GROUP BY 쿼리)"""
+        from config import Config
+        
+        counts = dict(
+            db.session.query(Business.category, func.count(Business.id))
+            .filter(Business.status == 'approved')
+            .group_by(Business.category)
+            .all()
+        )
+        
+        return [
+            {
+                'code': category_code,
+                'name': category_code,  # 실제로는 번역된 이름 사용
+                'count': counts.get(category_code, 0)
+            }
+            for category_code in Config.BUSINESS_CATEGORIES
+        ]
+    
     @staticmethod
     def get_featured():
         """추천 사업체 조회"""
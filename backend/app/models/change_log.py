@@ -0,0 +1,35 @@
+from app import db
+from datetime import datetime
+
+class ChangeLog(db.Model):
+    """델타 동기화용 변경 시퀀스
+
+    동기화 대상 엔티티가 flush될 때마다 같은 트랜잭션 안에서 한 행씩 기록됩니다.
+    seq는 기록 순서, xid는 기록한 트랜잭션 ID(txid_current())로, 동기화 토큰의
+    스냅샷 xmin과 함께 커밋 순서가 seq 순서와 다른 트랜잭션을 놓치지 않는 데 사용합니다.
+    """
+    __tablename__ = 'change_log'
+    
+    seq = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    xid = db.Column(db.BigInteger, nullable=False, server_default=db.text('txid_current()'))
+    
+    # 대상 엔티티 ('business', 'category', 'review', 'notification')
+    entity_type = db.Column(db.String(30), nullable=False)
+    entity_id = db.Column(db.String(36), nullable=False)
+    
+    # 사용자별 피드(내 리뷰, 알림)의 소유자, 공개 피드는 NULL
+    scope_user_id = db.Column(db.String(36), nullable=True)
+    
+    op = db.Column(db.Enum('upsert', 'delete', name='change_ops'), nullable=False)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    # 인덱스
+    __table_args__ = (
+        db.Index('idx_change_log_feed_seq', 'entity_type', 'scope_user_id', 'seq'),
+        db.Index('idx_change_log_feed_xid', 'entity_type', 'scope_user_id', 'xid'),
+        db.Index('idx_change_log_created', 'created_at'),
+    )
+    
+    def __repr__(self):
+        return f'<ChangeLog {self.seq} {self.op} {self.entity_type}:{self.entity_id}>'
@@ -0,0 +1,65 @@
+from app import db
+from datetime import datetime
+import uuid
+
+# 제휴사 → 프론트엔드 플랫폼 이름
+PLATFORMS = {'naver_shopping': 'naver'}
+
+class CatalogProduct(db.Model):
+    """제휴사 상품 로컬 카탈로그
+
+    제휴사 검색 API 결과를 (partner, partner_product_id)로 upsert해 두고, 상품 검색은 먼저
+    이 테이블에서 찾습니다. 이름 검색용 pg_trgm 인덱스는 migrations/init_db.py에서 만듭니다.
+    """
+    __tablename__ = 'partner_catalog'
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    partner = db.Column(db.String(30), nullable=False)
+    partner_product_id = db.Column(db.String(100), nullable=False)
+
+    # 상품 정보
+    name = db.Column(db.String(300), nullable=False)
+    price = db.Column(db.Integer, nullable=True)  # 원 단위
+    image_url = db.Column(db.String(500), nullable=True)
+    category = db.Column(db.String(100), nullable=True)
+    rating = db.Column(db.Float, nullable=True)
+    review_count = db.Column(db.Integer, nullable=True)
+
+    # 링크 정보
+    product_url = db.Column(db.String(500), nullable=False)
+    affiliate_url = db.Column(db.String(500), nullable=False)
+    commission_rate = db.Column(db.Float, nullable=True)  # 0.05 = 5%
+
+    is_available = db.Column(db.Boolean, default=True, nullable=False)
+
+    # 타임스탬프
+    fetched_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)  # 제휴사에서 마지막으로 받은 시각
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    # 인덱스
+    __table_args__ = (
+        db.UniqueConstraint('partner', 'partner_product_id', name='uq_partner_catalog_product'),
+        db.Index('idx_partner_catalog_fetched', 'partner', 'fetched_at'),
+    )
+
+    def __repr__(self):
+        return f'<CatalogProduct {self.partner}:{self.partner_product_id}>'
+
+    def to_dict(self):
+        """상품 검색 응답 형태 (commission_rate는 % 단위)"""
+        return {
+            'id': f'{self.partner}:{self.partner_product_id}',
+            'partner': self.partner,
+            'partner_product_id': self.partner_product_id,
+            'platform': PLATFORMS.get(self.partner, self.partner),
+            'name': self.name,
+            'price': self.price,
+            'image_url': self.image_url,
+            'category': self.category,
+            'product_url': self.product_url,
+            'affiliate_url': self.affiliate_url,
+            'rating': self.rating,
+            'review_count': self.review_count,
+            'commission_rate': round(self.commission_rate * 100, 2) if self.commission_rate is not None else None,
+            'is_available': self.is_available
+        }
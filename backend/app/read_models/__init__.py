@@ -0,0 +1,17 @@
+"""
+조회 전용 읽기 모델
+
+목록 API에서 ORM 인스턴스(identity map, 속성 계측) 대신 필요한 컬럼만 선택해
+튜플 행을 __slots__ 데이터클래스로 매핑하고 바로 직렬화합니다.
+쓰기와 단건 조회는 기존 ORM 모델을 사용합니다.
+"""
+
+from .business import BusinessSummary
+from .review import ReviewSummary
+from .blog_post import BlogPostSummary
+
+__all__ = [
+    'BusinessSummary',
+    'ReviewSummary',
+    'BlogPostSummary'
+]
@@ -0,0 +1,38 @@
+from dataclasses import fields
+
+
+class ReadModel:
+    """슬롯 데이터클래스 읽기 모델 공통 기능
+
+    하위 클래스는 필드 순서와 같은 순서의 컬럼 목록을 columns()로 제공합니다.
+    to_dict()의 날짜/시간 값은 문자열로 바꾸지 않고 JSON 프로바이더(orjson)가
+    ISO 8601로 직렬화합니다.
+    """
+
+    __slots__ = ()
+
+    # 기본 ORM 모델 (하위 클래스에서 지정)
+    model = None
+
+    @classmethod
+    def columns(cls):
+        raise NotImplementedError
+
+    @classmethod
+    def select_from(cls, query):
+        """필터/정렬이 적용된 ORM 쿼리를 이 모델의 컬럼만 선택하는 쿼리로 변환"""
+        return query.with_entities(*cls.columns())
+
+    @classmethod
+    def from_rows(cls, rows):
+        return [cls(*row) for row in rows]
+
+    @classmethod
+    def load(cls, ids):
+        """ID 목록으로 조회해 {id: 읽기 모델} 반환"""
+        query = cls.model.query.filter(cls.model.id.in_(ids))
+        return {item.id: item for item in cls.from_rows(cls.select_from(query).all())}
+
+    @classmethod
+    def field_names(cls):
+        return [field.name for field in fields(cls)]
@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from app.models.blog_post import BlogPost
+from app.models.user import User
+from .base import ReadModel
+
+
+@dataclass(slots=True)
+class BlogPostSummary(ReadModel):
+    """블로그 포스트 목록 항목 (본문 제외, 작성자 포함)"""
+    model = BlogPost
+
+    id: str
+    title: str
+    slug: str
+    excerpt: Optional[str]
+    category: str
+    featured_image: Optional[str]
+    status: str
+    view_count: int
+    like_count: int
+    tags: Optional[list]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    author_id: Optional[str]
+    author_name: Optional[str]
+    author_email: Optional[str]
+
+    @classmethod
+    def columns(cls):
+        post_fields = [name for name in cls.field_names() if not name.startswith('author_')]
+        return [getattr(BlogPost, name) for name in post_fields] + [
+            User.id, User.name, User.email
+        ]
+
+    @classmethod
+    def select_from(cls, query):
+        """작성자는 다대일 관계이므로 JOIN해도 행 수가 늘어나지 않음"""
+        return query.outerjoin(User, BlogPost.author_id == User.id).with_entities(*cls.columns())
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'slug': self.slug,
+            'excerpt': self.excerpt,
+            'category': self.category,
+            'featured_image': self.featured_image,
+            'status': self.status,
+            'view_count': self.view_count,
+            'like_count': self.like_count,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'author': {
+                'id': self.author_id,
+                'name': self.author_name,
+                'email': self.author_email
+            } if self.author_id is not None else None,
+            'tags': self.tags or []
+        }
@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from app.models.business import Business
+from .base import ReadModel
+
+
+@dataclass(slots=True)
+class BusinessSummary(ReadModel):
+    """사업체 목록 항목 (Business.to_dict()와 같은 형태)"""
+    model = Business
+
+    id: str
+    name: str
+    description: Optional[str]
+    category: str
+    phone: Optional[str]
+    website: Optional[str]
+    address: str
+    address_detail: Optional[str]
+    latitude: float
+    longitude: float
+    business_hours: Any
+    holiday_info: Optional[str]
+    parking_available: Optional[bool]
+    wifi_available: Optional[bool]
+    outdoor_seating: Optional[bool]
+    pet_allowed_types: Optional[list]
+    pet_size_limit: Optional[str]
+    pet_fee: Optional[int]
+    pet_facilities: Any
+    pet_rules: Optional[str]
+    main_image: Optional[str]
+    gallery_images: Optional[list]
+    status: str
+    is_premium: bool
+    is_featured: bool
+    view_count: int
+    favorite_count: int
+    review_count: int
+    average_rating: float
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def columns(cls):
+        return [getattr(Business, name) for name in cls.field_names()]
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description,
+            'category': self.category,
+            'phone': self.phone,
+            'website': self.website,
+            'address': self.address,
+            'address_detail': self.address_detail,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+            'business_hours': self.business_hours,
+            'holiday_info': self.holiday_info,
+            'parking_available': self.parking_available,
+            'wifi_available': self.wifi_available,
+            'outdoor_seating': self.outdoor_seating,
+            'pet_allowed_types': self.pet_allowed_types,
+            'pet_size_limit': self.pet_size_limit,
+            'pet_fee': self.pet_fee,
+            'pet_facilities': self.pet_facilities,
+            'pet_rules': self.pet_rules,
+            'main_image': self.main_image,
+            'gallery_images': self.gallery_images,
+            'status': self.status,
+            'is_premium': self.is_premium,
+            'is_featured': self.is_featured,
+            'view_count': self.view_count,
+            'favorite_count': self.favorite_count,
+            'review_count': self.review_count,
+            'average_rating': self.average_rating,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
+
+    def get_distance_from(self, lat, lng):
+        """지정된 위치로부터의 거리 계산 (km 단위)"""
+        return Business.get_distance_from(self, lat, lng)
@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Optional
+
+from app.models.review import Review
+from app.models.user import User
+from .base import ReadModel
+
+
+@dataclass(slots=True)
+class ReviewSummary(ReadModel):
+    """리뷰 목록 항목 (Review.to_dict()와 같은 형태, 작성자 포함)"""
+    model = Review
+
+    id: str
+    rating: int
+    title: Optional[str]
+    content: str
+    images: Optional[list]
+    pet_type: Optional[str]
+    pet_size: Optional[str]
+    visited_with_pet: bool
+    cleanliness_rating: Optional[int]
+    service_rating: Optional[int]
+    facilities_rating: Optional[int]
+    pet_friendliness_rating: Optional[int]
+    tags: Optional[list]
+    visit_purpose: Optional[str]
+    status: str
+    is_verified: Optional[bool]
+    helpful_count: int
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    visit_date: Optional[date]
+    author_id: Optional[str]
+    author_name: Optional[str]
+    author_nickname: Optional[str]
+    author_profile_image: Optional[str]
+
+    @classmethod
+    def columns(cls):
+        review_fields = [name for name in cls.field_names() if not name.startswith('author_')]
+        return [getattr(Review, name) for name in review_fields] + [
+            User.id, User.name, User.nickname, User.profile_image
+        ]
+
+    @classmethod
+    def select_from(cls, query):
+        """작성자는 다대일 관계이므로 JOIN해도 행 수가 늘어나지 않음"""
+        return query.outerjoin(User, Review.user_id == User.id).with_entities(*cls.columns())
+
+    def to_dict(self):
+        data = {
+            'id': self.id,
+            'rating': self.rating,
+            'title': self.title,
+            'content': self.content,
+            'images': self.images,
+            'pet_type': self.pet_type,
+            'pet_size': self.pet_size,
+            'visited_with_pet': self.visited_with_pet,
+            'cleanliness_rating': self.cleanliness_rating,
+            'service_rating': self.service_rating,
+            'facilities_rating': self.facilities_rating,
+            'pet_friendliness_rating': self.pet_friendliness_rating,
+            'tags': self.tags,
+            'visit_purpose': self.visit_purpose,
+            'status': self.status,
+            'is_verified': self.is_verified,
+            'helpful_count': self.helpful_count,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'visit_date': self.visit_date
+        }
+
+        if self.author_id is not None:
+            data['author'] = {
+                'id': self.author_id,
+                'name': self.author_name,
+                'nickname': self.author_nickname,
+                'profile_image': self.author_profile_image
+            }
+
+        return data
@@ -1,6 +1,7 @@
-from flask import Blueprint
-from flask_jwt_extended import jwt_required
+from flask import Blueprint, request
+from flask_jwt_extended import jwt_required, get_jwt
 import json
+from app.services.edge_cache import edge_cache
 
 # Blueprint 생성 - 기본 구조만
 bp = Blueprint('admin', __name__)
@@ -15,4 +16,18 @@ def admin_dashboard():
 @jwt_required()
 def approve_business(business_id):
     """사업체 승인 - 추후 구현"""
-    return {'message': f'Business {business_id} Approval API - 추후 구현'}, 200
\ No newline at end of file
+    return {'message': f'Business {business_id} Approval API - 추후 구현'}, 200
+
+@bp.route('/cache/purge', methods=['POST'])
+@jwt_required()
+def purge_edge_cache():
+    """Surrogate-Key로 nginx 캐시 퍼지 - {"keys": ["business:<id>", "business-lists"]}"""
+    if get_jwt().get('role') != 'admin':
+        return {'message': '관리자만 사용할 수 있습니다.'}, 403
+    
+    keys = (request.get_json(silent=True) or {}).get('keys') or []
+    if not isinstance(keys, list) or not all(isinstance(key, str) and key for key in keys):
+        return {'message': 'keys는 문자열 목록이어야 합니다.'}, 400
+    
+    purged = edge_cache.purge(*keys)
+    return {'success': True, 'data': {'keys': keys, 'purged': purged}}, 200
@@ -1,17 +1,42 @@
-from flask import Blueprint, request, jsonify, redirect
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import desc, and_
+from flask import Blueprint, request, jsonify, redirect, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import desc, and_, func
 from sqlalchemy.orm import joinedload
 from datetime import datetime, timedelta
 import requests
 import json
+import io
 from app import db
 from app.models.affiliate_link import AffiliateLink
 from app.models.blog_post import BlogPost
 from app.models.user import User
+from app.utils.pagination import paginate
+from app.services.affiliate_stats import affiliate_stats
+from app.services.click_log import click_log
+from app.services.link_resolver import link_resolver
+from app.services.conversions import conversion_ingest, read_report, verify_signature
+from app.services.partners import PARTNER_ALIASES
+from app.services.product_search import MAX_RESULTS, product_search
 
 bp = Blueprint('affiliate', __name__)
 
+# 전환 웹훅 Content-Type → 보고 형식
+REPORT_FORMATS = {
+    'text/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'application/json': 'json',
+}
+
+def get_optional_user_id():
+    """로그인한 경우 사용자 ID (토큰이 없거나 만료되었으면 None)"""
+    try:
+        if verify_jwt_in_request(optional=True):
+            return get_jwt_identity()
+    except Exception:
+        pass
+    return None
+
 @bp.route('/links', methods=['GET'])
 @jwt_required()
 def get_affiliate_links():
@@ -21,32 +46,36 @@ def get_affiliate_links():
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 20, type=int), 50)
         platform = request.args.get('platform', '')
+        health = request.args.get('health', '')  # ok, failing, broken
         
         query = AffiliateLink.query.options(
             joinedload(AffiliateLink.blog_post)
         ).join(BlogPost).filter(BlogPost.author_id == user_id)
         
         if platform:
-            query = query.filter(AffiliateLink.platform == platform)
+            query = query.filter(AffiliateLink.partner == PARTNER_ALIASES.get(platform, platform))
+        
+        if health:
+            query = query.filter(AffiliateLink.health_status == health)
         
         query = query.order_by(desc(AffiliateLink.created_at))
         
-        paginated = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        paginated = paginate(query, page, per_page)
         
         links = []
         for link in paginated.items:
             link_data = {
                 'id': link.id,
                 'product_name': link.product_name,
-                'product_url': link.product_url,
+                'product_url': link.original_url,
                 'affiliate_url': link.affiliate_url,
-                'platform': link.platform,
+                'platform': link.partner,
                 'commission_rate': link.commission_rate,
                 'click_count': link.click_count,
                 'conversion_count': link.conversion_count,
-                'total_earnings': link.total_earnings,
+                'total_earnings': link.total_revenue,
+                'health_status': link.health_status,
+                'health_checked_at': link.health_checked_at.isoformat() if link.health_checked_at else None,
                 'created_at': link.created_at.isoformat(),
                 'blog_post': {
                     'id': link.blog_post.id,
@@ -65,6 +94,7 @@ def get_affiliate_links():
                     'pages': paginated.pages,
                     'per_page': paginated.per_page,
                     'total': paginated.total,
+                    'count': paginated.count,
                     'has_next': paginated.has_next,
                     'has_prev': paginated.has_prev
                 }
@@ -81,20 +111,27 @@ def create_affiliate_link():
     try:
         data = request.get_json()
         
+        # 이전 클라이언트의 필드 이름(product_url, platform)도 허용
+        data.setdefault('original_url', data.get('product_url'))
+        data.setdefault('partner', data.get('platform'))
+        
         # Validate required fields
-        required_fields = ['product_name', 'product_url', 'affiliate_url', 'platform']
+        required_fields = ['product_name', 'original_url', 'affiliate_url', 'partner', 'blog_post_id']
         for field in required_fields:
             if not data.get(field):
                 return {'message': f'{field} 필드는 필수입니다.'}, 400
         
         affiliate_link = AffiliateLink(
             product_name=data['product_name'],
-            product_url=data['product_url'],
+            original_url=data['original_url'],
             affiliate_url=data['affiliate_url'],
-            platform=data['platform'],
+            partner=PARTNER_ALIASES.get(data['partner'], data['partner']),
+            partner_product_id=data.get('partner_product_id'),
             commission_rate=data.get('commission_rate', 0.0),
-            blog_post_id=data.get('blog_post_id')
+            blog_post_id=data['blog_post_id']
         )
+        # 시퀀스 블록에서 할당하므로 중복 확인 없이 바로 저장
+        affiliate_link.assign_short_code(current_app.config.get('SITE_URL', ''))
         
         db.session.add(affiliate_link)
         db.session.commit()
@@ -105,7 +142,9 @@ def create_affiliate_link():
                 'affiliate_link': {
                     'id': affiliate_link.id,
                     'product_name': affiliate_link.product_name,
-                    'platform': affiliate_link.platform
+                    'partner': affiliate_link.partner,
+                    'short_code': affiliate_link.short_code,
+                    'short_url': affiliate_link.short_url
                 }
             },
             'message': '제휴 링크가 성공적으로 생성되었습니다.'
@@ -115,55 +154,65 @@ def create_affiliate_link():
         db.session.rollback()
         return {'message': f'제휴 링크 생성 실패: {str(e)}'}, 500
 
-@bp.route('/links/<int:link_id>/click', methods=['POST'])
+def follow_link(key):
+    """링크 ID 또는 단축 코드로 클릭을 기록하고 제휴 URL로 리다이렉트"""
+    # 메모리 리다이렉트 테이블 조회 (데이터베이스 조회 없음)
+    target = link_resolver.resolve(key)
+    if not target:
+        return {'message': '제휴 링크를 찾을 수 없습니다.'}, 404
+    
+    if not target.is_available():
+        return {'message': '만료되었거나 비활성화된 제휴 링크입니다.'}, 410
+    
+    # 클릭은 버퍼에만 기록하고 데이터베이스 반영은 워커가 처리 (리다이렉트 지연 없음)
+    click_log.record(
+        target.id,
+        user_id=get_optional_user_id(),
+        ip_address=request.headers.get('X-Real-IP', request.remote_addr),
+        user_agent=request.headers.get('User-Agent', ''),
+        referrer=request.headers.get('Referer', '')
+    )
+    
+    # Redirect to affiliate URL
+    return redirect(target.affiliate_url, code=302)
+
+@bp.route('/links/<link_id>/click', methods=['GET', 'POST'])
 def track_affiliate_click(link_id):
-    """제휴 링크 클릭 추적 및 리다이렉트"""
+    """제휴 링크 클릭 추적 및 리다이렉트 (링크 ID 또는 단축 코드)"""
     try:
-        link = AffiliateLink.query.filter_by(id=link_id).first()
-        if not link:
-            return {'message': '제휴 링크를 찾을 수 없습니다.'}, 404
-        
-        # Increment click count
-        link.click_count += 1
-        link.last_clicked_at = datetime.utcnow()
-        db.session.commit()
-        
-        # Get client information for tracking
-        user_agent = request.headers.get('User-Agent', '')
-        referrer = request.headers.get('Referer', '')
-        ip_address = request.remote_addr
-        
-        # Track click event (could be logged to analytics service)
-        click_data = {
-            'link_id': link.id,
-            'timestamp': datetime.utcnow().isoformat(),
-            'user_agent': user_agent,
-            'referrer': referrer,
-            'ip_address': ip_address
-        }
-        
-        # Redirect to affiliate URL
-        return redirect(link.affiliate_url, code=302)
+        return follow_link(link_id)
         
     except Exception as e:
         return {'message': f'링크 추적 실패: {str(e)}'}, 500
 
-@bp.route('/links/<int:link_id>/conversion', methods=['POST'])
+@bp.route('/links/<link_id>/conversion', methods=['POST'])
 def track_affiliate_conversion(link_id):
     """제휴 링크 구매 전환 추적"""
     try:
-        data = request.get_json()
+        data = request.get_json() or {}
         
         link = AffiliateLink.query.filter_by(id=link_id).first()
         if not link:
             return {'message': '제휴 링크를 찾을 수 없습니다.'}, 404
         
-        # Update conversion data
-        link.conversion_count += 1
-        link.total_earnings += data.get('commission_amount', 0.0)
-        link.last_conversion_at = datetime.utcnow()
-        
-        db.session.commit()
+        if data.get('order_id'):
+            # 주문 번호가 있으면 제휴사 보고와 같은 (링크, 주문) upsert로 반영 (재전송해도 한 번만 집계)
+            result = conversion_ingest.ingest([{
+                'link': link.id,
+                'order_id': data['order_id'],
+                'order_amount': data.get('order_amount'),
+                'commission': data.get('commission_amount') or None
+            }])
+            if result['errors']:
+                return {'message': result['errors'][0]['message']}, 400
+        else:
+            # Update conversion data (링크 카운터 + 통계 집계)
+            link.track_conversion(
+                user_id=get_optional_user_id(),
+                order_id=data.get('order_id'),
+                order_amount=data.get('order_amount'),
+                commission_earned=data.get('commission_amount', 0.0)
+            )
         
         return {
             'success': True,
@@ -174,10 +223,43 @@ def track_affiliate_conversion(link_id):
         db.session.rollback()
         return {'message': f'전환 추적 실패: {str(e)}'}, 500
 
+@bp.route('/conversions/bulk', methods=['POST'])
+def ingest_conversions():
+    """제휴사 전환 일괄 보고 웹훅 (JSON, NDJSON, CSV)
+    
+    본문의 HMAC-SHA256 서명(X-Signature: sha256=<hex>, 키 AFFILIATE_WEBHOOK_SECRET)이 맞아야 합니다.
+    중간에 읽을 수 없는 부분이 있으면 그 전까지 반영한 요약과 read_error를 200으로 반환합니다.
+    """
+    try:
+        secret = current_app.config.get('AFFILIATE_WEBHOOK_SECRET')
+        if not secret:
+            return {'message': '전환 웹훅이 설정되지 않았습니다.'}, 403
+        
+        body = request.get_data(cache=False)
+        if not verify_signature(secret, body, request.headers.get('X-Signature')):
+            return {'message': '서명이 올바르지 않습니다.'}, 401
+        
+        report_format = REPORT_FORMATS.get(request.mimetype, 'json')
+        result = conversion_ingest.ingest(read_report(io.BytesIO(body), report_format))
+        
+        if result['read_error'] and not result['received']:
+            # 한 행도 읽지 못함 (반영된 것 없음)
+            return {'message': f"보고 형식 오류: {result['read_error']}", 'data': result}, 400
+        
+        # 중간에 읽기 오류가 있으면 그 전까지 반영한 결과와 read_error를 함께 반환
+        return {
+            'success': True,
+            'data': result
+        }, 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return {'message': f'전환 반영 실패: {str(e)}'}, 500
+
 @bp.route('/stats', methods=['GET'])
 @jwt_required()
 def get_affiliate_stats():
-    """제휴 마케팅 통계 조회"""
+    """제휴 마케팅 통계 조회 (시간별/일별 집계 범위 조회)"""
     try:
         user_id = get_jwt_identity()
         period = request.args.get('period', 'month')  # day, week, month, year
@@ -195,57 +277,56 @@ def get_affiliate_stats():
         else:
             start_date = now - timedelta(days=30)
         
-        # Get affiliate links for user's blog posts
-        links = db.session.query(AffiliateLink).join(BlogPost).filter(
+        summary = affiliate_stats.summary(user_id, start_date, now)
+        totals = summary['totals']
+        
+        # 기간 중 생성한 링크 수 (제휴사별)
+        link_counts = dict(db.session.query(AffiliateLink.partner, func.count(AffiliateLink.id)).join(BlogPost).filter(
             BlogPost.author_id == user_id,
             AffiliateLink.created_at >= start_date
-        ).all()
+        ).group_by(AffiliateLink.partner).all())
         
         # Calculate statistics
-        total_links = len(links)
-        total_clicks = sum(link.click_count for link in links)
-        total_conversions = sum(link.conversion_count for link in links)
-        total_earnings = sum(link.total_earnings for link in links)
+        total_clicks = totals['clicks']
+        total_conversions = totals['conversions']
         conversion_rate = (total_conversions / total_clicks * 100) if total_clicks > 0 else 0
         
         # Platform breakdown
         platform_stats = {}
-        for link in links:
-            platform = link.platform
-            if platform not in platform_stats:
-                platform_stats[platform] = {
-                    'links': 0,
-                    'clicks': 0,
-                    'conversions': 0,
-                    'earnings': 0.0
-                }
-            platform_stats[platform]['links'] += 1
-            platform_stats[platform]['clicks'] += link.click_count
-            platform_stats[platform]['conversions'] += link.conversion_count
-            platform_stats[platform]['earnings'] += link.total_earnings
+        for platform in set(link_counts) | set(summary['by_partner']):
+            partner_totals = summary['by_partner'].get(platform, {})
+            platform_stats[platform] = {
+                'links': link_counts.get(platform, 0),
+                'clicks': partner_totals.get('clicks', 0),
+                'unique_visitors': partner_totals.get('unique_visitors', 0),
+                'conversions': partner_totals.get('conversions', 0),
+                'earnings': round(partner_totals.get('revenue', 0.0), 2)
+            }
         
         # Top performing links
-        top_links = sorted(links, key=lambda x: x.click_count, reverse=True)[:5]
-        top_links_data = []
-        for link in top_links:
-            top_links_data.append({
-                'id': link.id,
-                'product_name': link.product_name,
-                'platform': link.platform,
-                'clicks': link.click_count,
-                'conversions': link.conversion_count,
-                'earnings': link.total_earnings
-            })
+        top_links_data = [
+            {
+                'id': link['id'],
+                'product_name': link['product_name'],
+                'platform': link['partner'],
+                'clicks': link['clicks'],
+                'unique_visitors': link['unique_visitors'],
+                'conversions': link['conversions'],
+                'earnings': round(link['revenue'], 2)
+            }
+            for link in summary['top_links']
+        ]
         
         return {
             'success': True,
             'data': {
                 'period': period,
                 'total_stats': {
-                    'total_links': total_links,
+                    'total_links': sum(link_counts.values()),
                     'total_clicks': total_clicks,
+                    'unique_visitors': totals['unique_visitors'],
                     'total_conversions': total_conversions,
-                    'total_earnings': round(total_earnings, 2),
+                    'total_earnings': round(totals['revenue'], 2),
                     'conversion_rate': round(conversion_rate, 2)
                 },
                 'platform_stats': platform_stats,
@@ -257,64 +338,32 @@ def get_affiliate_stats():
         return {'message': f'통계 조회 실패: {str(e)}'}, 500
 
 @bp.route('/products/search', methods=['GET'])
+@jwt_required()
 def search_affiliate_products():
-    """제휴 상품 검색 (외부 API 연동)"""
+    """제휴 상품 검색 (외부 API 연동, 글 작성자용)"""
     try:
-        query = request.args.get('query', '')
-        platform = request.args.get('platform', 'coupang')
-        limit = min(request.args.get('limit', 20, type=int), 50)
+        query = request.args.get('query', '').strip()
+        platform = request.args.get('platform', 'coupang')  # 비우면 전체 제휴사
+        limit = max(1, min(request.args.get('limit', 20, type=int), MAX_RESULTS))
         
         if not query:
             return {'message': '검색어를 입력해주세요.'}, 400
         
-        products = []
-        
-        if platform == 'coupang':
-            # Coupang Partners API integration (mock implementation)
-            # In real implementation, use actual Coupang Partners API
-            mock_products = [
-                {
-                    'id': f'coupang_{i}',
-                    'name': f'{query} 관련 상품 {i+1}',
-                    'price': 29900 + (i * 5000),
-                    'image_url': 'https://via.placeholder.com/200x200',
-                    'product_url': f'https://www.coupang.com/vp/products/{1234567+i}',
-                    'affiliate_url': f'https://link.coupang.com/a/{1234567+i}',
-                    'rating': 4.0 + (i % 2) * 0.5,
-                    'review_count': 100 + (i * 50),
-                    'commission_rate': 3.0 + (i % 3)
-                }
-                for i in range(min(limit, 10))
-            ]
-            products.extend(mock_products)
-        
-        elif platform == 'naver':
-            # Naver Shopping API integration (mock implementation)
-            mock_products = [
-                {
-                    'id': f'naver_{i}',
-                    'name': f'{query} 네이버 상품 {i+1}',
-                    'price': 25900 + (i * 3000),
-                    'image_url': 'https://via.placeholder.com/200x200',
-                    'product_url': f'https://shopping.naver.com/products/{7654321-i}',
-                    'affiliate_url': f'https://naver.me/{7654321-i}',
-                    'rating': 4.2 + (i % 2) * 0.3,
-                    'review_count': 80 + (i * 30),
-                    'commission_rate': 2.5 + (i % 2)
-                }
-                for i in range(min(limit, 8))
-            ]
-            products.extend(mock_products)
+        result = product_search.search(query, partner=platform, limit=limit)
         
         return {
             'success': True,
             'data': {
                 'query': query,
                 'platform': platform,
-                'products': products
+                'products': result['products'],
+                # 응답하지 않은 제휴사 (결과가 일부만 포함됨)
+                'failed_partners': result['failed']
             }
         }, 200
         
+    except ValueError as e:
+        return {'message': str(e)}, 400
     except Exception as e:
         return {'message': f'상품 검색 실패: {str(e)}'}, 500
 
@@ -376,47 +425,31 @@ def get_recommended_products():
 @bp.route('/earnings/report', methods=['GET'])
 @jwt_required()
 def get_earnings_report():
-    """수익 리포트 생성"""
+    """수익 리포트 생성 (일별 집계 범위 조회, 기본 최근 30일)"""
     try:
         user_id = get_jwt_identity()
-        start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
+        start_date = request.args.get('start_date')
         
-        query = db.session.query(AffiliateLink).join(BlogPost).filter(
-            BlogPost.author_id == user_id
-        )
-        
-        if start_date:
-            start_date = datetime.fromisoformat(start_date)
-            query = query.filter(AffiliateLink.created_at >= start_date)
-        
-        if end_date:
-            end_date = datetime.fromisoformat(end_date)
-            query = query.filter(AffiliateLink.created_at <= end_date)
-        
-        links = query.all()
+        end_date = datetime.fromisoformat(end_date) if end_date else datetime.utcnow()
+        start_date = datetime.fromisoformat(start_date) if start_date else end_date - timedelta(days=30)
+        if start_date > end_date:
+            return {'message': 'start_date는 end_date보다 이전이어야 합니다.'}, 400
         
         # Generate daily earnings data
-        daily_earnings = {}
-        for link in links:
-            if link.last_conversion_at:
-                date_key = link.last_conversion_at.strftime('%Y-%m-%d')
-                if date_key not in daily_earnings:
-                    daily_earnings[date_key] = 0.0
-                daily_earnings[date_key] += link.total_earnings
-        
-        # Sort by date
-        sorted_earnings = sorted(daily_earnings.items())
+        series = affiliate_stats.daily_series(user_id, start_date, end_date)
         
         return {
             'success': True,
             'data': {
-                'daily_earnings': sorted_earnings,
-                'total_earnings': sum(link.total_earnings for link in links),
-                'total_conversions': sum(link.conversion_count for link in links),
-                'total_clicks': sum(link.click_count for link in links)
+                'daily_earnings': [(day.isoformat(), round(totals['revenue'], 2)) for day, totals in series],
+                'total_earnings': round(sum(totals['revenue'] for _, totals in series), 2),
+                'total_conversions': sum(totals['conversions'] for _, totals in series),
+                'total_clicks': sum(totals['clicks'] for _, totals in series)
             }
         }, 200
         
+    except ValueError:
+        return {'message': '날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)'}, 400
     except Exception as e:
-        return {'message': f'수익 리포트 생성 실패: {str(e)}'}, 500
\ No newline at end of file
+        return {'message': f'수익 리포트 생성 실패: {str(e)}'}, 500
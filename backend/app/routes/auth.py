@@ -3,6 +3,7 @@ from flask_jwt_extended import create_access_token, create_refresh_token, jwt_re
 from app import db
 from app.models.user import User
 from app.models.notification import Notification
+from app.services.entity_cache import entity_cache
 from datetime import datetime, timedelta
 import re
 from email_validator import validate_email, EmailNotValidError
@@ -187,7 +188,7 @@ def refresh():
     """토큰 갱신"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = entity_cache.get(User, current_user_id)
         
         if not user or not user.is_active:
             return jsonify({
@@ -225,7 +226,7 @@ def get_current_user():
     """현재 사용자 정보 조회"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = entity_cache.get(User, current_user_id)
         
         if not user:
             return jsonify({
@@ -271,7 +272,7 @@ def update_profile():
     """프로필 업데이트"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = entity_cache.get(User, current_user_id)
         
         if not user:
             return jsonify({
@@ -324,7 +325,7 @@ def change_password():
     """비밀번호 변경"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = entity_cache.get(User, current_user_id)
         
         if not user:
             return jsonify({
@@ -1,7 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import desc, and_, or_
-from sqlalchemy.orm import joinedload
+from sqlalchemy import desc, and_, or_, func
+from sqlalchemy.orm import selectinload
 from datetime import datetime
 import json
 from app import db
@@ -9,13 +9,45 @@ from app.models.blog_post import BlogPost
 from app.models.tag import Tag
 from app.models.affiliate_link import AffiliateLink
 from app.models.user import User
+from app.utils.batch import parse_ids, fetch_by_ids
+from app.utils.pagination import paginate
+from app.read_models import BlogPostSummary
+from app.services.entity_cache import entity_cache
+from app.utils.http_cache import Validators
+from app.services.edge_cache import edge_cache
 
 bp = Blueprint('blog', __name__)
 
+def get_blog_posts_by_ids(raw_ids):
+    """여러 블로그 포스트 일괄 조회 (?ids=a,b,c)"""
+    try:
+        ids = parse_ids(raw_ids)
+    except ValueError as e:
+        return {'message': str(e)}, 400
+    
+    posts, missing = fetch_by_ids(
+        BlogPost, ids,
+        options=[selectinload(BlogPost.author)],
+        predicate=lambda post: post.status == 'published'
+    )
+    
+    return {
+        'success': True,
+        'data': {
+            'posts': [post.to_dict(include_content=False) for post in posts],
+            'missing': missing
+        }
+    }, 200
+
 @bp.route('/posts', methods=['GET'])
 def get_blog_posts():
     """블로그 포스트 목록 조회"""
     try:
+        # ID 목록이 주어지면 일괄 조회
+        raw_ids = request.args.get('ids')
+        if raw_ids is not None:
+            return get_blog_posts_by_ids(raw_ids)
+        
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 10, type=int), 50)
         search = request.args.get('search', '')
@@ -24,14 +56,12 @@ def get_blog_posts():
         sort_by = request.args.get('sort_by', 'newest')
         status = request.args.get('status', 'published')
         
-        query = BlogPost.query.options(
-            joinedload(BlogPost.author),
-            joinedload(BlogPost.tags)
-        )
+        query = BlogPost.query
         
         # Filter by status
         if status == 'published':
             query = query.filter(BlogPost.status == 'published')
+            edge_cache.tag('blog-lists')
         elif status == 'draft':
             query = query.filter(BlogPost.status == 'draft')
         
@@ -51,7 +81,7 @@ def get_blog_posts():
         
         # Tag filter
         if tag:
-            query = query.join(BlogPost.tags).filter(Tag.name == tag)
+            query = query.filter(BlogPost.tags.contains([tag]))
         
         # Sorting
         if sort_by == 'newest':
@@ -63,33 +93,18 @@ def get_blog_posts():
         elif sort_by == 'title':
             query = query.order_by(BlogPost.title)
         
-        paginated = query.paginate(
-            page=page, per_page=per_page, error_out=False
+        # 목록은 ORM 인스턴스 대신 필요한 컬럼만 읽기 모델로 조회
+        paginated = paginate(
+            BlogPostSummary.select_from(query).order_by(BlogPost.id),
+            page, per_page
         )
         
-        posts = []
-        for post in paginated.items:
-            post_data = {
-                'id': post.id,
-                'title': post.title,
-                'slug': post.slug,
-                'excerpt': post.excerpt,
-                'category': post.category,
-                'featured_image': post.featured_image,
-                'status': post.status,
-                'view_count': post.view_count,
-                'like_count': post.like_count,
-                'created_at': post.created_at.isoformat(),
-                'updated_at': post.updated_at.isoformat(),
-                'author': {
-                    'id': post.author.id,
-                    'name': post.author.name,
-                    'email': post.author.email
-                } if post.author else None,
-                'tags': [{'id': tag.id, 'name': tag.name} for tag in post.tags],
-                'estimated_read_time': post.estimated_read_time
-            }
-            posts.append(post_data)
+        summaries = BlogPostSummary.from_rows(paginated.items)
+        posts = [post.to_dict() for post in summaries]
+        
+        # 작성자 정보가 포함되므로 작성자 변경 시에도 퍼지되도록 태깅
+        if status == 'published':
+            edge_cache.tag(*{f'user:{post.author_id}' for post in summaries if post.author_id})
         
         return {
             'success': True,
@@ -100,6 +115,7 @@ def get_blog_posts():
                     'pages': paginated.pages,
                     'per_page': paginated.per_page,
                     'total': paginated.total,
+                    'count': paginated.count,
                     'has_next': paginated.has_next,
                     'has_prev': paginated.has_prev
                 }
@@ -200,18 +216,26 @@ def create_blog_post():
 def get_blog_post(slug):
     """개별 블로그 포스트 조회"""
     try:
-        post = BlogPost.query.options(
-            joinedload(BlogPost.author),
-            joinedload(BlogPost.tags),
-            joinedload(BlogPost.affiliate_links)
-        ).filter_by(slug=slug).first()
+        post = BlogPost.query.filter_by(slug=slug).first()
         
         if not post:
             return {'message': '블로그 포스트를 찾을 수 없습니다.'}, 404
         
-        # Increment view count
-        post.view_count += 1
-        db.session.commit()
+        # Increment view count (상세는 조회수 집계를 위해 엣지 캐시 대상에서 제외)
+        post.increment_view()
+        
+        # 포스트/작성자/제휴 링크가 변경되지 않았으면 관계 로딩 없이 304 (조회수는 검증자에 포함하지 않음)
+        author = entity_cache.get(User, post.author_id)
+        author_updated_at = author.updated_at if author else None
+        link_count, links_updated_at = db.session.query(
+            func.count(AffiliateLink.id), func.max(AffiliateLink.updated_at)
+        ).filter(AffiliateLink.blog_post_id == post.id).one()
+        validators = Validators(
+            'blog_post', post.id, post.updated_at, author_updated_at, link_count, links_updated_at,
+            last_modified=[post.updated_at, author_updated_at, links_updated_at]
+        )
+        if validators.matches():
+            return validators.not_modified()
         
         post_data = {
             'id': post.id,
@@ -224,32 +248,31 @@ def get_blog_post(slug):
             'status': post.status,
             'view_count': post.view_count,
             'like_count': post.like_count,
-            'estimated_read_time': post.estimated_read_time,
             'created_at': post.created_at.isoformat(),
-            'updated_at': post.updated_at.isoformat(),
+            'updated_at': post.updated_at.isoformat() if post.updated_at else None,
             'meta_title': post.meta_title,
             'meta_description': post.meta_description,
             'meta_keywords': post.meta_keywords,
             'author': {
-                'id': post.author.id,
-                'name': post.author.name,
-                'email': post.author.email
-            } if post.author else None,
-            'tags': [{'id': tag.id, 'name': tag.name} for tag in post.tags],
+                'id': author.id,
+                'name': author.name,
+                'email': author.email
+            } if author else None,
+            'tags': post.tags or [],
             'affiliate_links': [{
                 'id': link.id,
                 'product_name': link.product_name,
-                'product_url': link.product_url,
+                'product_url': link.original_url,
                 'affiliate_url': link.affiliate_url,
-                'platform': link.platform,
+                'platform': link.partner,
                 'click_count': link.click_count
             } for link in post.affiliate_links]
         }
         
-        return {
+        return validators.apply(jsonify({
             'success': True,
             'data': {'post': post_data}
-        }, 200
+        })), 200
         
     except Exception as e:
         return {'message': f'블로그 포스트 조회 실패: {str(e)}'}, 500
@@ -5,6 +5,16 @@ from app.models.user import User
 from app.models.business import Business
 from app.models.notification import Notification
 from app.models.category import Category
+from app.utils.batch import parse_ids, fetch_by_ids
+from app.utils.pagination import paginate
+from app.read_models import BusinessSummary
+from app.utils.http_cache import Validators
+from app.services.entity_cache import entity_cache
+from app.services.cache import tiered_cache
+from app.services.commit_hooks import on_commit
+from app.services.fragment_cache import fragment_cache, version_of
+from app.services.edge_cache import edge_cache
+from app.services.snapshots import snapshots
 from sqlalchemy import and_, or_, func
 from datetime import datetime
 import json
@@ -12,6 +22,39 @@ import json
 # Blueprint 생성
 bp = Blueprint('businesses', __name__)
 
+# 추천 사업체/카테고리 개수 캐시 네임스페이스
+LIST_CACHE_NAMESPACE = 'business_lists'
+
+@on_commit(Business, ignore=('view_count',))
+def invalidate_business_lists(changes):
+    """사업체 변경이 커밋되면 목록 캐시 무효화"""
+    tiered_cache.invalidate_namespace(LIST_CACHE_NAMESPACE)
+
+def get_cached_list(key, compute):
+    """목록 캐시 조회 (single-flight + stale-while-revalidate)"""
+    return tiered_cache.get_or_compute(
+        LIST_CACHE_NAMESPACE, key, compute,
+        timeout=current_app.config.get('LIST_CACHE_TIMEOUT', 600),
+        soft_timeout=current_app.config.get('LIST_CACHE_SOFT_TIMEOUT', 60)
+    )
+
+def list_validators(key):
+    """목록 캐시 네임스페이스 버전 기반 검증자 (캐시 비활성화 시 버전을 알 수 없으므로 None)"""
+    if not tiered_cache.enabled:
+        return None
+    return Validators('business_lists', key, tiered_cache.version(LIST_CACHE_NAMESPACE))
+
+def load_business_cards(business_ids):
+    """프래그먼트 캐시에 없는 사업체 카드 직렬화"""
+    return {
+        business_id: business.to_dict()
+        for business_id, business in BusinessSummary.load(business_ids).items()
+    }
+
+def compute_featured_businesses():
+    """추천 사업체 직렬화 목록"""
+    return [business.to_dict() for business in Business.get_featured()]
+
 def is_admin_or_moderator():
     """관리자 또는 운영자 권한 확인"""
     claims = get_jwt()
@@ -20,13 +63,42 @@ def is_admin_or_moderator():
 def is_business_owner(business_id):
     """사업체 소유자 확인"""
     current_user_id = get_jwt_identity()
-    business = Business.query.get(business_id)
+    business = entity_cache.get(Business, business_id)
     return business and business.owner_id == current_user_id
 
+def get_businesses_by_ids(raw_ids):
+    """여러 사업체 일괄 조회 (?ids=a,b,c)"""
+    try:
+        ids = parse_ids(raw_ids)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    # 목록 조회이므로 조회수는 증가시키지 않음
+    businesses, missing = fetch_by_ids(
+        Business, ids,
+        predicate=lambda business: business.status == 'approved'
+    )
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'businesses': [business.to_dict() for business in businesses],
+            'missing': missing
+        }
+    }), 200
+
 @bp.route('', methods=['GET'])
 def get_businesses():
     """사업체 목록 조회"""
     try:
+        # ID 목록이 주어지면 일괄 조회
+        raw_ids = request.args.get('ids')
+        if raw_ids is not None:
+            return get_businesses_by_ids(raw_ids)
+        
         # 쿼리 파라미터
         category = request.args.get('category')
         pet_type = request.args.get('pet_type')
@@ -41,6 +113,8 @@ def get_businesses():
         
         # 기본 쿼리 (승인된 사업체만)
         query = Business.query.filter_by(status=status)
+        if status == 'approved':
+            edge_cache.tag('business-lists')
         
         # 카테고리 필터
         if category:
@@ -78,20 +152,24 @@ def get_businesses():
         # 정렬 (평점 높은 순)
         query = query.order_by(Business.average_rating.desc(), Business.created_at.desc())
         
-        # 페이지네이션
-        businesses = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
-        
-        # 거리 계산 (위치가 제공된 경우)
-        business_list = []
-        for business in businesses.items:
-            business_data = business.to_dict()
-            if lat and lng:
+        if lat and lng:
+            # 페이지네이션 (ORM 인스턴스 대신 필요한 컬럼만 읽기 모델로 조회)
+            businesses = paginate(BusinessSummary.select_from(query), page, per_page)
+            
+            # 거리는 요청마다 달라지므로 프래그먼트 캐시를 사용하지 않음
+            business_list = []
+            for business in BusinessSummary.from_rows(businesses.items):
+                business_data = business.to_dict()
                 business_data['distance'] = business.get_distance_from(lat, lng)
-            business_list.append(business_data)
+                business_list.append(business_data)
+        else:
+            # ID/버전만 조회한 뒤 직렬화된 카드는 프래그먼트 캐시에서 가져옴
+            businesses = paginate(query.with_entities(Business.id, Business.updated_at), page, per_page)
+            business_list = fragment_cache.render(
+                'business', 'card',
+                [(business_id, version_of(updated_at)) for business_id, updated_at in businesses.items],
+                load_business_cards
+            )
         
         return jsonify({
             'success': True,
@@ -102,6 +180,7 @@ def get_businesses():
                     'per_page': per_page,
                     'total': businesses.total,
                     'pages': businesses.pages,
+                    'count': businesses.count,
                     'has_next': businesses.has_next,
                     'has_prev': businesses.has_prev
                 }
@@ -119,7 +198,7 @@ def get_businesses():
 def get_business(business_id):
     """사업체 상세 조회"""
     try:
-        business = Business.query.get(business_id)
+        business = entity_cache.get(Business, business_id)
         
         if not business:
             return jsonify({
@@ -146,26 +225,36 @@ def get_business(business_id):
                     'message': '접근 권한이 없습니다.'
                 }), 403
         
-        # 조회수 증가 (승인된 사업체만)
+        # 조회수 증가 (승인된 사업체만, 상세는 조회수 집계를 위해 엣지 캐시 대상에서 제외)
         if business.status == 'approved':
             business.increment_view()
         
+        # 사업체/소유자가 변경되지 않았으면 직렬화 없이 304 (조회수는 검증자에 포함하지 않음)
+        owner = entity_cache.get(User, business.owner_id)
+        owner_updated_at = owner.updated_at if owner else None
+        validators = Validators(
+            'business', business.id, business.updated_at, owner_updated_at,
+            last_modified=[business.updated_at, owner_updated_at]
+        )
+        if validators.matches():
+            return validators.not_modified()
+        
         # 상세 정보 반환
         business_data = business.to_dict(include_sensitive=True)
         
         # 소유자 정보 추가
-        if business.owner:
+        if owner:
             business_data['owner'] = {
-                'id': business.owner.id,
-                'name': business.owner.name,
-                'nickname': business.owner.nickname,
-                'profile_image': business.owner.profile_image
+                'id': owner.id,
+                'name': owner.name,
+                'nickname': owner.nickname,
+                'profile_image': owner.profile_image
             }
         
-        return jsonify({
+        return validators.apply(jsonify({
             'success': True,
             'data': business_data
-        }), 200
+        })), 200
         
     except Exception as e:
         current_app.logger.error(f"사업체 상세 조회 오류: {str(e)}")
@@ -264,7 +353,7 @@ def update_business(business_id):
     """사업체 정보 수정"""
     try:
         current_user_id = get_jwt_identity()
-        business = Business.query.get(business_id)
+        business = entity_cache.get(Business, business_id)
         
         if not business:
             return jsonify({
@@ -332,7 +421,7 @@ def delete_business(business_id):
     """사업체 삭제"""
     try:
         current_user_id = get_jwt_identity()
-        business = Business.query.get(business_id)
+        business = entity_cache.get(Business, business_id)
         
         if not business:
             return jsonify({
@@ -369,26 +458,19 @@ def delete_business(business_id):
 def get_business_categories():
     """사업체 카테고리 목록"""
     try:
-        from config import Config
+        edge_cache.tag('business-lists')
+        validators = list_validators('categories')
+        if validators and validators.matches():
+            return validators.not_modified()
         
-        categories = []
-        for category_code in Config.BUSINESS_CATEGORIES:
-            # 카테고리별 사업체 수 계산
-            count = Business.query.filter_by(
-                category=category_code,
-                status='approved'
-            ).count()
-            
-            categories.append({
-                'code': category_code,
-                'name': category_code,  # 실제로는 번역된 이름 사용
-                'count': count
-            })
+        categories = get_cached_list('categories', Business.get_category_counts)
         
-        return jsonify({
+        response = jsonify({
             'success': True,
             'data': categories
-        }), 200
+        })
+        snapshots.link(response, 'categories')
+        return (validators.apply(response) if validators else response), 200
         
     except Exception as e:
         current_app.logger.error(f"카테고리 조회 오류: {str(e)}")
@@ -403,12 +485,19 @@ def get_featured_businesses():
     try:
         limit = min(int(request.args.get('limit', 10)), 20)
         
-        businesses = Business.get_featured()[:limit]
+        edge_cache.tag('business-lists')
+        validators = list_validators('featured')
+        if validators and validators.matches():
+            return validators.not_modified()
         
-        return jsonify({
+        businesses = get_cached_list('featured', compute_featured_businesses)[:limit]
+        
+        response = jsonify({
             'success': True,
-            'data': [business.to_dict() for business in businesses]
-        }), 200
+            'data': businesses
+        })
+        snapshots.link(response, 'featured-businesses')
+        return (validators.apply(response) if validators else response), 200
         
     except Exception as e:
         current_app.logger.error(f"추천 사업체 조회 오류: {str(e)}")
@@ -501,13 +590,12 @@ def search_businesses():
             search_query = search_query.filter(Business.pet_allowed_types.contains([pet_type]))
         
         # 정렬 및 페이지네이션
-        results = search_query.order_by(
-            Business.average_rating.desc(),
-            Business.view_count.desc()
-        ).paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+        results = paginate(
+            search_query.order_by(
+                Business.average_rating.desc(),
+                Business.view_count.desc()
+            ),
+            page, per_page
         )
         
         return jsonify({
@@ -520,6 +608,7 @@ def search_businesses():
                     'per_page': per_page,
                     'total': results.total,
                     'pages': results.pages,
+                    'count': results.count,
                     'has_next': results.has_next,
                     'has_prev': results.has_prev
                 }
@@ -0,0 +1,60 @@
+from flask import Blueprint, request, jsonify, current_app
+from app.models.business import Business
+from app.services.home_feed import home_feed
+from app.services.edge_cache import edge_cache
+from app.services.snapshots import snapshots
+from app.utils.http_cache import Validators
+from app.utils.json_provider import raw_json
+
+# Blueprint 생성
+bp = Blueprint('home', __name__)
+
+def get_nearby_section(lat, lng):
+    """위치 기반 섹션 (요청마다 계산)"""
+    radius = min(request.args.get('radius', 5, type=float), 50)
+    limit = current_app.config.get('HOME_NEARBY_LIMIT', 10)
+    
+    nearby = []
+    for business in Business.search_nearby(lat=lat, lng=lng, radius_km=radius, limit=limit):
+        business_data = business.to_dict()
+        business_data['distance'] = business.get_distance_from(lat, lng)
+        nearby.append(business_data)
+    
+    nearby.sort(key=lambda x: x['distance'])
+    return nearby
+
+@bp.route('', methods=['GET'])
+def get_home_feed():
+    """홈 화면 피드 (?lat=&lng= 가 있으면 근처 사업체 포함)"""
+    try:
+        lat = request.args.get('lat', type=float)
+        lng = request.args.get('lng', type=float)
+        has_location = lat is not None and lng is not None
+        
+        feed = home_feed.get()
+        
+        # 위치가 없으면 문서만으로 결정되는 응답이므로 엣지 캐시/조건부 GET 대상
+        validators = None
+        if not has_location:
+            edge_cache.tag('home')
+            validators = Validators('home', feed['generated_at'], last_modified=feed['generated_at'])
+            if validators.matches():
+                return validators.not_modified()
+        
+        data = {name: raw_json(raw) for name, raw in feed['sections'].items()}
+        data['nearby'] = get_nearby_section(lat, lng) if has_location else []
+        data['generated_at'] = feed['generated_at']
+        
+        response = jsonify({
+            'success': True,
+            'data': data
+        })
+        snapshots.link(response, 'categories', 'featured-businesses', 'tags')
+        return (validators.apply(response) if validators else response), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"홈 피드 조회 오류: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': '홈 피드 조회 중 오류가 발생했습니다.'
+        }), 500
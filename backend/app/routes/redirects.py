@@ -0,0 +1,19 @@
+from flask import Blueprint
+from app.routes.affiliate import follow_link
+from app.services.short_codes import is_valid
+
+# Blueprint 생성
+bp = Blueprint('redirects', __name__)
+
+@bp.route('/<code>', methods=['GET'])
+def follow_short_code(code):
+    """단축 URL(/r/<code>) 리다이렉트"""
+    # 형식이 맞지 않는 코드는 조회하지 않음 (스캐너 등)
+    if not is_valid(code):
+        return {'message': '제휴 링크를 찾을 수 없습니다.'}, 404
+    
+    try:
+        return follow_link(code)
+        
+    except Exception as e:
+        return {'message': f'링크 추적 실패: {str(e)}'}, 500
@@ -1,9 +1,16 @@
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import desc, and_
-from sqlalchemy.orm import joinedload
+from sqlalchemy import desc, and_, func
+from sqlalchemy.orm import joinedload, selectinload
 from app import db
 from app.models import Review, Business, User
+from app.utils.batch import parse_ids, fetch_by_ids
+from app.utils.pagination import paginate, paginate_ids
+from app.read_models import ReviewSummary
+from app.services.fragment_cache import fragment_cache, version_of
+from app.utils.http_cache import Validators
+from app.services.edge_cache import edge_cache
+from app.services.entity_cache import entity_cache
 from datetime import datetime
 import uuid
 
@@ -35,7 +42,7 @@ def create_review():
             }), 400
         
         # Check if business exists
-        business = Business.query.get(data['business_id'])
+        business = entity_cache.get(Business, data['business_id'])
         if not business:
             return jsonify({
                 'success': False,
@@ -78,7 +85,7 @@ def create_review():
         
         # Load review with user data for response
         review = Review.query.options(
-            joinedload(Review.user),
+            joinedload(Review.author),
             joinedload(Review.business)
         ).get(review.id)
         
@@ -146,14 +153,14 @@ def update_review(review_id):
         review.updated_at = datetime.utcnow()
         
         # Update business average rating
-        business = Business.query.get(review.business_id)
+        business = entity_cache.get(Business, review.business_id)
         business.update_rating()
         
         db.session.commit()
         
         # Load review with user data for response
         review = Review.query.options(
-            joinedload(Review.user),
+            joinedload(Review.author),
             joinedload(Review.business)
         ).get(review.id)
         
@@ -198,7 +205,7 @@ def delete_review(review_id):
         db.session.delete(review)
         
         # Update business average rating
-        business = Business.query.get(business_id)
+        business = entity_cache.get(Business, business_id)
         business.update_rating()
         
         db.session.commit()
@@ -216,18 +223,41 @@ def delete_review(review_id):
             'message': 'Internal server error'
         }), 500
 
+def load_review_items(review_ids):
+    """Serialize reviews missing from the fragment cache"""
+    return {
+        review_id: review.to_dict()
+        for review_id, review in ReviewSummary.load(review_ids).items()
+    }
+
 @bp.route('/businesses/<business_id>/reviews', methods=['GET'])
 def get_business_reviews(business_id):
     """Get reviews for a specific business"""
     try:
         # Check if business exists
-        business = Business.query.get(business_id)
+        business = entity_cache.get(Business, business_id)
         if not business:
             return jsonify({
                 'success': False,
                 'message': 'Business not found'
             }), 404
         
+        edge_cache.tag(f'business:{business_id}')
+        
+        # Validators from the business, its reviews and their authors; 304 before building the page
+        review_count, reviews_updated_at, authors_updated_at = db.session.query(
+            func.count(Review.id), func.max(Review.updated_at), func.max(User.updated_at)
+        ).select_from(Review).outerjoin(User, Review.user_id == User.id).filter(
+            Review.business_id == business_id
+        ).one()
+        validators = Validators(
+            'business_reviews', business_id, business.updated_at,
+            review_count, reviews_updated_at, authors_updated_at,
+            last_modified=[business.updated_at, reviews_updated_at, authors_updated_at]
+        )
+        if validators.matches():
+            return validators.not_modified()
+        
         # Pagination
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 10, type=int), 50)
@@ -236,9 +266,7 @@ def get_business_reviews(business_id):
         sort_by = request.args.get('sort_by', 'newest')  # newest, oldest, rating_high, rating_low
         
         # Build query
-        query = Review.query.filter_by(business_id=business_id).options(
-            joinedload(Review.user)
-        )
+        query = Review.query.filter_by(business_id=business_id)
         
         # Apply sorting
         if sort_by == 'newest':
@@ -250,25 +278,39 @@ def get_business_reviews(business_id):
         elif sort_by == 'rating_low':
             query = query.order_by(Review.rating, desc(Review.created_at))
         
-        # Pagination
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+        # Pagination over ids and versions only; serialized items come from the fragment cache.
+        # The author is embedded, so the author's updated_at is part of the version.
+        pagination = paginate(
+            query.outerjoin(User, Review.user_id == User.id)
+            .with_entities(Review.id, Review.updated_at, User.updated_at, Review.user_id)
+            .order_by(Review.id),
+            page, per_page
         )
         
-        reviews = [review.to_dict() for review in pagination.items]
+        reviews = fragment_cache.render(
+            'review', 'item',
+            [
+                (review_id, version_of(updated_at, author_updated_at))
+                for review_id, updated_at, author_updated_at, _ in pagination.items
+            ],
+            load_review_items
+        )
+        
+        # Authors are embedded, so renaming one must purge this page too
+        edge_cache.tag(*{f'user:{user_id}' for _, _, _, user_id in pagination.items if user_id})
         
-        # Calculate rating distribution
+        # Calculate rating distribution (single GROUP BY)
+        counts = dict(
+            db.session.query(Review.rating, func.count(Review.id))
+            .filter(Review.business_id == business_id)
+            .group_by(Review.rating)
+            .all()
+        )
         rating_distribution = {
-            '5': Review.query.filter_by(business_id=business_id, rating=5).count(),
-            '4': Review.query.filter_by(business_id=business_id, rating=4).count(),
-            '3': Review.query.filter_by(business_id=business_id, rating=3).count(),
-            '2': Review.query.filter_by(business_id=business_id, rating=2).count(),
-            '1': Review.query.filter_by(business_id=business_id, rating=1).count(),
+            str(rating): counts.get(rating, 0) for rating in range(5, 0, -1)
         }
         
-        return jsonify({
+        return validators.apply(jsonify({
             'success': True,
             'data': {
                 'reviews': reviews,
@@ -277,6 +319,7 @@ def get_business_reviews(business_id):
                     'per_page': per_page,
                     'total': pagination.total,
                     'pages': pagination.pages,
+                    'count': pagination.count,
                     'has_next': pagination.has_next,
                     'has_prev': pagination.has_prev
                 },
@@ -284,7 +327,7 @@ def get_business_reviews(business_id):
                 'average_rating': business.average_rating,
                 'total_reviews': business.review_count
             }
-        })
+        }))
         
     except Exception as e:
         current_app.logger.error(f"Error getting business reviews: {str(e)}")
@@ -298,7 +341,7 @@ def get_user_reviews(user_id):
     """Get reviews by a specific user"""
     try:
         # Check if user exists
-        user = User.query.get(user_id)
+        user = entity_cache.get(User, user_id)
         if not user:
             return jsonify({
                 'success': False,
@@ -310,15 +353,12 @@ def get_user_reviews(user_id):
         per_page = min(request.args.get('per_page', 10, type=int), 50)
         
         # Build query
-        query = Review.query.filter_by(user_id=user_id).options(
-            joinedload(Review.business)
-        ).order_by(desc(Review.created_at))
+        query = Review.query.filter_by(user_id=user_id).order_by(desc(Review.created_at))
         
         # Pagination
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+        pagination = paginate_ids(
+            query, Review, page, per_page,
+            options=[selectinload(Review.author)]
         )
         
         reviews = [review.to_dict() for review in pagination.items]
@@ -332,6 +372,7 @@ def get_user_reviews(user_id):
                     'per_page': per_page,
                     'total': pagination.total,
                     'pages': pagination.pages,
+                    'count': pagination.count,
                     'has_next': pagination.has_next,
                     'has_prev': pagination.has_prev
                 }
@@ -350,7 +391,7 @@ def get_review(review_id):
     """Get a specific review"""
     try:
         review = Review.query.options(
-            joinedload(Review.user),
+            joinedload(Review.author),
             joinedload(Review.business)
         ).get(review_id)
         
@@ -374,10 +415,38 @@ def get_review(review_id):
             'message': 'Internal server error'
         }), 500
 
+def get_reviews_by_ids(raw_ids):
+    """Get multiple reviews by id (?ids=a,b,c)"""
+    try:
+        ids = parse_ids(raw_ids)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    reviews, missing = fetch_by_ids(
+        Review, ids,
+        options=[selectinload(Review.author)]
+    )
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'reviews': [review.to_dict() for review in reviews],
+            'missing': missing
+        }
+    })
+
 @bp.route('/reviews', methods=['GET'])
 def get_all_reviews():
     """Get all reviews (for admin or general listing)"""
     try:
+        # Batch lookup when ids are given
+        raw_ids = request.args.get('ids')
+        if raw_ids is not None:
+            return get_reviews_by_ids(raw_ids)
+        
         # Pagination
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 20, type=int), 100)
@@ -389,10 +458,7 @@ def get_all_reviews():
         max_rating = request.args.get('max_rating', type=float)
         
         # Build query
-        query = Review.query.options(
-            joinedload(Review.user),
-            joinedload(Review.business)
-        )
+        query = Review.query
         
         # Apply filters
         if business_id:
@@ -411,10 +477,9 @@ def get_all_reviews():
         query = query.order_by(desc(Review.created_at))
         
         # Pagination
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+        pagination = paginate_ids(
+            query, Review, page, per_page,
+            options=[selectinload(Review.author)]
         )
         
         reviews = [review.to_dict() for review in pagination.items]
@@ -428,6 +493,7 @@ def get_all_reviews():
                     'per_page': per_page,
                     'total': pagination.total,
                     'pages': pagination.pages,
+                    'count': pagination.count,
                     'has_next': pagination.has_next,
                     'has_prev': pagination.has_prev
                 }
@@ -0,0 +1,46 @@
+from flask import Blueprint, jsonify, redirect, current_app
+from app.services.snapshots import snapshots
+
+# Blueprint 생성
+bp = Blueprint('snapshots', __name__)
+
+@bp.route('', methods=['GET'])
+def get_snapshot_manifest():
+    """발행된 정적 스냅샷 목록"""
+    try:
+        manifest = snapshots.manifest()
+        
+        return jsonify({
+            'success': True,
+            'data': {name: {key: value for key, value in entry.items() if key != 'file'}
+                     for name, entry in manifest.items()}
+        }), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"스냅샷 목록 조회 오류: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': '스냅샷 목록 조회 중 오류가 발생했습니다.'
+        }), 500
+
+@bp.route('/<name>', methods=['GET'])
+def get_snapshot(name):
+    """최신 버전 스냅샷으로 리다이렉트 (nginx가 정적 파일로 서빙)"""
+    try:
+        url = snapshots.url(name)
+        if not url:
+            return jsonify({
+                'success': False,
+                'message': '스냅샷을 찾을 수 없습니다.'
+            }), 404
+        
+        response = redirect(url, code=302)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+        
+    except Exception as e:
+        current_app.logger.error(f"스냅샷 조회 오류: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': '스냅샷 조회 중 오류가 발생했습니다.'
+        }), 500
@@ -0,0 +1,53 @@
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from app.services.sync import get_feed, sync, SyncToken, InvalidSyncToken
+
+# Blueprint 생성
+bp = Blueprint('sync', __name__)
+
+@bp.route('/<feed_name>', methods=['GET'])
+def sync_feed(feed_name):
+    """토큰 이후 생성/변경/삭제된 행 조회 (?since=<token>, 없으면 전체 동기화)"""
+    feed = get_feed(feed_name)
+    if feed is None:
+        return jsonify({
+            'success': False,
+            'message': '지원하지 않는 동기화 대상입니다.'
+        }), 404
+    
+    # 내 리뷰, 알림 등 사용자별 피드는 로그인 필요
+    user_id = None
+    if feed.scope:
+        verify_jwt_in_request()
+        user_id = get_jwt_identity()
+    
+    try:
+        since = request.args.get('since')
+        token = SyncToken.parse(since) if since else None
+    except InvalidSyncToken:
+        return jsonify({
+            'success': False,
+            'message': '유효하지 않은 동기화 토큰입니다.'
+        }), 400
+    
+    try:
+        limit = min(
+            request.args.get('limit', current_app.config.get('SYNC_PAGE_SIZE', 500), type=int),
+            current_app.config.get('SYNC_MAX_PAGE_SIZE', 1000)
+        )
+        
+        result = sync(feed, token, user_id=user_id, limit=max(limit, 1))
+        
+        response = jsonify({
+            'success': True,
+            'data': result
+        })
+        response.headers['Cache-Control'] = 'no-store'
+        return response, 200
+        
+    except Exception as e:
+        current_app.logger.error(f"동기화 조회 오류 ({feed_name}): {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': '동기화 중 오류가 발생했습니다.'
+        }), 500
@@ -3,6 +3,9 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.user import User
 from app.models.notification import Notification
+from app.utils.batch import parse_ids, fetch_by_ids
+from app.utils.pagination import paginate
+from app.services.entity_cache import entity_cache
 from datetime import datetime
 
 # Blueprint 생성
@@ -12,7 +15,7 @@ bp = Blueprint('users', __name__)
 def get_user_profile(user_id):
     """사용자 프로필 조회 (공개 정보)"""
     try:
-        user = User.query.get(user_id)
+        user = entity_cache.get(User, user_id)
         
         if not user or not user.is_active:
             return jsonify({
@@ -42,6 +45,35 @@ def get_user_profile(user_id):
             'message': '프로필 조회 중 오류가 발생했습니다.'
         }), 500
 
+@bp.route('/profiles', methods=['GET'])
+def get_user_profiles():
+    """여러 사용자 공개 프로필 일괄 조회 (?ids=a,b,c)"""
+    try:
+        try:
+            ids = parse_ids(request.args.get('ids'))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        
+        users, missing = fetch_by_ids(User, ids, predicate=lambda user: user.is_active)
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'users': [user.to_dict(include_sensitive=False) for user in users],
+                'missing': missing
+            }
+        }), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"사용자 프로필 일괄 조회 오류: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': '프로필 조회 중 오류가 발생했습니다.'
+        }), 500
+
 @bp.route('/notifications', methods=['GET'])
 @jwt_required()
 def get_notifications():
@@ -151,7 +183,7 @@ def get_dashboard():
     """사용자 대시보드 데이터"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = entity_cache.get(User, current_user_id)
         
         if not user:
             return jsonify({
@@ -214,7 +246,7 @@ def get_user_settings():
     """사용자 설정 조회"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = entity_cache.get(User, current_user_id)
         
         if not user:
             return jsonify({
@@ -248,7 +280,7 @@ def update_user_settings():
     """사용자 설정 업데이트"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = entity_cache.get(User, current_user_id)
         
         if not user:
             return jsonify({
@@ -290,7 +322,7 @@ def deactivate_account():
     """계정 비활성화"""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = entity_cache.get(User, current_user_id)
         
         if not user:
             return jsonify({
@@ -345,16 +377,15 @@ def search_users():
             }), 400
         
         # 사용자 검색 (이름, 닉네임)
-        users = User.query.filter(
-            User.is_active == True,
-            db.or_(
-                User.name.contains(query),
-                User.nickname.contains(query)
-            )
-        ).paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+        users = paginate(
+            User.query.filter(
+                User.is_active == True,
+                db.or_(
+                    User.name.contains(query),
+                    User.nickname.contains(query)
+                )
+            ),
+            page, per_page
         )
         
         return jsonify({
@@ -366,6 +397,7 @@ def search_users():
                     'per_page': per_page,
                     'total': users.total,
                     'pages': users.pages,
+                    'count': users.count,
                     'has_next': users.has_next,
                     'has_prev': users.has_prev
                 }
@@ -0,0 +1,328 @@
+"""
+제휴 링크 통계 집계 (시간별/일별 롤업)
+
+클릭 워커(click_log.apply)와 전환 기록이 같은 트랜잭션에서 affiliate_stats_hourly /
+affiliate_stats_daily에 증분을 INSERT ... ON CONFLICT DO UPDATE로 더하고, 통계/수익 리포트 API는
+작성자별 (author_id, bucket) 인덱스 범위만 읽습니다. 링크 테이블이나 클릭 테이블을 훑지 않습니다.
+
+- 클릭 워커는 새로 INSERT된 클릭(RETURNING)만 집계하므로 재처리되어도 중복 집계되지 않습니다.
+- 순 방문자는 Redis HyperLogLog(링크/작성자 × 시간/날짜, 키당 최대 12KB)로 추정합니다.
+  PFADD는 같은 방문자를 다시 더해도 값이 변하지 않으므로 재처리에 안전하고, 롤업에는 PFCOUNT 값을
+  그대로(GREATEST) 기록합니다. 기간 조회의 순 방문자는 버킷 합이 아니라 키 합집합(PFCOUNT k1 k2 ...)
+  이므로 여러 날에 걸쳐 방문한 사람을 한 번만 셉니다. 보관 기간이 지난 범위는 롤업 합으로 대신합니다.
+- 집계를 다시 만들어야 하면(도입 이전 데이터 등) `flask affiliate-stats rebuild`로 원본 클릭/전환에서
+  날짜별로 재계산합니다.
+"""
+
+import hashlib
+import logging
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+import redis
+from sqlalchemy import distinct, func
+from sqlalchemy.dialects.postgresql import insert
+
+from app import db
+from app.services.cache import tiered_cache
+
+logger = logging.getLogger(__name__)
+
+MEASURES = ('clicks', 'unique_visitors', 'conversions', 'revenue')
+COUNTERS = ('clicks', 'conversions', 'revenue')  # 증분으로 더하는 값 (unique_visitors는 추정치로 교체)
+
+# 이 기간 이하의 조회는 시간별 집계 사용 (최근 24시간 등)
+HOURLY_RANGE_LIMIT = timedelta(days=2)
+
+
+def hour_bucket(value):
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def day_bucket(value):
+    return value.date()
+
+
+def visitor_key(user_id=None, ip_address=None, user_agent=None):
+    """방문자 식별 값 (로그인 사용자는 사용자 ID, 아니면 IP + User-Agent)"""
+    raw = f'u:{user_id}' if user_id else f'a:{ip_address or ""}|{user_agent or ""}'
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class RollupBatch:
+    """한 트랜잭션에서 반영할 (링크, 버킷)별 증분"""
+
+    def __init__(self):
+        self.hourly = defaultdict(lambda: dict.fromkeys(MEASURES, 0))
+        self.daily = defaultdict(lambda: dict.fromkeys(MEASURES, 0))
+        self.visitors = defaultdict(set)  # (link_id, hour) -> 방문자 식별 값
+
+    def __bool__(self):
+        return bool(self.hourly or self.daily)
+
+    def add_click(self, link_id, clicked_at, visitor=None):
+        hour = hour_bucket(clicked_at)
+        self.hourly[(link_id, hour)]['clicks'] += 1
+        self.daily[(link_id, day_bucket(clicked_at))]['clicks'] += 1
+        if visitor:
+            self.visitors[(link_id, hour)].add(visitor)
+
+    def add_conversion(self, link_id, converted_at, revenue, count=1):
+        """전환 증분 (취소 반영 시 count=-1, revenue는 음수)"""
+        for rollup, bucket in ((self.hourly, hour_bucket(converted_at)), (self.daily, day_bucket(converted_at))):
+            delta = rollup[(link_id, bucket)]
+            delta['conversions'] += count
+            delta['revenue'] += revenue or 0.0
+
+
+class AffiliateStats:
+    """롤업 증분 반영 및 기간 조회"""
+
+    def __init__(self):
+        self.visitor_prefix = 'affiliate:visitors'
+        self.visitor_retention = timedelta(days=90)
+
+    def init_app(self, app):
+        self.visitor_prefix = app.config.get('AFFILIATE_STATS_VISITOR_PREFIX', 'affiliate:visitors')
+        self.visitor_retention = timedelta(days=app.config.get('AFFILIATE_STATS_VISITOR_RETENTION_DAYS', 90))
+
+    # 증분 반영
+
+    def add_clicks(self, batch, clicks):
+        """새로 기록된 클릭을 배치에 추가
+
+        clicks: (link_id, created_at, user_id, ip_address, user_agent) 목록
+        """
+        for link_id, created_at, user_id, ip_address, user_agent in clicks:
+            batch.add_click(link_id, created_at, visitor_key(user_id, ip_address, user_agent))
+
+    def _visitor_keys(self, scope, owner_id, hour):
+        """(시간 키, 시간 키 만료 시각), (날짜 키, 날짜 키 만료 시각)"""
+        day = datetime.combine(day_bucket(hour), time())
+        prefix = f'{self.visitor_prefix}:{scope}:{owner_id}'
+        return (
+            (f'{prefix}:{hour:%Y%m%d%H}', hour + timedelta(hours=1) + HOURLY_RANGE_LIMIT),
+            (f'{prefix}:{day:%Y%m%d}', day + timedelta(days=1) + self.visitor_retention)
+        )
+
+    def _count_visitors(self, batch, owners):
+        """방문자를 HyperLogLog에 더하고 링크 버킷별 추정치를 배치에 기록"""
+        try:
+            pipe = tiered_cache.redis.pipeline(transaction=False)
+            counted = {}  # HLL 키 -> 추정치를 기록할 배치 항목
+            for (link_id, hour), visitors in batch.visitors.items():
+                owner = owners.get(link_id)
+                if owner is None:
+                    continue
+                visitors = list(visitors)
+                link_keys = self._visitor_keys('link', link_id, hour)
+                author_keys = self._visitor_keys('author', owner['author_id'], hour)
+                for key, expires_at in (*link_keys, *author_keys):
+                    pipe.pfadd(key, *visitors)
+                    pipe.expireat(key, expires_at)
+                counted[link_keys[0][0]] = batch.hourly[(link_id, hour)]
+                counted[link_keys[1][0]] = batch.daily[(link_id, day_bucket(hour))]
+
+            for key in counted:
+                pipe.pfcount(key)
+            results = pipe.execute()
+        except redis.RedisError as e:
+            # 추정치를 갱신하지 못해도 클릭 집계는 계속 (다음 클릭 때 따라잡음)
+            logger.warning(f"순 방문자 HyperLogLog 갱신 실패: {e}")
+            return
+
+        for delta, count in zip(counted.values(), results[-len(counted):] if counted else []):
+            delta['unique_visitors'] = count
+
+    def apply(self, batch):
+        """배치 증분을 현재 트랜잭션에 반영 (커밋은 호출한 쪽에서)"""
+        from app.models.affiliate_stats import AffiliateStatsDaily, AffiliateStatsHourly
+
+        if not batch:
+            return
+
+        owners = self._owners({link_id for link_id, _ in (*batch.hourly, *batch.daily)})
+        if batch.visitors:
+            self._count_visitors(batch, owners)
+
+        connection = db.session.connection()
+        for model, deltas in ((AffiliateStatsHourly, batch.hourly), (AffiliateStatsDaily, batch.daily)):
+            rows = [
+                {'affiliate_link_id': link_id, 'bucket': bucket, **owners[link_id], **delta}
+                # (링크, 버킷) 순으로 갱신해 워커 간 교착 방지
+                for (link_id, bucket), delta in sorted(deltas.items())
+                if link_id in owners
+            ]
+            if not rows:
+                continue
+            table = model.__table__
+            stmt = insert(table).values(rows)
+            connection.execute(stmt.on_conflict_do_update(
+                index_elements=['affiliate_link_id', 'bucket'],
+                set_={
+                    **{measure: table.c[measure] + stmt.excluded[measure] for measure in COUNTERS},
+                    'unique_visitors': func.greatest(table.c.unique_visitors, stmt.excluded.unique_visitors)
+                }
+            ))
+
+    def _owners(self, link_ids):
+        """링크별 작성자와 제휴사"""
+        from app.models.affiliate_link import AffiliateLink
+        from app.models.blog_post import BlogPost
+
+        rows = db.session.query(AffiliateLink.id, AffiliateLink.partner, BlogPost.author_id).join(
+            BlogPost, AffiliateLink.blog_post_id == BlogPost.id
+        ).filter(AffiliateLink.id.in_(link_ids))
+        return {link_id: {'partner': partner, 'author_id': author_id} for link_id, partner, author_id in rows}
+
+    # 조회
+
+    def _rollup(self, start, end):
+        """기간에 맞는 집계 테이블과 버킷 조건"""
+        from app.models.affiliate_stats import AffiliateStatsDaily, AffiliateStatsHourly
+
+        if end - start <= HOURLY_RANGE_LIMIT:
+            model = AffiliateStatsHourly
+            return model, (model.bucket >= hour_bucket(start), model.bucket <= end)
+        model = AffiliateStatsDaily
+        return model, (model.bucket >= day_bucket(start), model.bucket <= day_bucket(end))
+
+    def _range_unique_visitors(self, scope, owner_ids, start, end):
+        """기간 전체의 순 방문자 추정치 {owner_id: count} (HyperLogLog 합집합)
+
+        범위의 키가 보관 기간을 지났거나 Redis를 쓸 수 없으면 None
+        """
+        now = datetime.utcnow()
+        if end - start <= HOURLY_RANGE_LIMIT:
+            if start < now - HOURLY_RANGE_LIMIT:
+                return None
+            step, bucket, fmt = timedelta(hours=1), hour_bucket(start), '%Y%m%d%H'
+        else:
+            if start < now - self.visitor_retention:
+                return None
+            step, bucket, fmt = timedelta(days=1), datetime.combine(day_bucket(start), time()), '%Y%m%d'
+
+        buckets = []
+        while bucket <= end:
+            buckets.append(bucket.strftime(fmt))
+            bucket += step
+
+        try:
+            pipe = tiered_cache.redis.pipeline(transaction=False)
+            for owner_id in owner_ids:
+                pipe.pfcount(*[f'{self.visitor_prefix}:{scope}:{owner_id}:{bucket}' for bucket in buckets])
+            return dict(zip(owner_ids, pipe.execute()))
+        except redis.RedisError as e:
+            logger.warning(f"순 방문자 추정치 조회 실패, 버킷 합으로 대신함: {e}")
+            return None
+
+    def summary(self, author_id, start, end, top=5):
+        """작성자의 기간 통계: 합계, 제휴사별, 상위 링크
+
+        합계와 상위 링크의 unique_visitors는 기간 전체의 순 방문자 추정치이고,
+        제휴사별 값과 보관 기간을 지난 범위는 버킷별 순 방문자의 합입니다.
+        """
+        from app.models.affiliate_link import AffiliateLink
+
+        model, bucket_range = self._rollup(start, end)
+        sums = [func.coalesce(func.sum(getattr(model, measure)), 0).label(measure) for measure in MEASURES]
+
+        def query(*columns):
+            return db.session.query(*columns, *sums).filter(model.author_id == author_id, *bucket_range)
+
+        totals = query().one()._asdict()
+        visitors = self._range_unique_visitors('author', [author_id], start, end)
+        if visitors is not None:
+            totals['unique_visitors'] = visitors[author_id]
+
+        by_partner = {
+            row.partner: {measure: getattr(row, measure) for measure in MEASURES}
+            for row in query(model.partner).group_by(model.partner)
+        }
+
+        top_rows = query(model.affiliate_link_id, model.partner).group_by(
+            model.affiliate_link_id, model.partner
+        ).order_by(func.sum(model.clicks).desc()).limit(top).all()
+        names = dict(db.session.query(AffiliateLink.id, AffiliateLink.product_name).filter(
+            AffiliateLink.id.in_([row.affiliate_link_id for row in top_rows])
+        )) if top_rows else {}
+        link_visitors = self._range_unique_visitors(
+            'link', [row.affiliate_link_id for row in top_rows], start, end
+        ) if top_rows else None
+        top_links = [
+            {
+                'id': row.affiliate_link_id,
+                'product_name': names.get(row.affiliate_link_id),
+                'partner': row.partner,
+                **{measure: getattr(row, measure) for measure in MEASURES},
+                **({'unique_visitors': link_visitors[row.affiliate_link_id]} if link_visitors else {})
+            }
+            for row in top_rows
+        ]
+
+        return {'totals': totals, 'by_partner': by_partner, 'top_links': top_links}
+
+    def daily_series(self, author_id, start, end):
+        """작성자의 일별 합계 [(date, {measure: value}), ...] (날짜순)"""
+        from app.models.affiliate_stats import AffiliateStatsDaily as model
+
+        rows = db.session.query(
+            model.bucket, *[func.sum(getattr(model, measure)).label(measure) for measure in MEASURES]
+        ).filter(
+            model.author_id == author_id,
+            model.bucket >= day_bucket(start),
+            model.bucket <= day_bucket(end)
+        ).group_by(model.bucket).order_by(model.bucket)
+        return [(row.bucket, {measure: getattr(row, measure) for measure in MEASURES}) for row in rows]
+
+    # 재계산
+
+    def rebuild(self, start_date, end_date):
+        """원본 클릭/전환에서 날짜별로 집계를 다시 계산. 처리한 날짜 수 반환"""
+        day = start_date
+        while day <= end_date:
+            self._rebuild_day(day)
+            db.session.commit()
+            day += timedelta(days=1)
+        return (end_date - start_date).days + 1
+
+    def _rebuild_day(self, day):
+        from app.models.affiliate_link import AffiliateLinkClick as Click
+        from app.models.affiliate_link import AffiliateLinkConversion as Conversion
+        from app.models.affiliate_stats import AffiliateStatsDaily, AffiliateStatsHourly
+
+        start = datetime.combine(day, time())
+        end = start + timedelta(days=1)
+
+        AffiliateStatsHourly.query.filter(
+            AffiliateStatsHourly.bucket >= start, AffiliateStatsHourly.bucket < end
+        ).delete(synchronize_session=False)
+        AffiliateStatsDaily.query.filter(AffiliateStatsDaily.bucket == day).delete(synchronize_session=False)
+
+        batch = RollupBatch()
+        visitor = func.coalesce(Click.user_id, func.concat(Click.ip_address, '|', Click.user_agent))
+        click_range = (Click.created_at >= start, Click.created_at < end)
+
+        hour = func.date_trunc('hour', Click.created_at)
+        for link_id, bucket, clicks, visitors in db.session.query(
+            Click.affiliate_link_id, hour, func.count(), func.count(distinct(visitor))
+        ).filter(*click_range).group_by(Click.affiliate_link_id, hour):
+            batch.hourly[(link_id, bucket)].update(clicks=clicks, unique_visitors=visitors)
+
+        for link_id, clicks, visitors in db.session.query(
+            Click.affiliate_link_id, func.count(), func.count(distinct(visitor))
+        ).filter(*click_range).group_by(Click.affiliate_link_id):
+            batch.daily[(link_id, day)].update(clicks=clicks, unique_visitors=visitors)
+
+        hour = func.date_trunc('hour', Conversion.created_at)
+        for link_id, bucket, conversions, revenue in db.session.query(
+            Conversion.affiliate_link_id, hour, func.count(), func.sum(Conversion.commission_earned)
+        ).filter(
+            Conversion.created_at >= start, Conversion.created_at < end, Conversion.status != 'cancelled'
+        ).group_by(Conversion.affiliate_link_id, hour):
+            batch.add_conversion(link_id, bucket, revenue, count=conversions)
+
+        self.apply(batch)
+
+
+affiliate_stats = AffiliateStats()
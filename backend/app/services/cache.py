@@ -0,0 +1,533 @@
+"""
+2단계 공유 캐시 (프로세스 내 LRU + Redis)
+
+- L1: 워커 프로세스마다 두는 작은 LRU
+- L2: Redis (REDIS_URL)
+- 무효화: Redis pub/sub 채널로 브로드캐스트하여 모든 워커/컨테이너의 L1 항목을 제거
+- 네임스페이스 버전: Redis 카운터를 올려 해당 네임스페이스의 기존 키를 한 번에 무효화
+- 키 세대: 삭제할 때마다 키별 카운터를 올리며, DB에서 읽기 전에 세대를 읽어 두고
+  set_many(generations=...)로 저장하면 그 사이 무효화된 키(이전 값)는 저장하지 않음
+- L1 채우기: Redis 응답을 기다리는 동안 같은 네임스페이스의 무효화 메시지가 도착했으면
+  읽은 값을 L1에 넣지 않음 (이전 값이 L1에 다시 들어가 CACHE_L1_TTL 동안 남지 않게)
+- get_or_compute: 키당 한 번만 계산(single-flight)하고, soft TTL이 지난 값은
+  즉시 반환하면서 백그라운드에서 갱신(stale-while-revalidate)
+
+L1 값은 워커 내에서 공유되므로 꺼낸 값을 직접 수정하지 않아야 합니다.
+"""
+
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+import redis
+from flask import current_app, has_app_context
+
+from app.utils.lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = 'petplace:cache:invalidate'
+KEY_PREFIX = 'tc:'
+
+# 락 소유자만 해제하도록 compare-and-delete
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# 세대가 읽어 둔 값 그대로일 때만 저장
+_SET_IF_GENERATION_SCRIPT = """
+if (redis.call('get', KEYS[1]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('set', KEYS[2], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+# 키 세대 보관 시간 (DB에서 읽고 캐시에 저장하기까지보다 충분히 길게)
+GENERATION_TTL = 3600
+
+
+class CachedValue:
+    """soft TTL(fresh_until)을 함께 저장하는 값 래퍼"""
+    __slots__ = ('value', 'fresh_until')
+
+    def __init__(self, value, fresh_until):
+        self.value = value
+        self.fresh_until = fresh_until
+
+    def __getstate__(self):
+        return (self.value, self.fresh_until)
+
+    def __setstate__(self, state):
+        self.value, self.fresh_until = state
+
+    @property
+    def is_stale(self):
+        return time.time() >= self.fresh_until
+
+
+class TieredCache:
+    """네임스페이스 단위로 관리되는 L1/L2 캐시"""
+
+    def __init__(self):
+        self.enabled = False
+        self.default_timeout = 300
+        self.instance_id = uuid.uuid4().hex
+        self._redis_url = None
+        self._redis = None
+        self._redis_pid = None
+        self._local = LRUCache()
+        self._versions = {}
+        self._listeners = []
+        self._subscriber_pid = None
+        self._lock = threading.Lock()
+        self._fill_lock = threading.Lock()
+        self._invalidations = defaultdict(int)  # 네임스페이스 → 이 프로세스에서 받은 무효화 수
+        self._resets = 0
+        self._flights = {}
+        self._refreshing = set()
+        self.lock_timeout = 30
+        self.wait_timeout = 5
+
+    def init_app(self, app):
+        self.enabled = app.config.get('TIERED_CACHE_ENABLED', True)
+        self.default_timeout = app.config.get('TIERED_CACHE_TIMEOUT', 300)
+        self.lock_timeout = app.config.get('CACHE_COMPUTE_LOCK_TIMEOUT', 30)
+        self.wait_timeout = app.config.get('CACHE_COMPUTE_WAIT_TIMEOUT', 5)
+        self._redis_url = app.config['REDIS_URL']
+        self._local = LRUCache(
+            maxsize=app.config.get('CACHE_L1_SIZE', 4096),
+            ttl=app.config.get('CACHE_L1_TTL', 300)
+        )
+        app.extensions['tiered_cache'] = self
+
+    @property
+    def redis(self):
+        """프로세스별 Redis 클라이언트 (fork 이후 재생성)"""
+        pid = os.getpid()
+        if self._redis is None or self._redis_pid != pid:
+            self._redis = redis.Redis.from_url(self._redis_url)
+            self._redis_pid = pid
+        return self._redis
+
+    # 조회 / 저장
+
+    def get(self, namespace, key):
+        """값 조회 (L1 → L2). 없으면 None"""
+        return self.get_many(namespace, [key]).get(key)
+
+    def get_many(self, namespace, keys):
+        """여러 값 조회. 찾은 키만 포함된 dict 반환"""
+        if not self.enabled or not keys:
+            return {}
+        self._ensure_subscriber()
+
+        version = self._version(namespace)
+        result = {}
+        remote = []
+        for key in keys:
+            value = self._local.get(self._local_key(namespace, version, key))
+            if value is not None:
+                result[key] = value
+            else:
+                remote.append(key)
+
+        if remote:
+            mark = self._invalidation_mark(namespace)
+            try:
+                values = self.redis.mget([self._remote_key(namespace, version, key) for key in remote])
+            except redis.RedisError as e:
+                logger.warning(f"캐시 조회 실패 ({namespace}): {e}")
+                return result
+
+            found = {key: pickle.loads(raw) for key, raw in zip(remote, values) if raw is not None}
+            result.update(found)
+            self._fill_local(namespace, version, found, mark)
+
+        return result
+
+    def set(self, namespace, key, value, timeout=None):
+        """값 저장 (L1 + L2)"""
+        self.set_many(namespace, {key: value}, timeout=timeout)
+
+    def set_many(self, namespace, mapping, timeout=None, generations=None):
+        """여러 값 저장
+
+        generations: 값을 읽기 전에 generations()로 받아 둔 키별 세대. 주어지면 세대가
+        그대로인 키만 저장합니다 (없는 키는 저장하지 않음).
+        """
+        if not self.enabled or not mapping:
+            return
+        self._ensure_subscriber()
+
+        timeout = timeout or self.default_timeout
+        version = self._version(namespace)
+        if generations is not None:
+            self._set_if_generation(namespace, version, mapping, timeout, generations)
+            return
+
+        for key, value in mapping.items():
+            self._local.set(self._local_key(namespace, version, key), value)
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, value in mapping.items():
+                pipe.set(
+                    self._remote_key(namespace, version, key),
+                    pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                    ex=timeout
+                )
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"캐시 저장 실패 ({namespace}): {e}")
+
+    def generations(self, namespace, keys):
+        """키별 무효화 세대 {key: int} (Redis 장애 시 빈 dict → 저장하지 않음)"""
+        if not self.enabled or not keys:
+            return {}
+        try:
+            values = self.redis.mget([self._generation_key(namespace, key) for key in keys])
+        except redis.RedisError as e:
+            logger.warning(f"캐시 세대 조회 실패 ({namespace}): {e}")
+            return {}
+        return {key: int(value or 0) for key, value in zip(keys, values)}
+
+    def _set_if_generation(self, namespace, version, mapping, timeout, generations):
+        keys = [key for key in mapping if key in generations]
+        if not keys:
+            return
+        mark = self._invalidation_mark(namespace)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.eval(
+                    _SET_IF_GENERATION_SCRIPT, 2,
+                    self._generation_key(namespace, key), self._remote_key(namespace, version, key),
+                    generations[key], pickle.dumps(mapping[key], protocol=pickle.HIGHEST_PROTOCOL), timeout
+                )
+            stored = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"캐시 저장 실패 ({namespace}): {e}")
+            return
+
+        self._fill_local(namespace, version, {key: mapping[key] for key, ok in zip(keys, stored) if ok}, mark)
+
+    def _invalidation_mark(self, namespace):
+        return self._resets, self._invalidations[namespace]
+
+    def _fill_local(self, namespace, version, values, mark):
+        """Redis에서 읽거나 저장한 값을 L1에 넣음 (mark 이후 무효화가 있었으면 넣지 않음)"""
+        with self._fill_lock:
+            if self._invalidation_mark(namespace) != mark:
+                return
+            for key, value in values.items():
+                self._local.set(self._local_key(namespace, version, key), value)
+
+    def _count_invalidation(self, namespace=None):
+        """L1 항목을 지우기 전에 호출 (namespace가 None이면 전체 초기화)"""
+        with self._fill_lock:
+            if namespace is None:
+                self._resets += 1
+            else:
+                self._invalidations[namespace] += 1
+
+    # single-flight / stale-while-revalidate
+
+    def get_or_compute(self, namespace, key, compute, timeout=None, soft_timeout=None):
+        """캐시된 값을 반환하고, 없으면 키당 한 번만 compute()로 계산
+
+        - soft_timeout 이내: 캐시 값 반환
+        - soft_timeout 경과, timeout 이내: 오래된 값을 즉시 반환하고 백그라운드에서 갱신
+        - 캐시 없음: 프로세스 내 스레드와 다른 워커 중 하나만 계산하고 나머지는 결과를 기다림
+        """
+        if not self.enabled:
+            return compute()
+
+        timeout = timeout or self.default_timeout
+        soft_timeout = soft_timeout or timeout
+
+        entry = self.get(namespace, key)
+        if isinstance(entry, CachedValue):
+            if entry.is_stale:
+                self.schedule_refresh(namespace, key, compute, timeout, soft_timeout)
+            return entry.value
+
+        return self._compute_once(namespace, key, compute, timeout, soft_timeout)
+
+    def refresh(self, namespace, key, compute, timeout=None, soft_timeout=None):
+        """값을 즉시 다시 계산해 저장하고 반환 (스케줄러/CLI용)"""
+        value = compute()
+        if self.enabled:
+            timeout = timeout or self.default_timeout
+            self._store_computed(namespace, key, value, timeout, soft_timeout or timeout)
+        return value
+
+    def schedule_refresh(self, namespace, key, compute, timeout=None, soft_timeout=None, callback=None):
+        """백그라운드 스레드에서 값을 다시 계산 (키당 하나의 워커/스레드만 실행)
+
+        callback이 주어지면 새 값이 저장된 뒤 callback(value)를 호출합니다.
+        """
+        if not self.enabled:
+            return
+
+        timeout = timeout or self.default_timeout
+        soft_timeout = soft_timeout or timeout
+        flight_key = f'{namespace}:{key}'
+        with self._lock:
+            if flight_key in self._refreshing:
+                return
+            self._refreshing.add(flight_key)
+
+        token = self._acquire_lock(namespace, key)
+        if token is None:
+            with self._lock:
+                self._refreshing.discard(flight_key)
+            return
+
+        app = current_app._get_current_object() if has_app_context() else None
+
+        def run():
+            value = compute()
+            self._store_computed(namespace, key, value, timeout, soft_timeout)
+            if callback is not None:
+                callback(value)
+
+        def refresh():
+            try:
+                if app is not None:
+                    with app.app_context():
+                        run()
+                else:
+                    run()
+            except Exception as e:
+                logger.error(f"캐시 백그라운드 갱신 실패 ({flight_key}): {e}")
+            finally:
+                self._release_lock(namespace, key, token)
+                with self._lock:
+                    self._refreshing.discard(flight_key)
+
+        threading.Thread(target=refresh, name=f'cache-refresh:{flight_key}', daemon=True).start()
+
+    def _compute_once(self, namespace, key, compute, timeout, soft_timeout):
+        flight_key = f'{namespace}:{key}'
+        with self._lock:
+            flight = self._flights.get(flight_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[flight_key] = threading.Event()
+
+        if not leader:
+            # 같은 프로세스의 다른 스레드가 계산 중
+            flight.wait(self.wait_timeout)
+            entry = self.get(namespace, key)
+            if isinstance(entry, CachedValue):
+                return entry.value
+            return compute()
+
+        try:
+            token = self._acquire_lock(namespace, key)
+            if token is not None:
+                try:
+                    value = compute()
+                    self._store_computed(namespace, key, value, timeout, soft_timeout)
+                    return value
+                finally:
+                    self._release_lock(namespace, key, token)
+
+            # 다른 워커가 계산 중 - 결과가 저장될 때까지 대기
+            deadline = time.monotonic() + self.wait_timeout
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                entry = self.get(namespace, key)
+                if isinstance(entry, CachedValue):
+                    return entry.value
+
+            value = compute()
+            self._store_computed(namespace, key, value, timeout, soft_timeout)
+            return value
+        finally:
+            with self._lock:
+                self._flights.pop(flight_key, None)
+            flight.set()
+
+    def _store_computed(self, namespace, key, value, timeout, soft_timeout):
+        self.set(namespace, key, CachedValue(value, time.time() + soft_timeout), timeout=timeout)
+
+    def _acquire_lock(self, namespace, key):
+        """워커 간 계산 락 획득. 성공 시 토큰, 실패 시 None (Redis 장애 시에는 락 없이 진행)"""
+        token = uuid.uuid4().hex
+        try:
+            acquired = self.redis.set(
+                f'{KEY_PREFIX}lock:{namespace}:{key}', token,
+                nx=True, ex=self.lock_timeout
+            )
+        except redis.RedisError as e:
+            logger.warning(f"캐시 계산 락 획득 실패 ({namespace}:{key}): {e}")
+            return token
+        return token if acquired else None
+
+    def _release_lock(self, namespace, key, token):
+        try:
+            self.redis.eval(_RELEASE_LOCK_SCRIPT, 1, f'{KEY_PREFIX}lock:{namespace}:{key}', token)
+        except redis.RedisError as e:
+            logger.warning(f"캐시 계산 락 해제 실패 ({namespace}:{key}): {e}")
+
+    # 무효화
+
+    def delete(self, namespace, key):
+        """키 무효화 - 모든 워커의 L1에서도 제거"""
+        self.delete_many(namespace, [key])
+
+    def delete_many(self, namespace, keys):
+        if not self.enabled or not keys:
+            return
+
+        version = self._version(namespace)
+        self._count_invalidation(namespace)
+        for key in keys:
+            self._local.delete(self._local_key(namespace, version, key))
+
+        try:
+            # 세대를 먼저 올려 삭제 전에 읽은 값이 뒤늦게 저장되지 않게
+            pipe = self.redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.incr(self._generation_key(namespace, key))
+                pipe.expire(self._generation_key(namespace, key), GENERATION_TTL)
+            pipe.delete(*[self._remote_key(namespace, version, key) for key in keys])
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"캐시 삭제 실패 ({namespace}): {e}")
+
+        self.publish({'op': 'keys', 'ns': namespace, 'keys': list(keys)})
+
+    def invalidate_namespace(self, namespace):
+        """네임스페이스 버전을 올려 기존 키 전체를 무효화"""
+        if not self.enabled:
+            return
+
+        self._count_invalidation(namespace)
+        self._local.delete_prefix(f'{namespace}:')
+        try:
+            version = self.redis.incr(self._version_key(namespace))
+        except redis.RedisError as e:
+            logger.warning(f"캐시 네임스페이스 무효화 실패 ({namespace}): {e}")
+            self._versions.pop(namespace, None)
+            return
+
+        self._versions[namespace] = version
+        self.publish({'op': 'namespace', 'ns': namespace, 'version': version})
+
+    def version(self, namespace):
+        """네임스페이스의 현재 버전 (변경 감지용)"""
+        if not self.enabled:
+            return 0
+        self._ensure_subscriber()
+        return self._version(namespace)
+
+    # pub/sub
+
+    def publish(self, message):
+        """무효화 메시지 브로드캐스트"""
+        message = dict(message, origin=self.instance_id)
+        try:
+            self.redis.publish(INVALIDATION_CHANNEL, json.dumps(message))
+        except redis.RedisError as e:
+            logger.warning(f"캐시 무효화 메시지 발행 실패: {e}")
+
+    def add_listener(self, callback):
+        """무효화 메시지 수신 콜백 등록 - callback(message)"""
+        self._listeners.append(callback)
+
+    def subscribe(self):
+        """현재 프로세스에서 무효화 채널 구독 시작 (리스너만 쓰는 경우, 이미 구독 중이면 무시)"""
+        if self.enabled:
+            self._ensure_subscriber()
+
+    def _ensure_subscriber(self):
+        pid = os.getpid()
+        if self._subscriber_pid == pid:
+            return
+        with self._lock:
+            if self._subscriber_pid == pid:
+                return
+            self._subscriber_pid = pid
+            thread = threading.Thread(target=self._listen, name='cache-invalidation', daemon=True)
+            thread.start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                # 연결이 끊긴 동안 놓친 메시지가 있을 수 있으므로 L1을 비움
+                self._count_invalidation()
+                self._local.clear()
+                self._versions.clear()
+                self._notify({'op': 'reset'})
+                for message in pubsub.listen():
+                    self._handle(message['data'])
+            except Exception as e:
+                logger.warning(f"캐시 무효화 구독 오류, 재연결합니다: {e}")
+                time.sleep(1)
+
+    def _handle(self, data):
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+
+        namespace = message.get('ns')
+        if message.get('op') in ('namespace', 'keys'):
+            self._count_invalidation(namespace)
+        if message.get('op') == 'namespace':
+            self._local.delete_prefix(f'{namespace}:')
+            self._versions[namespace] = message['version']
+        elif message.get('op') == 'keys':
+            version = self._versions.get(namespace, 0)
+            for key in message.get('keys', []):
+                self._local.delete(self._local_key(namespace, version, key))
+
+        self._notify(message)
+
+    def _notify(self, message):
+        """리스너 호출. 재연결 시에는 {'op': 'reset'} (놓친 메시지가 있을 수 있음)"""
+        for callback in self._listeners:
+            try:
+                callback(message)
+            except Exception as e:
+                logger.error(f"캐시 무효화 콜백 오류: {e}")
+
+    # 키 / 버전
+
+    def _version(self, namespace):
+        version = self._versions.get(namespace)
+        if version is None:
+            try:
+                version = int(self.redis.get(self._version_key(namespace)) or 0)
+            except redis.RedisError:
+                version = 0
+            self._versions[namespace] = version
+        return version
+
+    def _version_key(self, namespace):
+        return f'{KEY_PREFIX}version:{namespace}'
+
+    def _local_key(self, namespace, version, key):
+        return f'{namespace}:{version}:{key}'
+
+    def _remote_key(self, namespace, version, key):
+        return f'{KEY_PREFIX}{namespace}:v{version}:{key}'
+
+    def _generation_key(self, namespace, key):
+        return f'{KEY_PREFIX}gen:{namespace}:{key}'
+
+
+tiered_cache = TieredCache()
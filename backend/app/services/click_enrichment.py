@@ -0,0 +1,129 @@
+"""
+클릭 부가 정보 (기기/브라우저/OS, 국가/도시)
+
+클릭 반영 워커가 배치를 INSERT하기 직전에 채웁니다. 리다이렉트 요청 경로에서는 실행되지 않습니다.
+
+- User-Agent와 IP는 배치 안에서 중복을 제거한 뒤 워커 프로세스의 LRU 캐시에서 찾고,
+  캐시에 없는 값만 파싱/조회합니다. 클릭 대부분은 소수의 User-Agent에서 오므로 대개 캐시에서 끝납니다.
+- 캐시에 없는 값이 많으면(배포 직후, 크롤링 급증) 프로세스 풀(AFFILIATE_CLICK_ENRICH_WORKERS)에
+  나누어 처리합니다. 풀 프로세스는 시작할 때 IP 대역 테이블을 한 번 적재합니다.
+- IP 대역 테이블(GEOIP_RANGES_PATH)이 없으면 국가/도시는 비워 둡니다.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.utils.ip_ranges import IPRangeTable
+from app.utils.lru import LRUCache
+from app.utils.user_agent import parse_user_agent
+
+logger = logging.getLogger(__name__)
+
+# 캐시에 없는 값이 이보다 적으면 풀로 보내지 않고 직접 처리 (프로세스 간 전달 비용이 더 큼)
+PARALLEL_THRESHOLD = 200
+CHUNK_SIZE = 100
+
+# affiliate_link_clicks 컬럼 길이
+FIELD_LIMITS = {'country': 50, 'city': 100, 'device_type': 50, 'browser': 50, 'os': 50}
+
+_ip_table = None  # 프로세스별 IP 대역 테이블
+
+
+def _load_ip_table(path):
+    global _ip_table
+    if not path or not os.path.exists(path):
+        _ip_table = IPRangeTable()
+        return
+    _ip_table = IPRangeTable.load(path)
+    logger.info(f"IP 대역 테이블 적재: {len(_ip_table)}건 ({path})")
+
+
+def _parse_user_agents(user_agents):
+    return [parse_user_agent(user_agent) for user_agent in user_agents]
+
+
+def _lookup_ips(ips):
+    return [_ip_table.lookup(ip) for ip in ips]
+
+
+class ClickEnricher:
+    """클릭 행에 country, city, device_type, browser, os 채우기"""
+
+    def __init__(self):
+        self.workers = 0
+        self.geoip_path = None
+        self._user_agents = LRUCache(maxsize=10000)
+        self._locations = LRUCache(maxsize=100000)
+        self._pool = None
+        self._pool_pid = None
+
+    def init_app(self, app):
+        self.workers = app.config.get('AFFILIATE_CLICK_ENRICH_WORKERS', 0)
+        self.geoip_path = app.config.get('GEOIP_RANGES_PATH')
+        self._user_agents = LRUCache(maxsize=app.config.get('AFFILIATE_CLICK_UA_CACHE_SIZE', 10000))
+        self._locations = LRUCache(maxsize=app.config.get('AFFILIATE_CLICK_IP_CACHE_SIZE', 100000))
+
+    def enrich(self, rows):
+        """클릭 행(dict) 목록에 부가 정보 컬럼 추가 (제자리 수정)"""
+        user_agents = self._resolve(
+            self._user_agents, {row['user_agent'] for row in rows if row.get('user_agent')}, _parse_user_agents
+        )
+        locations = self._resolve(
+            self._locations, {row['ip_address'] for row in rows if row.get('ip_address')}, _lookup_ips
+        )
+
+        for row in rows:
+            row['device_type'], row['browser'], row['os'] = user_agents.get(row.get('user_agent'), (None, None, None))
+            row['country'], row['city'] = locations.get(row.get('ip_address'), (None, None))
+            for key, limit in FIELD_LIMITS.items():
+                if row[key]:
+                    row[key] = row[key][:limit]
+        return rows
+
+    def _resolve(self, cache, keys, compute):
+        results = {}
+        misses = []
+        for key in keys:
+            value = cache.get(key)
+            if value is None:
+                misses.append(key)
+            else:
+                results[key] = value
+
+        if misses:
+            for key, value in zip(misses, self._compute(compute, misses)):
+                cache.set(key, value)
+                results[key] = value
+        return results
+
+    def _compute(self, compute, keys):
+        if self.workers > 0 and len(keys) >= PARALLEL_THRESHOLD:
+            chunks = [keys[start:start + CHUNK_SIZE] for start in range(0, len(keys), CHUNK_SIZE)]
+            try:
+                return [value for chunk in self._get_pool().map(compute, chunks) for value in chunk]
+            except BrokenProcessPool as e:
+                logger.warning(f"클릭 부가 정보 프로세스 풀 재시작: {e}")
+                self._pool = None
+
+        if _ip_table is None:
+            _load_ip_table(self.geoip_path)
+        return compute(keys)
+
+    def _get_pool(self):
+        # fork된 프로세스는 부모의 풀을 쓸 수 없음
+        if self._pool is None or self._pool_pid != os.getpid():
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_load_ip_table, initargs=(self.geoip_path,)
+            )
+            self._pool_pid = os.getpid()
+        return self._pool
+
+    def shutdown(self):
+        if self._pool is not None and self._pool_pid == os.getpid():
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+
+click_enricher = ClickEnricher()
@@ -0,0 +1,421 @@
+"""
+제휴 링크 클릭 로그
+
+리다이렉트 경로에서는 데이터베이스에 쓰지 않고 클릭 이벤트를 Redis 스트림에 추가(XADD)만 하고,
+별도 워커(`flask clicks worker`)가 모아서 affiliate_link_clicks에 다중 행 INSERT로 기록한 뒤
+링크별 click_count 증가분을 한 번에 반영합니다.
+
+- Redis에 쓸 수 없으면 로컬 스풀 디렉터리의 파일 세그먼트(NDJSON, append-only)에 기록하고,
+  워커가 다음 주기에 같은 경로로 반영한 뒤 세그먼트를 삭제합니다.
+- 클릭 행의 ID는 스트림 엔트리 ID(스풀은 UUID)이고 INSERT ... ON CONFLICT DO NOTHING으로
+  기록하므로, 워커가 커밋 후 ACK 전에 종료되어 다시 처리해도 중복 집계되지 않습니다.
+- 같은 (링크, IP, User-Agent)의 반복 클릭은 기록 시점에 회전 블룸 필터(Redis 비트맵)로 판별해
+  이벤트에 표시하고(XADD와 같은 Lua 스크립트), 워커는 표시된 클릭과 봇 User-Agent 클릭을 버립니다.
+  판별 결과가 이벤트에 함께 저장되므로 워커가 재처리해도 결과가 바뀌지 않습니다.
+- 기기/브라우저/OS와 국가/도시는 INSERT 직전에 워커에서 채웁니다 (click_enrichment).
+- 새로 기록된 클릭은 같은 트랜잭션에서 시간별/일별 통계 집계에도 더합니다 (affiliate_stats).
+- 처리 중 종료된 워커의 미확인(pending) 엔트리는 XAUTOCLAIM으로 가져와 다시 처리합니다.
+  다시 가져온 배치가 실패하면 한 건씩 반영해 실패하는 엔트리만 남기고, 전달 횟수(XPENDING)가
+  AFFILIATE_CLICK_MAX_DELIVERIES를 넘은 엔트리는 실패 스트림({stream}:dead)으로 옮긴 뒤 ACK합니다.
+- 같은 횟수만큼 반영에 실패한 스풀 세그먼트는 .failed로 이름을 바꿔 두고 더 시도하지 않습니다
+  (확인 후 .ndjson으로 되돌리면 다시 반영하며, 이미 반영된 클릭은 중복 집계되지 않음).
+"""
+
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+
+import redis
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app import db
+from app.services.affiliate_stats import RollupBatch, affiliate_stats
+from app.services.cache import tiered_cache
+from app.services.click_enrichment import click_enricher
+from app.utils.bloom import RotatingBloomFilter
+from app.utils.user_agent import is_bot
+
+logger = logging.getLogger(__name__)
+
+# affiliate_link_clicks 컬럼 길이
+FIELD_LIMITS = {'ip_address': 45, 'user_agent': 500, 'referrer': 500}
+
+# 블룸 필터 확인/기록과 XADD를 한 번에 (원자적, 왕복 1회)
+# KEYS: 스트림, 현재 세대, 직전 세대 / ARGV: 세대 TTL, 해시 수, 비트 위치..., 필드, 값, ...
+_RECORD_SCRIPT = """
+local hashes = tonumber(ARGV[2])
+local seen_current, seen_previous = 1, 1
+for i = 3, 2 + hashes do
+    if redis.call('setbit', KEYS[2], ARGV[i], 1) == 0 then seen_current = 0 end
+    if seen_previous == 1 and redis.call('getbit', KEYS[3], ARGV[i]) == 0 then seen_previous = 0 end
+end
+redis.call('expire', KEYS[2], ARGV[1])
+local fields = {}
+for i = 3 + hashes, #ARGV do fields[#fields + 1] = ARGV[i] end
+fields[#fields + 1] = 'duplicate'
+fields[#fields + 1] = (seen_current == 1 or seen_previous == 1) and '1' or '0'
+return redis.call('xadd', KEYS[1], '*', unpack(fields))
+"""
+
+
+class ClickLog:
+    """클릭 이벤트 버퍼 (Redis 스트림 + 파일 스풀)"""
+
+    def __init__(self):
+        self.stream = 'affiliate:clicks'
+        self.group = 'click-flusher'
+        self.spool_path = None
+        self.batch_size = 500
+        self.block_ms = 1000
+        self.claim_idle_ms = 60000
+        self.max_deliveries = 5
+        self.dead_stream = 'affiliate:clicks:dead'
+        self.dead_maxlen = 100000
+        self._spool_failures = {}  # 세그먼트 이름 → 반영 실패 횟수
+        self.dedupe = RotatingBloomFilter('affiliate:clicks:seen', window=1800, capacity=1000000)
+
+    def init_app(self, app):
+        self.stream = app.config.get('AFFILIATE_CLICK_STREAM', 'affiliate:clicks')
+        self.group = app.config.get('AFFILIATE_CLICK_GROUP', 'click-flusher')
+        self.spool_path = app.config.get('AFFILIATE_CLICK_SPOOL_PATH')
+        self.batch_size = app.config.get('AFFILIATE_CLICK_BATCH_SIZE', 500)
+        self.block_ms = int(app.config.get('AFFILIATE_CLICK_FLUSH_INTERVAL', 1) * 1000)
+        self.claim_idle_ms = int(app.config.get('AFFILIATE_CLICK_CLAIM_IDLE', 60) * 1000)
+        self.max_deliveries = app.config.get('AFFILIATE_CLICK_MAX_DELIVERIES', 5)
+        self.dead_stream = app.config.get('AFFILIATE_CLICK_DEAD_STREAM') or f'{self.stream}:dead'
+        self.dead_maxlen = app.config.get('AFFILIATE_CLICK_DEAD_MAXLEN', 100000)
+        self.dedupe = RotatingBloomFilter(
+            f'{self.stream}:seen',
+            window=app.config.get('AFFILIATE_CLICK_DEDUPE_WINDOW', 1800),
+            capacity=app.config.get('AFFILIATE_CLICK_DEDUPE_CAPACITY', 1000000),
+            error_rate=app.config.get('AFFILIATE_CLICK_DEDUPE_ERROR_RATE', 0.001)
+        )
+
+    # 기록 (요청 경로)
+
+    def record(self, link_id, user_id=None, ip_address=None, user_agent=None, referrer=None):
+        """클릭 이벤트를 버퍼에 추가 (데이터베이스에 쓰지 않음)"""
+        now = time.time()
+        event = {
+            'link_id': link_id,
+            'user_id': user_id or '',
+            'ip_address': ip_address or '',
+            'user_agent': user_agent or '',
+            'referrer': referrer or '',
+            'ts': f'{now:.6f}'
+        }
+        for key, limit in FIELD_LIMITS.items():
+            event[key] = event[key][:limit]
+
+        current, previous = self.dedupe.keys(now)
+        offsets = self.dedupe.offsets(f"{link_id}|{event['ip_address']}|{event['user_agent']}")
+        try:
+            tiered_cache.redis.eval(
+                _RECORD_SCRIPT, 3, self.stream, current, previous,
+                self.dedupe.ttl, len(offsets), *offsets, *[item for pair in event.items() for item in pair]
+            )
+        except redis.RedisError as e:
+            logger.warning(f"클릭 스트림 기록 실패, 스풀에 기록: {e}")
+            self._spool(event)
+
+    def _spool(self, event):
+        if not self.spool_path:
+            logger.error(f"클릭 유실 (스풀 경로 없음): {event['link_id']}")
+            return
+
+        event = dict(event, id=str(uuid.uuid4()))
+        # 프로세스/시간(분)별 세그먼트. 한 줄 단위 O_APPEND 쓰기라 프로세스 간 섞이지 않음
+        segment = f"clicks-{socket.gethostname()}-{os.getpid()}-{time.strftime('%Y%m%d%H%M')}.ndjson"
+        line = (json.dumps(event, ensure_ascii=False) + '\n').encode('utf-8')
+        try:
+            os.makedirs(self.spool_path, exist_ok=True)
+            fd = os.open(os.path.join(self.spool_path, segment), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.error(f"클릭 스풀 기록 실패 ({event['link_id']}): {e}")
+
+    # 반영 (워커)
+
+    def ensure_group(self):
+        try:
+            tiered_cache.redis.xgroup_create(self.stream, self.group, id='0', mkstream=True)
+        except redis.ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+
+    def flush_stream(self, consumer, block=True):
+        """스트림에서 한 배치를 읽어 반영. 처리한 이벤트 수 반환"""
+        client = tiered_cache.redis
+
+        # 다른 워커가 처리하다 멈춘 엔트리(또는 반영에 실패한 엔트리) 먼저
+        _, entries, *_ = client.xautoclaim(
+            self.stream, self.group, consumer, self.claim_idle_ms, '0-0', count=self.batch_size
+        )
+        claimed = bool(entries)
+        if not claimed:
+            response = client.xreadgroup(
+                self.group, consumer, {self.stream: '>'},
+                count=self.batch_size, block=self.block_ms if block else None
+            )
+            entries = response[0][1] if response else []
+
+        entries = [(entry_id, fields) for entry_id, fields in entries if fields]
+        if not entries:
+            return 0
+
+        dead = 0
+        if claimed:
+            entries, dead = self._dead_letter(client, entries)
+            if not entries:
+                return dead
+
+        events = []
+        for entry_id, fields in entries:
+            event = {key.decode('utf-8'): value.decode('utf-8') for key, value in fields.items()}
+            event['id'] = entry_id.decode('utf-8')
+            events.append(event)
+
+        entry_ids = [entry_id for entry_id, _ in entries]
+        try:
+            self.apply(events)
+        except Exception as e:
+            if not claimed or len(events) == 1:
+                raise
+            # 다시 가져온 배치도 실패하면 한 건씩 반영해 실패하는 엔트리만 미확인으로 남김
+            logger.warning(f"클릭 배치 재반영 실패, 한 건씩 반영합니다 ({len(events)}건): {e}")
+            entry_ids = [entry_id for entry_id, event in zip(entry_ids, events) if self._apply_one(event)]
+
+        if entry_ids:
+            pipe = client.pipeline()
+            pipe.xack(self.stream, self.group, *entry_ids)
+            pipe.xdel(self.stream, *entry_ids)
+            pipe.execute()
+        return len(entry_ids) + dead
+
+    def _apply_one(self, event):
+        try:
+            self.apply([event])
+            return True
+        except Exception as e:
+            logger.warning(f"클릭 반영 실패 ({event['id']}): {e}")
+            return False
+
+    def _dead_letter(self, client, entries):
+        """전달 횟수가 한도를 넘은 엔트리를 실패 스트림으로 옮기고 ACK. (남은 엔트리, 옮긴 수)"""
+        pipe = client.pipeline(transaction=False)
+        for entry_id, _ in entries:
+            pipe.xpending_range(self.stream, self.group, min=entry_id, max=entry_id, count=1)
+        deliveries = {
+            entry_id: pending[0]['times_delivered'] if pending else 0
+            for (entry_id, _), pending in zip(entries, pipe.execute())
+        }
+
+        dead = [(entry_id, fields) for entry_id, fields in entries if deliveries[entry_id] > self.max_deliveries]
+        if not dead:
+            return entries, 0
+
+        entry_ids = [entry_id for entry_id, _ in dead]
+        pipe = client.pipeline()
+        for entry_id, fields in dead:
+            pipe.xadd(
+                self.dead_stream, {**fields, b'entry_id': entry_id, b'deliveries': deliveries[entry_id]},
+                maxlen=self.dead_maxlen, approximate=True
+            )
+        pipe.xack(self.stream, self.group, *entry_ids)
+        pipe.xdel(self.stream, *entry_ids)
+        pipe.execute()
+        logger.error(
+            f"클릭 {len(dead)}건을 {self.max_deliveries}번 넘게 반영하지 못해 {self.dead_stream}로 옮김 "
+            f"(예: {entry_ids[0].decode('utf-8')})"
+        )
+        return [(entry_id, fields) for entry_id, fields in entries if deliveries[entry_id] <= self.max_deliveries], len(dead)
+
+    def flush_spool(self):
+        """다 쓴 스풀 세그먼트를 반영하고 삭제. 처리한 이벤트 수 반환"""
+        if not self.spool_path or not os.path.isdir(self.spool_path):
+            return 0
+
+        current_minute = time.strftime('%Y%m%d%H%M')
+        processed = 0
+        for name in sorted(os.listdir(self.spool_path)):
+            # 아직 쓰는 중일 수 있는 현재 분의 세그먼트는 다음 주기에
+            if not name.endswith('.ndjson') or name.endswith(f'-{current_minute}.ndjson'):
+                continue
+
+            path = os.path.join(self.spool_path, name)
+            try:
+                processed += self._flush_segment(path, name)
+            except Exception as e:
+                failures = self._spool_failures[name] = self._spool_failures.get(name, 0) + 1
+                if failures < self.max_deliveries:
+                    logger.warning(f"클릭 스풀 세그먼트 반영 실패 ({name}, {failures}번째): {e}")
+                    continue
+                # 같은 세그먼트를 계속 다시 시도하지 않음
+                self._spool_failures.pop(name, None)
+                try:
+                    os.rename(path, f'{path}.failed')
+                except OSError as rename_error:
+                    logger.error(f"클릭 스풀 세그먼트 이름 변경 실패 ({name}): {rename_error}")
+                    continue
+                logger.error(f"클릭 스풀 세그먼트를 {failures}번 반영하지 못해 {name}.failed로 옮김: {e}")
+        return processed
+
+    def _flush_segment(self, path, name):
+        events = []
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    logger.warning(f"손상된 클릭 스풀 행 무시 ({name})")
+
+        for start in range(0, len(events), self.batch_size):
+            self.apply(events[start:start + self.batch_size])
+        os.unlink(path)
+        self._spool_failures.pop(name, None)
+        return len(events)
+
+    def apply(self, events):
+        """클릭 행 다중 INSERT + 링크별 click_count 증가분과 통계 집계 반영 (한 트랜잭션)"""
+        from app.models.affiliate_link import AffiliateLink, AffiliateLinkClick
+
+        events = self._filter(events)
+
+        links = AffiliateLink.__table__
+        clicks = AffiliateLinkClick.__table__
+        rows = [
+            {
+                'id': event['id'],
+                'affiliate_link_id': event['link_id'],
+                'user_id': event.get('user_id') or None,
+                'ip_address': event.get('ip_address') or None,
+                'user_agent': event.get('user_agent') or None,
+                'referrer': event.get('referrer') or None,
+                'created_at': datetime.utcfromtimestamp(float(event['ts']))
+            }
+            for event in events
+        ]
+        if not rows:
+            return
+
+        try:
+            # 삭제된 링크/사용자를 가리키는 클릭은 외래 키 위반이 되므로 제외
+            link_ids = {row['affiliate_link_id'] for row in rows}
+            existing_links = {
+                link_id for (link_id,) in
+                db.session.query(AffiliateLink.id).filter(AffiliateLink.id.in_(link_ids))
+            }
+            rows = [row for row in rows if row['affiliate_link_id'] in existing_links]
+            self._drop_unknown_users(rows)
+            if not rows:
+                db.session.rollback()
+                return
+
+            click_enricher.enrich(rows)
+
+            # 이미 반영된 클릭(재처리)은 건너뛰고 새로 들어간 행만 집계
+            inserted = db.session.execute(
+                insert(clicks).values(rows)
+                .on_conflict_do_nothing(index_elements=['id'])
+                .returning(
+                    clicks.c.affiliate_link_id, clicks.c.created_at,
+                    clicks.c.user_id, clicks.c.ip_address, clicks.c.user_agent
+                )
+            ).all()
+
+            deltas = defaultdict(lambda: [0, None])
+            for link_id, created_at, *_ in inserted:
+                delta = deltas[link_id]
+                delta[0] += 1
+                delta[1] = created_at if delta[1] is None else max(delta[1], created_at)
+
+            if deltas:
+                # 링크 ID 순으로 갱신해 워커 간 교착 방지
+                db.session.connection().execute(
+                    update(links)
+                    .where(links.c.id == bindparam('link_id'))
+                    .values(
+                        click_count=links.c.click_count + bindparam('delta'),
+                        last_click_at=func.greatest(
+                            func.coalesce(links.c.last_click_at, bindparam('clicked_at')),
+                            bindparam('clicked_at')
+                        ),
+                        # 카운터만 바뀌므로 updated_at(캐시 버전)은 유지
+                        updated_at=links.c.updated_at
+                    ),
+                    [
+                        {'link_id': link_id, 'delta': delta, 'clicked_at': clicked_at}
+                        for link_id, (delta, clicked_at) in sorted(deltas.items())
+                    ]
+                )
+
+            batch = RollupBatch()
+            affiliate_stats.add_clicks(batch, inserted)
+            affiliate_stats.apply(batch)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def _filter(self, events):
+        """봇 User-Agent와 창 안의 반복 클릭 제외 (click_count, 통계에 반영하지 않음)"""
+        kept = []
+        bots = duplicates = 0
+        for event in events:
+            if is_bot(event.get('user_agent')):
+                bots += 1
+            elif event.get('duplicate') == '1':
+                duplicates += 1
+            else:
+                kept.append(event)
+
+        if bots or duplicates:
+            logger.debug(f"클릭 제외: 봇 {bots}건, 반복 {duplicates}건 / {len(events)}건")
+        return kept
+
+    def _drop_unknown_users(self, rows):
+        from app.models.user import User
+
+        user_ids = {row['user_id'] for row in rows if row['user_id']}
+        if not user_ids:
+            return
+        existing = {user_id for (user_id,) in db.session.query(User.id).filter(User.id.in_(user_ids))}
+        for row in rows:
+            if row['user_id'] and row['user_id'] not in existing:
+                row['user_id'] = None
+
+    def run_worker(self, consumer=None, stop=lambda: False):
+        """스트림/스풀 반영 루프 (flask clicks worker)"""
+        consumer = consumer or f'{socket.gethostname()}-{os.getpid()}'
+        self.ensure_group()
+        logger.info(f"클릭 반영 워커 시작 ({self.stream}/{self.group}/{consumer})")
+
+        next_spool_check = 0
+        try:
+            while not stop():
+                try:
+                    self.flush_stream(consumer)
+                    if time.monotonic() >= next_spool_check:
+                        self.flush_spool()
+                        next_spool_check = time.monotonic() + 60
+                except redis.RedisError as e:
+                    logger.warning(f"클릭 스트림 읽기 실패: {e}")
+                    self.flush_spool()
+                    time.sleep(self.block_ms / 1000)
+                except Exception as e:
+                    logger.error(f"클릭 반영 실패: {e}")
+                    time.sleep(self.block_ms / 1000)
+        finally:
+            click_enricher.shutdown()
+
+
+click_log = ClickLog()
@@ -0,0 +1,133 @@
+"""
+커밋된 모델 변경에 반응하는 훅
+
+after_flush에서 변경된 엔티티를 모아 두었다가 트랜잭션이 커밋된 뒤에만
+등록된 콜백을 호출합니다. 롤백된 변경은 버려집니다.
+
+    @on_commit(Business, ignore=('view_count',))
+    def invalidate_business_lists(changes):
+        ...
+
+같은 트랜잭션 안에서 기록해야 하는 작업(변경 로그 등)은 on_flush로 등록합니다.
+콜백은 flush 직후 callback(session, changes)로 호출되며, 예외는 flush/커밋을 실패시킵니다.
+
+ORM을 거치지 않는 UPDATE/DELETE(query.update(), 원자적 카운터 증가 등)는 감지되지 않습니다.
+"""
+
+import logging
+from collections import namedtuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = 'commit_hooks_pending'
+
+# op: 'insert' | 'update' | 'delete', changed: 변경된 컬럼 키 집합,
+# values: flush 시점에 로드되어 있던 컬럼 값 (외래 키 등으로 관련 엔티티를 찾을 때 사용)
+Change = namedtuple('Change', ['model', 'pk', 'op', 'changed', 'values'])
+
+_hooks = []
+_flush_hooks = []
+_listening = False
+
+
+def on_commit(*models, ignore=()):
+    """지정 모델의 변경이 커밋되면 callback(changes)를 호출하도록 등록
+
+    ignore에 포함된 컬럼만 바뀐 update는 전달하지 않습니다.
+    """
+    tables = frozenset(model.__tablename__ for model in models)
+    ignored = frozenset(ignore)
+
+    def decorator(callback):
+        _hooks.append((tables, ignored, callback))
+        _listen()
+        return callback
+
+    return decorator
+
+
+def on_flush(*models, ignore=()):
+    """지정 모델의 변경이 flush되면 같은 트랜잭션 안에서 callback(session, changes) 호출"""
+    tables = frozenset(model.__tablename__ for model in models)
+    ignored = frozenset(ignore)
+
+    def decorator(callback):
+        _flush_hooks.append((tables, ignored, callback))
+        _listen()
+        return callback
+
+    return decorator
+
+
+def _select(changes, tables, ignored):
+    return [
+        change for change in changes
+        if change.model.__tablename__ in tables
+        and not (change.op == 'update' and change.changed <= ignored)
+    ]
+
+
+def _listen():
+    global _listening
+    if _listening:
+        return
+    event.listen(Session, 'after_flush', _collect)
+    event.listen(Session, 'after_commit', _dispatch)
+    event.listen(Session, 'after_rollback', _discard)
+    _listening = True
+
+
+def _collect(session, flush_context):
+    flushed = []
+    for op, instances in (('insert', session.new), ('update', session.dirty), ('delete', session.deleted)):
+        for instance in instances:
+            state = inspect(instance)
+            mapper = state.mapper
+            if not hasattr(mapper.class_, '__tablename__'):
+                continue
+
+            changed = frozenset(
+                attr.key for attr in mapper.column_attrs
+                if state.attrs[attr.key].history.has_changes()
+            )
+            if op == 'update' and not changed:
+                continue
+
+            values = {
+                attr.key: state.dict[attr.key]
+                for attr in mapper.column_attrs if attr.key in state.dict
+            }
+            pk = mapper.primary_key_from_instance(instance)
+            flushed.append(Change(mapper.class_, pk[0] if len(pk) == 1 else tuple(pk), op, changed, values))
+
+    if not flushed:
+        return
+
+    for tables, ignored, callback in _flush_hooks:
+        changes = _select(flushed, tables, ignored)
+        if changes:
+            callback(session, changes)
+
+    session.info.setdefault(_PENDING_KEY, []).extend(flushed)
+
+
+def _dispatch(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+
+    for tables, ignored, callback in _hooks:
+        changes = _select(pending, tables, ignored)
+        if not changes:
+            continue
+        try:
+            callback(changes)
+        except Exception as e:
+            logger.error(f"커밋 훅 실행 오류 ({callback.__name__}): {e}")
+
+
+def _discard(session):
+    session.info.pop(_PENDING_KEY, None)
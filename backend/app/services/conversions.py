@@ -0,0 +1,449 @@
+"""
+제휴 전환 일괄 반영 (제휴사 웹훅, 정산 보고서)
+
+제휴사는 정산 후 수천 건의 전환을 한 번에 보냅니다. 보고 행을 스트림으로 읽어 CONVERSION_CHUNK_SIZE개씩
+한 트랜잭션에서 반영합니다.
+
+- 전환은 (링크, order_id)로 upsert합니다. 새 주문은 INSERT ... ON CONFLICT DO NOTHING으로 넣고,
+  이미 있는 주문은 FOR UPDATE로 잠근 뒤 상태/금액을 바꿉니다. 같은 보고를 다시 받아도 결과가 같습니다.
+- 상태는 pending → confirmed → cancelled 방향으로만 바뀝니다 (cancelled 이후 변경, confirmed → pending은 무시).
+- 취소되지 않은 전환만 전환 수/수익에 포함합니다. 변경 전후 차이를 링크 카운터(conversion_count,
+  total_revenue)와 시간별/일별 통계(전환 시각 버킷)에 같은 트랜잭션에서 더하므로 재계산(rebuild)과 같은 값이 됩니다.
+- 링크 없이 order_id와 상태만 있는 행은 해당 주문의 모든 전환에 상태만 반영합니다 (정산 확정/취소 보고).
+- 잘못된 행은 건너뛰고 행 번호와 함께 errors로 돌려줍니다. 청크 반영이 실패하면 그 청크만 롤백합니다.
+"""
+
+import csv
+import hashlib
+import hmac
+import json
+import logging
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, bindparam, func, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app import db
+
+logger = logging.getLogger(__name__)
+
+# 제휴사 보고의 상태 이름 → 전환 상태
+STATUSES = {
+    'pending': 'pending',
+    'confirmed': 'confirmed',
+    'approved': 'confirmed',
+    'settled': 'confirmed',
+    'cancelled': 'cancelled',
+    'canceled': 'cancelled',
+    'rejected': 'cancelled',
+    'refunded': 'cancelled',
+}
+
+# 현재 상태에서 받아들이는 보고 상태
+TRANSITIONS = {
+    'pending': {'pending', 'confirmed', 'cancelled'},
+    'confirmed': {'confirmed', 'cancelled'},
+    'cancelled': {'cancelled'},
+}
+
+# 필드 → 제휴사별 컬럼 이름 (앞에서부터 처음 값이 있는 것)
+FIELDS = {
+    'link': ('link', 'link_id', 'short_code', 'sub_id', 'subId'),
+    'order_id': ('order_id', 'orderId', 'order_no'),
+    'order_amount': ('order_amount', 'orderAmount', 'gmv'),
+    'commission': ('commission', 'commission_amount', 'commissionAmount', 'commission_earned'),
+    'status': ('status', 'order_status'),
+    'converted_at': ('converted_at', 'order_date', 'orderDate', 'created_at'),
+}
+
+FORMATS = ('csv', 'ndjson', 'json')
+MAX_ERRORS = 100  # 응답에 포함할 오류 행 수
+
+
+class ConversionError(ValueError):
+    """보고 행 형식 오류"""
+
+
+def verify_signature(secret, body, signature):
+    """X-Signature 헤더(sha256=<hex>)가 본문 HMAC-SHA256과 같은지"""
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, (signature or '').removeprefix('sha256='))
+
+
+def read_report(stream, format):
+    """바이너리 스트림에서 보고 행(dict)을 하나씩 읽기. 읽을 수 없는 행은 ConversionError로 내보냄"""
+    if format not in FORMATS:
+        raise ConversionError(f'지원하지 않는 형식입니다: {format}')
+
+    if format == 'json':
+        data = json.load(stream)
+        records = data.get('conversions') if isinstance(data, dict) else data
+        if not isinstance(records, list):
+            raise ConversionError('conversions 배열이 필요합니다.')
+        yield from records
+        return
+
+    # 줄 단위로 디코딩해 잘못된 바이트가 있어도 그 앞의 행까지는 읽힘
+    if format == 'csv':
+        yield from csv.DictReader(_decode_lines(stream))
+        return
+
+    for number, line in enumerate(stream, 1):
+        try:
+            line = line.decode('utf-8-sig' if number == 1 else 'utf-8').strip()
+            if not line:
+                continue
+            yield json.loads(line)
+        except ValueError:
+            yield ConversionError(f'{number}번째 줄이 UTF-8 JSON이 아닙니다.')
+
+
+def _decode_lines(stream):
+    """바이너리 줄 → 문자열. UTF-8이 아닌 줄에서 ConversionError (CSV는 여러 줄 필드가 있어 건너뛰지 않음)"""
+    for number, line in enumerate(stream, 1):
+        try:
+            yield line.decode('utf-8-sig' if number == 1 else 'utf-8')
+        except UnicodeDecodeError:
+            raise ConversionError(f'{number}번째 줄이 UTF-8이 아닙니다.')
+
+
+def _number(value, field):
+    if value is None:
+        return None
+    try:
+        return float(value.replace(',', '')) if isinstance(value, str) else float(value)
+    except (TypeError, ValueError):
+        raise ConversionError(f'{field} 값이 숫자가 아닙니다: {value}')
+
+
+def _datetime(value):
+    """ISO 8601 문자열 또는 epoch 초 → UTC naive datetime"""
+    if value is None:
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None)
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except (TypeError, ValueError, OverflowError):
+        raise ConversionError(f'converted_at 형식이 올바르지 않습니다: {value}')
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def normalize(record):
+    """보고 행 → {'link', 'order_id', 'order_amount', 'commission', 'status', 'converted_at'}"""
+    if not isinstance(record, dict):
+        raise ConversionError('전환 항목은 객체여야 합니다.')
+
+    values = {}
+    for field, names in FIELDS.items():
+        for name in names:
+            value = record.get(name)
+            if isinstance(value, str):
+                value = value.strip()
+            if value not in (None, ''):
+                values[field] = value
+                break
+
+    order_id = str(values.get('order_id', ''))
+    if not order_id:
+        raise ConversionError('order_id가 없습니다.')
+    if len(order_id) > 100:
+        raise ConversionError('order_id가 너무 깁니다.')
+
+    status = STATUSES.get(str(values.get('status', 'pending')).lower())
+    if status is None:
+        raise ConversionError(f"알 수 없는 상태입니다: {values['status']}")
+
+    return {
+        'link': str(values['link']) if 'link' in values else None,
+        'order_id': order_id,
+        'order_amount': _number(values.get('order_amount'), 'order_amount'),
+        'commission': _number(values.get('commission'), 'commission'),
+        'status': status,
+        'converted_at': _datetime(values.get('converted_at')),
+    }
+
+
+def _contribution(status, commission):
+    """전환 수/수익에 더해지는 값 (취소된 전환은 0)"""
+    if status is None or status == 'cancelled':
+        return 0, 0.0
+    return 1, commission or 0.0
+
+
+class _Chunk:
+    """청크 하나의 링크/통계 증분"""
+
+    def __init__(self):
+        from app.services.affiliate_stats import RollupBatch
+
+        self.rollups = RollupBatch()
+        self.links = defaultdict(lambda: {'count': 0, 'revenue': 0.0, 'last': None})
+        self.stats = Counter()
+        self.errors = []
+
+    def count(self, link_id, converted_at, before, after):
+        """(status, commission) 변경 전후 차이를 링크 카운터와 통계에 추가"""
+        before_count, before_revenue = _contribution(*before)
+        after_count, after_revenue = _contribution(*after)
+        count, revenue = after_count - before_count, after_revenue - before_revenue
+        if not count and not revenue:
+            return
+
+        self.rollups.add_conversion(link_id, converted_at, revenue, count=count)
+        delta = self.links[link_id]
+        delta['count'] += count
+        delta['revenue'] += revenue
+        if count > 0 and (delta['last'] is None or converted_at > delta['last']):
+            delta['last'] = converted_at
+
+
+class ConversionIngest:
+    """제휴사 전환 보고 반영"""
+
+    def __init__(self):
+        self.chunk_size = 500
+
+    def init_app(self, app):
+        self.chunk_size = app.config.get('CONVERSION_CHUNK_SIZE', 500)
+
+    def ingest(self, records):
+        """보고 행을 청크 단위로 반영하고 요약 반환
+
+        {'received', 'inserted', 'updated', 'unchanged', 'skipped', 'failed', 'error_count', 'errors', 'read_error'}
+        errors: [{'row': 0부터 시작하는 행 번호, 'message'}] (최대 MAX_ERRORS건)
+        read_error: 보고를 끝까지 읽지 못한 경우 그 이유 (그 전까지 읽은 행은 반영됨), 아니면 None
+        """
+        stats = Counter()
+        errors = []
+        chunk = []
+        received = 0
+        read_error = None
+        records = iter(records)
+        while True:
+            try:
+                record = next(records)
+            except StopIteration:
+                break
+            except (ValueError, csv.Error, OSError, EOFError) as e:
+                # 인코딩/CSV/압축 오류 등으로 더 읽을 수 없음. 이미 커밋된 청크는 그대로 둠
+                read_error = f'{received + 1}번째 행부터 읽을 수 없습니다: {e}'
+                errors.append((received, read_error))
+                break
+
+            row = received
+            received += 1
+            try:
+                if isinstance(record, ConversionError):
+                    raise record
+                chunk.append((row, normalize(record)))
+            except ConversionError as e:
+                errors.append((row, str(e)))
+            if len(chunk) >= self.chunk_size:
+                self._ingest_chunk(chunk, stats, errors)
+                chunk = []
+        if chunk:
+            self._ingest_chunk(chunk, stats, errors)
+
+        errors.sort()
+        return {
+            'received': received,
+            **{key: stats[key] for key in ('inserted', 'updated', 'unchanged', 'skipped', 'failed')},
+            'error_count': len(errors),
+            'errors': [{'row': row, 'message': message} for row, message in errors[:MAX_ERRORS]],
+            'read_error': read_error
+        }
+
+    def _ingest_chunk(self, chunk, stats, errors):
+        try:
+            result = self._apply(chunk)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"전환 보고 청크 반영 실패 ({len(chunk)}건): {e}")
+            stats['failed'] += len(chunk)
+            errors.extend((row, f'반영 실패: {e}') for row, _ in chunk)
+            return
+        stats.update(result.stats)
+        errors.extend(result.errors)
+
+    def _apply(self, records):
+        """청크 하나를 현재 트랜잭션에 반영 (커밋은 호출한 쪽에서)"""
+        from app.models.affiliate_link import AffiliateLink, AffiliateLinkConversion
+        from app.services.affiliate_stats import affiliate_stats
+
+        conversions = AffiliateLinkConversion.__table__
+        links = AffiliateLink.__table__
+        now = datetime.utcnow()
+        chunk = _Chunk()
+
+        # 링크 ID/단축 코드 → 링크
+        keys = {record['link'] for _, record in records if record['link']}
+        targets = {}
+        if keys:
+            for link in db.session.execute(
+                select(links.c.id, links.c.short_code, links.c.commission_rate).where(
+                    or_(links.c.id.in_(keys), links.c.short_code.in_(keys))
+                )
+            ):
+                targets[link.id] = link
+                if link.short_code:
+                    targets[link.short_code] = link
+
+        # 같은 보고 안에서 같은 (링크, 주문)/주문은 마지막 행
+        keyed = {}
+        orders = {}
+        for row, record in records:
+            if record['link'] is None:
+                orders[record['order_id']] = (row, record)
+                continue
+            link = targets.get(record['link'])
+            if link is None:
+                chunk.errors.append((row, f"제휴 링크를 찾을 수 없습니다: {record['link']}"))
+                continue
+            keyed[(link.id, record['order_id'])] = (row, record, link.commission_rate)
+
+        inserted = self._insert(conversions, keyed, chunk, now)
+        self._update(conversions, keyed, orders, inserted, chunk, now)
+
+        if chunk.links:
+            db.session.execute(
+                update(links).where(links.c.id == bindparam('link_id')).values(
+                    conversion_count=links.c.conversion_count + bindparam('delta_count'),
+                    total_revenue=links.c.total_revenue + bindparam('delta_revenue'),
+                    # GREATEST는 NULL을 무시
+                    last_conversion_at=func.greatest(links.c.last_conversion_at, bindparam('last', type_=DateTime)),
+                    updated_at=links.c.updated_at
+                ),
+                [
+                    {'link_id': link_id, 'delta_count': delta['count'], 'delta_revenue': delta['revenue'], 'last': delta['last']}
+                    for link_id, delta in sorted(chunk.links.items())
+                ]
+            )
+        affiliate_stats.apply(chunk.rollups)
+        return chunk
+
+    def _insert(self, conversions, keyed, chunk, now):
+        """처음 보는 (링크, 주문) INSERT. 실제로 넣은 키 집합"""
+        if not keyed:
+            return set()
+
+        values = []
+        for (link_id, order_id), (row, record, rate) in sorted(keyed.items()):
+            commission = record['commission']
+            if commission is None:
+                commission = record['order_amount'] * rate if record['order_amount'] else 0.0
+            status = record['status']
+            values.append({
+                'id': str(uuid.uuid4()),
+                'affiliate_link_id': link_id,
+                'order_id': order_id,
+                'order_amount': record['order_amount'],
+                'commission_earned': commission,
+                'status': status,
+                'created_at': record['converted_at'] or now,
+                'confirmed_at': now if status == 'confirmed' else None,
+                'cancelled_at': now if status == 'cancelled' else None,
+                'updated_at': now,
+            })
+
+        # 동시에 같은 주문을 넣는 다른 트랜잭션이 있으면 그쪽 커밋을 기다린 뒤 건너뜀 (아래에서 UPDATE)
+        stmt = insert(conversions).values(values).on_conflict_do_nothing(
+            index_elements=['affiliate_link_id', 'order_id']
+        ).returning(conversions.c.affiliate_link_id, conversions.c.order_id)
+        inserted = {tuple(key) for key in db.session.execute(stmt)}
+
+        for value in values:
+            if (value['affiliate_link_id'], value['order_id']) in inserted:
+                chunk.count(
+                    value['affiliate_link_id'], value['created_at'],
+                    (None, None), (value['status'], value['commission_earned'])
+                )
+        chunk.stats['inserted'] += len(inserted)
+        return inserted
+
+    def _update(self, conversions, keyed, orders, inserted, chunk, now):
+        """이미 있는 전환의 상태/금액 변경"""
+        existing_keys = [key for key in keyed if key not in inserted]
+        conditions = []
+        if existing_keys:
+            conditions.append(tuple_(conversions.c.affiliate_link_id, conversions.c.order_id).in_(existing_keys))
+        if orders:
+            conditions.append(conversions.c.order_id.in_(list(orders)))
+        if not conditions:
+            return
+
+        rows = db.session.execute(
+            select(
+                conversions.c.id, conversions.c.affiliate_link_id, conversions.c.order_id, conversions.c.status,
+                conversions.c.order_amount, conversions.c.commission_earned, conversions.c.created_at,
+                conversions.c.confirmed_at, conversions.c.cancelled_at
+            ).where(or_(*conditions)).order_by(conversions.c.id).with_for_update()
+        ).all()
+
+        updates = []
+        matched_orders = set()
+        for conversion in rows:
+            key = (conversion.affiliate_link_id, conversion.order_id)
+            if key in keyed and key not in inserted:
+                _, record, rate = keyed[key]
+                amount = record['order_amount'] if record['order_amount'] is not None else conversion.order_amount
+                if record['commission'] is not None:
+                    commission = record['commission']
+                elif record['order_amount'] is not None:
+                    commission = record['order_amount'] * rate
+                else:
+                    commission = conversion.commission_earned
+            elif conversion.order_id in orders:
+                # 주문 단위 상태 보고: 금액은 그대로
+                matched_orders.add(conversion.order_id)
+                _, record = orders[conversion.order_id]
+                amount, commission = conversion.order_amount, conversion.commission_earned
+            else:
+                continue
+
+            status = record['status']
+            if status not in TRANSITIONS[conversion.status]:
+                chunk.stats['skipped'] += 1
+                continue
+            if (status, amount, commission) == (conversion.status, conversion.order_amount, conversion.commission_earned):
+                chunk.stats['unchanged'] += 1
+                continue
+
+            updates.append({
+                'conversion_id': conversion.id,
+                'new_status': status,
+                'new_amount': amount,
+                'new_commission': commission,
+                'new_confirmed_at': now if status == 'confirmed' and conversion.status != 'confirmed' else conversion.confirmed_at,
+                'new_cancelled_at': now if status == 'cancelled' and conversion.status != 'cancelled' else conversion.cancelled_at,
+            })
+            chunk.count(
+                conversion.affiliate_link_id, conversion.created_at,
+                (conversion.status, conversion.commission_earned), (status, commission)
+            )
+
+        for order_id, (row, _) in orders.items():
+            if order_id not in matched_orders:
+                chunk.errors.append((row, f'전환을 찾을 수 없는 주문입니다: {order_id}'))
+
+        if updates:
+            db.session.execute(
+                update(conversions).where(conversions.c.id == bindparam('conversion_id')).values(
+                    status=bindparam('new_status'),
+                    order_amount=bindparam('new_amount'),
+                    commission_earned=bindparam('new_commission'),
+                    confirmed_at=bindparam('new_confirmed_at'),
+                    cancelled_at=bindparam('new_cancelled_at'),
+                    updated_at=now
+                ),
+                updates
+            )
+        chunk.stats['updated'] += len(updates)
+
+
+conversion_ingest = ConversionIngest()
@@ -0,0 +1,173 @@
+"""
+nginx 프록시 캐시(엣지) 연동
+
+- 익명 공개 GET 응답에 Cache-Control / X-Accel-Expires / Surrogate-Key 헤더를 붙여
+  nginx가 캐시하도록 합니다. (Authorization 헤더가 있는 요청은 nginx에서도 우회)
+- 조회수를 올리는 상세 응답(사업체, 블로그 포스트)은 태깅하지 않습니다. 캐시 적중 시 요청이
+  Flask에 도달하지 않아 view_count가 집계되지 않기 때문입니다.
+- Surrogate-Key별로 nginx 캐시 키를 Redis 집합(edge:key:{key})에 기록해 두었다가,
+  엔티티 변경이 커밋되면 해당 키의 캐시 파일을 공유 볼륨에서 직접 삭제합니다.
+
+nginx 캐시 키는 nginx.conf의 proxy_cache_key("$scheme$host$request_uri")와,
+파일 경로는 proxy_cache_path의 levels와 같아야 합니다.
+"""
+
+import hashlib
+import logging
+import os
+
+import redis
+from flask import g, request
+
+from app.services.cache import tiered_cache
+from app.services.commit_hooks import on_commit
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'edge:key:'
+
+
+class EdgeCache:
+    """Surrogate-Key 기반 nginx 캐시 태깅/퍼지"""
+
+    def __init__(self):
+        self.enabled = False
+        self.ttl = 300
+        self.browser_max_age = 0
+        self.cache_path = None
+        self.levels = (1, 2)
+        self._hooks_registered = False
+
+    def init_app(self, app):
+        self.enabled = app.config.get('EDGE_CACHE_ENABLED', False)
+        self.ttl = app.config.get('EDGE_CACHE_TTL', 300)
+        self.browser_max_age = app.config.get('EDGE_CACHE_BROWSER_MAX_AGE', 0)
+        self.cache_path = app.config.get('NGINX_CACHE_PATH')
+        self.levels = tuple(int(level) for level in app.config.get('NGINX_CACHE_LEVELS', '1:2').split(':'))
+
+        app.after_request(self._after_request)
+        self._register_purge_hooks()
+
+    # 응답 태깅
+
+    def tag(self, *keys):
+        """현재 요청의 응답을 엣지 캐시 대상으로 표시하고 Surrogate-Key 추가"""
+        keys_for_request = g.setdefault('edge_cache_keys', [])
+        keys_for_request.extend(key for key in keys if key not in keys_for_request)
+
+    def _after_request(self, response):
+        keys = g.pop('edge_cache_keys', None)
+        if not keys or not self._is_public(response):
+            return response
+
+        response.headers['Cache-Control'] = f'public, max-age={self.browser_max_age}'
+        response.headers['X-Accel-Expires'] = str(self.ttl)
+        response.headers['Surrogate-Key'] = ' '.join(keys)
+        response.vary.add('Authorization')
+
+        self._index(keys, self._nginx_key())
+        return response
+
+    def _is_public(self, response):
+        return (
+            self.enabled
+            and request.method in ('GET', 'HEAD')
+            and 'Authorization' not in request.headers
+            and response.status_code in (200, 304)
+        )
+
+    def _nginx_key(self):
+        """nginx proxy_cache_key ($scheme$host$request_uri)와 같은 문자열"""
+        scheme = request.headers.get('X-Forwarded-Proto', request.scheme)
+        host = request.host.split(':', 1)[0]
+        uri = request.environ.get('RAW_URI') or request.environ.get('REQUEST_URI')
+        if not uri:
+            query = request.query_string.decode('latin-1')
+            uri = request.path + (f'?{query}' if query else '')
+        return f'{scheme}{host}{uri}'
+
+    def _index(self, keys, nginx_key):
+        try:
+            pipe = tiered_cache.redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.sadd(f'{KEY_PREFIX}{key}', nginx_key)
+                pipe.expire(f'{KEY_PREFIX}{key}', self.ttl * 2)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"엣지 캐시 키 기록 실패: {e}")
+
+    # 퍼지
+
+    def purge(self, *keys):
+        """Surrogate-Key에 속한 nginx 캐시 파일 삭제. 삭제한 파일 수 반환"""
+        if not self.enabled or not keys:
+            return 0
+
+        try:
+            pipe = tiered_cache.redis.pipeline(transaction=True)
+            for key in keys:
+                pipe.smembers(f'{KEY_PREFIX}{key}')
+                pipe.delete(f'{KEY_PREFIX}{key}')
+            results = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"엣지 캐시 퍼지 실패 ({', '.join(keys)}): {e}")
+            return 0
+
+        nginx_keys = set()
+        for members in results[::2]:
+            nginx_keys.update(member.decode('utf-8') for member in members)
+
+        return sum(self._unlink(nginx_key) for nginx_key in nginx_keys)
+
+    def _cache_file(self, nginx_key):
+        digest = hashlib.md5(nginx_key.encode('utf-8')).hexdigest()
+        parts = []
+        end = len(digest)
+        for level in self.levels:
+            parts.append(digest[end - level:end])
+            end -= level
+        return os.path.join(self.cache_path, *parts, digest)
+
+    def _unlink(self, nginx_key):
+        if not self.cache_path:
+            return 0
+        try:
+            os.unlink(self._cache_file(nginx_key))
+            return 1
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            logger.warning(f"엣지 캐시 파일 삭제 실패 ({nginx_key}): {e}")
+            return 0
+
+    def _register_purge_hooks(self):
+        if self._hooks_registered:
+            return
+        self._hooks_registered = True
+
+        from app.models.blog_post import BlogPost
+        from app.models.business import Business
+        from app.models.review import Review
+        from app.models.user import User
+
+        @on_commit(Business, ignore=('view_count',))
+        def purge_businesses(changes):
+            self.purge('business-lists', *{f'business:{change.pk}' for change in changes})
+
+        @on_commit(Review)
+        def purge_reviews(changes):
+            business_ids = {change.values.get('business_id') for change in changes} - {None}
+            self.purge(*{f'business:{business_id}' for business_id in business_ids})
+
+        @on_commit(BlogPost, ignore=('view_count',))
+        def purge_blog_posts(changes):
+            self.purge('blog-lists')
+
+        # 작성자를 포함하는 목록(블로그, 사업체 리뷰)은 작성자별 user:{id} 키로 태깅됨
+        # 로그인 시각만 바뀐 경우는 공개 응답에 영향 없음
+        @on_commit(User, ignore=('last_login_at', 'updated_at'))
+        def purge_users(changes):
+            self.purge(*{f'user:{change.pk}' for change in changes})
+
+
+edge_cache = EdgeCache()
@@ -0,0 +1,173 @@
+"""
+기본 키 기반 엔티티 캐시
+
+2단계 공유 캐시(app.services.cache)의 'entity' 네임스페이스에 컬럼 스냅샷을 보관하고,
+조회 시 SQL 없이 세션에 영속(persistent) 상태로 붙여서 반환합니다.
+커밋된 변경은 커밋 훅(app.services.commit_hooks)에서 무효화되며, 다른 워커의 L1은
+pub/sub 무효화 메시지로 함께 정리됩니다. DB에서 읽기 전에 키 세대를 받아 두고 세대가
+그대로일 때만 저장하므로, 읽은 뒤 커밋된 변경의 이전 값이 다시 캐시되지 않습니다.
+비밀번호 해시 등 exclude 컬럼은 스냅샷에 넣지 않으며, 접근하면 DB에서 읽습니다.
+"""
+
+import copy
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app import db
+from app.services.cache import tiered_cache
+from app.services.commit_hooks import on_commit
+
+NAMESPACE = 'entity'
+
+
+class EntityCache:
+    """Business, User 등 기본 키 조회가 잦은 엔티티용 읽기 캐시"""
+
+    def __init__(self):
+        self.enabled = False
+        self.timeout = 300
+        self._models = set()
+        self._exclude = {}
+
+    def init_app(self, app):
+        self.enabled = app.config.get('ENTITY_CACHE_ENABLED', True)
+        self.timeout = app.config.get('ENTITY_CACHE_TIMEOUT', 300)
+
+        from app.models.business import Business
+        from app.models.user import User
+
+        # view_count는 별도 원자적 UPDATE로 증가시키므로 무효화 대상에서 제외
+        self.register(Business, volatile=('view_count',))
+        self.register(User, exclude=('password_hash',))
+
+    def register(self, model, volatile=(), exclude=()):
+        """캐시 대상 모델 등록
+
+        volatile 컬럼만 바뀐 경우는 무효화하지 않고, exclude 컬럼은 Redis에 저장하지 않습니다.
+        """
+        if model.__tablename__ in self._models:
+            return
+        self._models.add(model.__tablename__)
+        self._exclude[model.__tablename__] = frozenset(exclude)
+        on_commit(model, ignore=volatile)(self._invalidate_changes)
+
+    def handles(self, model):
+        return self.enabled and getattr(model, '__tablename__', None) in self._models
+
+    def key(self, model, pk):
+        return f'{model.__tablename__}:{pk}'
+
+    def get(self, model, pk):
+        """기본 키로 엔티티 조회 (세션 → L1 → L2 → DB 순)"""
+        if pk is None:
+            return None
+
+        instance = self._from_identity_map(model, pk)
+        if instance is not None:
+            return instance
+
+        if not self.handles(model):
+            return db.session.get(model, pk)
+
+        key = self.key(model, pk)
+        data = tiered_cache.get(NAMESPACE, key)
+        if data is not None:
+            return self._attach(model, data)
+
+        generations = tiered_cache.generations(NAMESPACE, [key])
+        instance = db.session.get(model, pk)
+        if instance is not None:
+            self.store_many([instance], generations)
+        return instance
+
+    def get_many(self, model, pks):
+        """여러 엔티티 조회 - 캐시에 없는 것만 단일 IN 쿼리로 로드
+
+        Returns:
+            {pk: instance} (찾지 못한 키는 포함되지 않음)
+        """
+        result = {}
+        pending = []
+        for pk in pks:
+            instance = self._from_identity_map(model, pk)
+            if instance is not None:
+                result[pk] = instance
+            else:
+                pending.append(pk)
+
+        if pending and self.handles(model):
+            keys = {self.key(model, pk): pk for pk in pending}
+            found = {
+                keys[key]: data
+                for key, data in tiered_cache.get_many(NAMESPACE, list(keys)).items()
+            }
+
+            for pk, data in found.items():
+                result[pk] = self._attach(model, data)
+            pending = [pk for pk in pending if pk not in found]
+
+        if pending:
+            generations = None
+            if self.handles(model):
+                generations = tiered_cache.generations(NAMESPACE, [self.key(model, pk) for pk in pending])
+            loaded = model.query.filter(model.id.in_(pending)).all()
+            for instance in loaded:
+                result[instance.id] = instance
+            if generations is not None:
+                self.store_many(loaded, generations)
+
+        return result
+
+    def store(self, instance):
+        """엔티티 스냅샷을 L1/L2에 저장"""
+        self.store_many([instance])
+
+    def store_many(self, instances, generations=None):
+        """generations: DB에서 읽기 전에 받아 둔 키 세대 (그 사이 무효화된 키는 저장하지 않음)"""
+        mapping = {
+            self.key(type(instance), inspect(instance).identity[0]): self._snapshot(instance)
+            for instance in instances
+        }
+        tiered_cache.set_many(NAMESPACE, mapping, timeout=self.timeout, generations=generations)
+
+    def invalidate(self, model, pk):
+        """엔티티 캐시 무효화"""
+        self.invalidate_keys([self.key(model, pk)])
+
+    def invalidate_keys(self, keys):
+        tiered_cache.delete_many(NAMESPACE, keys)
+
+    # 내부 구현
+
+    def _from_identity_map(self, model, pk):
+        identity_key = inspect(model).identity_key_from_primary_key((pk,))
+        return db.session.identity_map.get(identity_key)
+
+    def _snapshot(self, instance):
+        mapper = inspect(type(instance))
+        exclude = self._exclude.get(mapper.local_table.name, ())
+        return {attr.key: getattr(instance, attr.key) for attr in mapper.column_attrs if attr.key not in exclude}
+
+    def _attach(self, model, data):
+        """스냅샷으로 인스턴스를 만들어 SQL 없이 세션에 붙임"""
+        mapper = inspect(model)
+        instance = mapper.class_manager.new_instance()
+        for key, value in data.items():
+            # L1 스냅샷 보호를 위해 가변 값은 복사
+            if isinstance(value, (list, dict)):
+                value = copy.deepcopy(value)
+            set_committed_value(instance, key, value)
+        make_transient_to_detached(instance)
+        db.session.add(instance)
+        return instance
+
+    def _invalidate_changes(self, changes):
+        """커밋된 수정/삭제 엔티티의 캐시 무효화"""
+        keys = {self.key(change.model, change.pk) for change in changes if change.op != 'insert'}
+        if keys:
+            self.invalidate_keys(list(keys))
+
+
+entity_cache = EntityCache()
@@ -0,0 +1,104 @@
+"""
+엔티티별 직렬화 JSON 프래그먼트 캐시
+
+목록 항목(사업체 카드, 리뷰 등)을 인코딩된 JSON 바이트로 Redis에 저장하고,
+목록 응답에서는 한 번의 MGET으로 가져와 orjson Fragment로 응답에 그대로 삽입합니다.
+
+키: frag:{entity}:{group}:{id}:{version}
+- version은 updated_at 등 내용이 바뀌면 함께 바뀌는 값이므로 별도 무효화가 필요 없고,
+  이전 버전 키는 TTL로 만료됩니다.
+- updated_at을 바꾸지 않는 카운터(view_count 등)는 TTL 동안 이전 값이 보일 수 있습니다.
+- tiered_cache의 Redis 연결을 쓰므로 TIERED_CACHE_ENABLED가 꺼져 있으면 함께 꺼집니다.
+"""
+
+import logging
+
+import redis
+from flask import current_app
+
+from app.services.cache import tiered_cache
+from app.utils.json_provider import raw_json
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'frag:'
+
+
+def version_of(*values):
+    """updated_at 등으로 프래그먼트 버전 문자열 생성"""
+    return '.'.join(value.isoformat() if value is not None else '0' for value in values)
+
+
+class FragmentCache:
+    """(entity, id, version, group) 단위 JSON 바이트 캐시"""
+
+    def __init__(self):
+        self.enabled = False
+        self.timeout = 600
+
+    def init_app(self, app):
+        # tiered_cache의 Redis 클라이언트를 함께 쓰므로 tiered_cache.init_app 이후에 호출
+        self.enabled = app.config.get('FRAGMENT_CACHE_ENABLED', True) and tiered_cache.enabled
+        self.timeout = app.config.get('FRAGMENT_CACHE_TIMEOUT', 600)
+
+    def key(self, entity, group, entity_id, version):
+        return f'{KEY_PREFIX}{entity}:{group}:{entity_id}:{version}'
+
+    def render(self, entity, group, refs, load):
+        """목록 항목을 프래그먼트로 반환 (입력 순서 유지)
+
+        Args:
+            refs: [(id, version), ...]
+            load: 캐시에 없는 ID 목록을 받아 {id: dict}를 반환하는 함수
+
+        Returns:
+            응답 데이터에 그대로 넣을 수 있는 프래그먼트 목록 (찾지 못한 ID는 제외)
+        """
+        if not refs:
+            return []
+
+        keys = [self.key(entity, group, entity_id, version) for entity_id, version in refs]
+        cached = self._mget(keys)
+
+        missing = [entity_id for (entity_id, _), raw in zip(refs, cached) if raw is None]
+        encoded = {}
+        if missing:
+            dumps = current_app.json.dumps_bytes
+            encoded = {entity_id: dumps(data) for entity_id, data in load(missing).items()}
+            self._store({
+                key: encoded[entity_id]
+                for (entity_id, _), key, raw in zip(refs, keys, cached)
+                if raw is None and entity_id in encoded
+            })
+
+        fragments = []
+        for (entity_id, _), raw in zip(refs, cached):
+            raw = raw if raw is not None else encoded.get(entity_id)
+            if raw is not None:
+                fragments.append(raw_json(raw))
+        return fragments
+
+    # 내부 구현
+
+    def _mget(self, keys):
+        if not self.enabled:
+            return [None] * len(keys)
+        try:
+            return tiered_cache.redis.mget(keys)
+        except redis.RedisError as e:
+            logger.warning(f"프래그먼트 캐시 조회 실패: {e}")
+            return [None] * len(keys)
+
+    def _store(self, mapping):
+        if not self.enabled or not mapping:
+            return
+        try:
+            pipe = tiered_cache.redis.pipeline(transaction=False)
+            for key, raw in mapping.items():
+                pipe.set(key, raw, ex=self.timeout)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"프래그먼트 캐시 저장 실패: {e}")
+
+
+fragment_cache = FragmentCache()
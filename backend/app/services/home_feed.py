@@ -0,0 +1,102 @@
+"""
+홈 화면 피드
+
+추천 사업체, 추천 블로그 포스트, 인기 태그, 카테고리별 개수처럼 사용자와 무관한 섹션을
+하나의 문서로 미리 계산해 2단계 캐시에 보관합니다. 섹션은 JSON 바이트로 인코딩해 두고
+응답에 Fragment로 삽입하므로, 요청마다 계산하는 것은 위치 기반 섹션뿐입니다.
+
+- 관련 엔티티가 커밋되면 백그라운드에서 다시 계산하고, 완료되면 엣지 캐시를 퍼지
+- soft TTL이 지나면 이전 문서를 반환하며 백그라운드에서 갱신
+- `flask home-feed rebuild`로 주기적으로(cron) 강제 갱신 가능
+"""
+
+from datetime import datetime
+
+from flask import current_app
+
+from app.services.cache import tiered_cache
+from app.services.commit_hooks import on_commit
+from app.services.edge_cache import edge_cache
+
+NAMESPACE = 'home'
+KEY = 'feed'
+
+
+def build_home_feed():
+    """비개인화 섹션을 계산해 섹션별 JSON 바이트로 인코딩한 문서 반환"""
+    from app.models import Business, BlogPost, Tag
+
+    config = current_app.config
+    sections = {
+        'featured_businesses': [
+            business.to_dict()
+            for business in Business.get_featured()[:config.get('HOME_FEATURED_BUSINESSES', 10)]
+        ],
+        'featured_posts': [
+            post.to_dict(include_content=False)
+            for post in BlogPost.get_featured_posts(limit=config.get('HOME_FEATURED_POSTS', 5))
+        ],
+        'trending_tags': [
+            tag.to_dict() for tag in Tag.get_trending(limit=config.get('HOME_TRENDING_TAGS', 10))
+        ],
+        'categories': Business.get_category_counts()
+    }
+
+    dumps = current_app.json.dumps_bytes
+    return {
+        'generated_at': datetime.utcnow(),
+        'sections': {name: dumps(value) for name, value in sections.items()}
+    }
+
+
+class HomeFeed:
+    """미리 계산된 홈 피드 문서 관리"""
+
+    def __init__(self):
+        self.timeout = 3600
+        self.soft_timeout = 300
+        self._hooks_registered = False
+
+    def init_app(self, app):
+        self.timeout = app.config.get('HOME_FEED_TIMEOUT', 3600)
+        self.soft_timeout = app.config.get('HOME_FEED_SOFT_TIMEOUT', 300)
+        self._register_hooks()
+
+    def get(self):
+        """캐시된 피드 문서 ({'generated_at', 'sections'})"""
+        return tiered_cache.get_or_compute(
+            NAMESPACE, KEY, build_home_feed,
+            timeout=self.timeout, soft_timeout=self.soft_timeout
+        )
+
+    def rebuild(self):
+        """피드를 즉시 다시 계산해 저장"""
+        return tiered_cache.refresh(
+            NAMESPACE, KEY, build_home_feed,
+            timeout=self.timeout, soft_timeout=self.soft_timeout
+        )
+
+    def schedule_rebuild(self):
+        """백그라운드에서 다시 계산하고, 저장되면 엣지 캐시의 홈 응답 퍼지"""
+        tiered_cache.schedule_refresh(
+            NAMESPACE, KEY, build_home_feed,
+            timeout=self.timeout, soft_timeout=self.soft_timeout,
+            callback=lambda feed: edge_cache.purge('home')
+        )
+
+    def _register_hooks(self):
+        if self._hooks_registered:
+            return
+        self._hooks_registered = True
+
+        from app.models import Business, BlogPost, Tag
+
+        # 카운터만 바뀐 경우는 soft TTL 갱신에 맡김
+        @on_commit(Business, ignore=('view_count', 'favorite_count'))
+        @on_commit(BlogPost, ignore=('view_count', 'like_count', 'comment_count', 'share_count'))
+        @on_commit(Tag)
+        def rebuild_home_feed(changes):
+            self.schedule_rebuild()
+
+
+home_feed = HomeFeed()
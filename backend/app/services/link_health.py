@@ -0,0 +1,279 @@
+"""
+제휴 링크 상태 점검
+
+활성 제휴 링크의 affiliate_url과 original_url이 아직 열리는지 확인합니다. `flask links check-health`
+(cron 등으로 주기 실행)가 실행합니다.
+
+- asyncio + aiohttp로 요청을 동시에 보냅니다. 연결 풀 하나를 공유하며, 전체 동시 요청 수
+  (LINK_HEALTH_CONCURRENCY)와 호스트별 동시 요청 수(LINK_HEALTH_PER_HOST)를 넘지 않습니다.
+  요청은 세마포어에서 차례를 기다린 뒤 보내므로 대기 시간이 요청 타임아웃에 포함되지 않습니다.
+- HEAD로 확인하고, HEAD를 받지 않는 서버(405, 501)만 GET으로 다시 확인합니다 (본문은 읽지 않음).
+- 429/5xx/네트워크 오류는 지수 백오프로 재시도하며, 429/503이면 해당 호스트 전체를
+  Retry-After(없으면 백오프 시간)만큼 쉽니다.
+- 같은 URL은 실행 한 번에 한 번만 확인합니다.
+- 링크는 ID 순서로 페이지 단위로 읽고, 결과는 LINK_HEALTH_BATCH_SIZE개씩 executemany UPDATE합니다.
+  연속 LINK_HEALTH_FAIL_AFTER번 실패한 링크는 health_status를 broken으로 표시합니다 (비활성화는 하지 않음).
+"""
+
+import asyncio
+import logging
+import random
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import aiohttp
+from flask import current_app
+from sqlalchemy import bindparam, select, update
+
+from app import db
+
+logger = logging.getLogger(__name__)
+
+# 제휴사가 점검 요청을 클릭과 구분할 수 있도록 봇으로 표시
+USER_AGENT = 'PetPlaceLinkChecker/1.0 (+https://xn--2q1b33lznbu5v.xn--h32bi4v.xn--3e0b707e)'
+
+OK = 'ok'
+FAILED = 'failed'  # 다시 확인해도 열리지 않음 (4xx, 리다이렉트 반복)
+UNREACHABLE = 'unreachable'  # 재시도 후에도 5xx/타임아웃/네트워크 오류
+
+# 결과가 나쁜 순서 (링크의 두 URL 중 나쁜 쪽을 링크 결과로)
+SEVERITY = {OK: 0, UNREACHABLE: 1, FAILED: 2}
+
+ERROR_LENGTH = 200  # affiliate_links.health_error
+
+
+def _retry_after(value):
+    """Retry-After 헤더(초 또는 HTTP 날짜) → 초"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now().astimezone()).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class HealthClient:
+    """점검 실행 한 번의 HTTP 세션, 호스트별 대기 시각, URL별 결과"""
+
+    def __init__(self, session, concurrency, per_host, retries, backoff, max_backoff):
+        self.session = session
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._slots = asyncio.Semaphore(concurrency)
+        self._host_slots = defaultdict(lambda: asyncio.Semaphore(per_host))
+        self._resume_at = {}  # 호스트 → 요청을 다시 보내도 되는 loop.time()
+        self._results = {}  # URL → Task (같은 URL은 한 번만)
+
+    def check(self, url):
+        """URL 결과 (kind, HTTP 상태 코드, 오류 메시지)"""
+        task = self._results.get(url)
+        if task is None:
+            task = self._results[url] = asyncio.ensure_future(self._check(url))
+        return task
+
+    async def _check(self, url):
+        host = urlsplit(url).hostname
+        if not host:
+            return FAILED, None, '잘못된 URL'
+
+        code, error = None, None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self._delay(attempt))
+            try:
+                async with self._host_slots[host], self._slots:
+                    await self._wait_host(host)
+                    code = await self._status(url, host)
+            except aiohttp.TooManyRedirects:
+                return FAILED, None, '리다이렉트 반복'
+            except asyncio.TimeoutError:
+                code, error = None, '응답 시간 초과'
+                continue
+            except (aiohttp.ClientError, ValueError) as e:
+                code, error = None, f'{type(e).__name__}: {e}'
+                continue
+
+            if code < 400:
+                return OK, code, None
+            error = f'HTTP {code}'
+            if code not in (429,) and code < 500:
+                return FAILED, code, error
+        return UNREACHABLE, code, error
+
+    async def _status(self, url, host):
+        async with self.session.head(url, allow_redirects=True) as response:
+            code = response.status
+            self._throttle(response, host)
+        if code in (405, 501):
+            # HEAD를 받지 않는 서버. 본문은 읽지 않고 연결을 닫음
+            async with self.session.get(url, allow_redirects=True) as response:
+                code = response.status
+                self._throttle(response, host)
+        return code
+
+    def _throttle(self, response, host):
+        if response.status not in (429, 503):
+            return
+        delay = _retry_after(response.headers.get('Retry-After'))
+        delay = min(self.max_backoff, delay if delay is not None else self.backoff)
+        loop = asyncio.get_running_loop()
+        self._resume_at[host] = max(self._resume_at.get(host, 0), loop.time() + delay)
+
+    async def _wait_host(self, host):
+        while True:
+            delay = self._resume_at.get(host, 0) - asyncio.get_running_loop().time()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    def _delay(self, attempt):
+        return min(self.max_backoff, self.backoff * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+
+
+class LinkHealthChecker:
+    """활성 제휴 링크 전체 점검"""
+
+    def __init__(self):
+        self.concurrency = 200
+        self.per_host = 16
+        self.timeout = 10
+        self.connect_timeout = 3
+        self.retries = 2
+        self.backoff = 1.0
+        self.max_backoff = 60
+        self.batch_size = 1000
+        self.fail_after = 2
+
+    def init_app(self, app):
+        self.concurrency = app.config.get('LINK_HEALTH_CONCURRENCY', 200)
+        self.per_host = app.config.get('LINK_HEALTH_PER_HOST', 16)
+        self.timeout = app.config.get('LINK_HEALTH_TIMEOUT', 10)
+        self.connect_timeout = app.config.get('LINK_HEALTH_CONNECT_TIMEOUT', 3)
+        self.retries = app.config.get('LINK_HEALTH_RETRIES', 2)
+        self.backoff = app.config.get('LINK_HEALTH_BACKOFF', 1.0)
+        self.max_backoff = app.config.get('LINK_HEALTH_MAX_BACKOFF', 60)
+        self.batch_size = app.config.get('LINK_HEALTH_BATCH_SIZE', 1000)
+        self.fail_after = app.config.get('LINK_HEALTH_FAIL_AFTER', 2)
+
+    @asynccontextmanager
+    async def client(self):
+        """점검 실행 한 번의 HealthClient (연결 풀 포함)"""
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=self.timeout, sock_connect=self.connect_timeout),
+            headers={'User-Agent': USER_AGENT}
+        ) as session:
+            yield HealthClient(
+                session, self.concurrency, self.per_host, self.retries, self.backoff, self.max_backoff
+            )
+
+    def run(self, max_links=None):
+        """활성 링크 점검 후 결과 저장. {'checked', 'ok', 'failing', 'broken'}"""
+        app = current_app._get_current_object()
+        return asyncio.run(self._run(app, max_links))
+
+    async def _run(self, app, max_links):
+        stats = Counter()
+        results = []
+        pending = set()
+        after = ''
+
+        async def drain(return_when):
+            nonlocal pending
+            done, pending = await asyncio.wait(pending, return_when=return_when)
+            results.extend(task.result() for task in done)
+
+        async with self.client() as client:
+            while max_links is None or stats['read'] < max_links:
+                size = self.batch_size if max_links is None else min(self.batch_size, max_links - stats['read'])
+                rows = await asyncio.to_thread(self._page, app, after, size)
+                if not rows:
+                    break
+                after = rows[-1]['id']
+                stats['read'] += len(rows)
+
+                for row in rows:
+                    pending.add(asyncio.ensure_future(self._check_link(client, row)))
+                    # 대기 중인 링크가 너무 많이 쌓이지 않게 (URL 결과는 client에 남음)
+                    if len(pending) >= self.concurrency * 4:
+                        await drain(asyncio.FIRST_COMPLETED)
+                    if len(results) >= self.batch_size:
+                        stats.update(await asyncio.to_thread(self._store, app, results))
+                        results = []
+
+            if pending:
+                await drain(asyncio.ALL_COMPLETED)
+            if results:
+                stats.update(await asyncio.to_thread(self._store, app, results))
+
+        stats.pop('read', None)
+        return dict(stats)
+
+    async def _check_link(self, client, row):
+        targets = [row['affiliate_url']]
+        if row['original_url'] and row['original_url'] != row['affiliate_url']:
+            targets.append(row['original_url'])
+        checked = await asyncio.gather(*(client.check(url) for url in targets))
+        kind, code, error = max(checked, key=lambda result: SEVERITY[result[0]])
+        if error and len(targets) > 1:
+            error = f"{'affiliate_url' if checked[0][0] == kind else 'original_url'}: {error}"
+        return row, kind, code, error
+
+    def _page(self, app, after, size):
+        from app.models.affiliate_link import AffiliateLink
+
+        links = AffiliateLink.__table__
+        with app.app_context():
+            stmt = select(
+                links.c.id, links.c.affiliate_url, links.c.original_url, links.c.health_failures
+            ).where(links.c.is_active == True, links.c.id > after).order_by(links.c.id).limit(size)
+            return [dict(row) for row in db.session.execute(stmt).mappings()]
+
+    def _store(self, app, results):
+        """점검 결과를 executemany UPDATE (updated_at은 바꾸지 않음)"""
+        from app.models.affiliate_link import AffiliateLink
+
+        links = AffiliateLink.__table__
+        now = datetime.utcnow()
+        params = []
+        stats = Counter(checked=len(results))
+        for row, kind, code, error in results:
+            failures = 0 if kind == OK else min(row['health_failures'] + 1, 1000)
+            if kind == OK:
+                status = 'ok'
+            elif failures >= self.fail_after:
+                status = 'broken'
+            else:
+                status = 'failing'
+            stats[status] += 1
+            params.append({
+                'link_id': row['id'], 'new_status': status, 'new_code': code,
+                'new_error': error[:ERROR_LENGTH] if error else None, 'new_failures': failures
+            })
+
+        params.sort(key=lambda param: param['link_id'])
+        with app.app_context():
+            db.session.execute(
+                update(links).where(links.c.id == bindparam('link_id')).values(
+                    health_status=bindparam('new_status'),
+                    health_code=bindparam('new_code'),
+                    health_error=bindparam('new_error'),
+                    health_failures=bindparam('new_failures'),
+                    health_checked_at=now,
+                    updated_at=links.c.updated_at
+                ),
+                params
+            )
+            db.session.commit()
+        return stats
+
+
+link_health = LinkHealthChecker()
@@ -0,0 +1,248 @@
+"""
+제휴 링크 리다이렉트 테이블
+
+링크 ID와 단축 코드(short_code)를 리다이렉트에 필요한 값(affiliate_url, is_active, expires_at)으로 바꾸는
+프로세스 내 테이블입니다. 워커마다 첫 조회 때 한 번에 적재하고, 이후에는 데이터베이스를
+조회하지 않습니다. 비활성/만료 링크도 테이블에 있으므로 데이터베이스 없이 판별합니다.
+
+- 링크 변경이 커밋되면 변경된 값을 2단계 캐시 무효화 채널로 브로드캐스트하고,
+  모든 워커가 메시지만으로 테이블을 갱신합니다.
+- 구독이 끊겼다 다시 연결되거나(놓친 메시지) 적재한 지 오래되면 백그라운드에서 전체를 다시 적재합니다.
+- 테이블에 없는 키는 한 번만 데이터베이스를 확인하고, 없는 키는 잠시 기억해 둡니다.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import current_app, has_app_context
+
+from app.services.cache import tiered_cache
+from app.services.commit_hooks import on_commit
+from app.utils.lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_OP = 'affiliate_links'
+
+# 변경 메시지만으로 테이블을 갱신하는 데 필요한 컬럼
+REQUIRED_VALUES = frozenset(('id', 'short_code', 'affiliate_url', 'is_active', 'expires_at'))
+
+# 이 컬럼만 바뀐 경우 리다이렉트 결과는 같음
+COUNTER_COLUMNS = (
+    'click_count', 'last_click_at', 'conversion_count', 'last_conversion_at',
+    'total_revenue', 'updated_at'
+)
+
+
+def _timestamp(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class LinkTarget:
+    """리다이렉트 대상 (expires_at은 UTC epoch 초)"""
+    __slots__ = ('id', 'code', 'affiliate_url', 'is_active', 'expires_at')
+
+    def __init__(self, id, code, affiliate_url, is_active, expires_at):
+        self.id = id
+        self.code = code
+        self.affiliate_url = affiliate_url
+        self.is_active = is_active
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_values(cls, values):
+        return cls(
+            values['id'], values.get('short_code'), values['affiliate_url'],
+            values['is_active'], _timestamp(values.get('expires_at'))
+        )
+
+    def is_available(self, now=None):
+        """활성 상태이고 만료되지 않았는지"""
+        if not self.is_active:
+            return False
+        return self.expires_at is None or (now or time.time()) < self.expires_at
+
+    def to_message(self):
+        return {
+            'id': self.id, 'code': self.code, 'affiliate_url': self.affiliate_url,
+            'is_active': self.is_active, 'expires_at': self.expires_at
+        }
+
+
+class LinkResolver:
+    """링크 ID/단축 코드 → LinkTarget (워커별 메모리 테이블)"""
+
+    def __init__(self):
+        self.reload_interval = 600
+        self._by_id = None
+        self._by_code = {}
+        self._loaded_at = 0
+        self._reloading = False
+        self._lock = threading.Lock()
+        self._missing = LRUCache(maxsize=10000, ttl=60)
+        self._app = None
+        self._hooks_registered = False
+
+    def init_app(self, app):
+        self._app = app
+        self.reload_interval = app.config.get('AFFILIATE_RESOLVER_RELOAD_INTERVAL', 600)
+        self._missing = LRUCache(maxsize=10000, ttl=app.config.get('AFFILIATE_RESOLVER_MISS_TTL', 60))
+        tiered_cache.add_listener(self._on_message)
+        self._register_hooks()
+
+    # 조회
+
+    def resolve(self, key):
+        """링크 ID 또는 단축 코드로 LinkTarget 조회 (없으면 None)"""
+        if not tiered_cache.enabled:
+            # 변경 알림을 받을 수 없으면 테이블을 믿을 수 없으므로 매번 조회
+            return self._fetch(key)
+
+        by_id = self._table()
+        target = by_id.get(key)
+        if target is None:
+            link_id = self._by_code.get(key)
+            target = by_id.get(link_id) if link_id else None
+        if target is not None:
+            return target
+
+        if self._missing.get(key):
+            return None
+        target = self._fetch(key)
+        if target is None:
+            self._missing.set(key, True)
+        else:
+            self._put(target)
+        return target
+
+    def _table(self):
+        by_id = self._by_id
+        if by_id is None:
+            with self._lock:
+                if self._by_id is None:
+                    tiered_cache.subscribe()
+                    self._load()
+                by_id = self._by_id
+        elif time.monotonic() - self._loaded_at > self.reload_interval:
+            self._schedule_reload()
+        return by_id
+
+    def _fetch(self, key):
+        from app.models.affiliate_link import AffiliateLink
+
+        # 기본 키와 short_code 고유 인덱스로 한 행만 조회
+        row = self._rows().filter(
+            (AffiliateLink.id == key) | (AffiliateLink.short_code == key)
+        ).first()
+        return LinkTarget.from_values(row._asdict()) if row else None
+
+    # 적재 / 갱신
+
+    def _rows(self):
+        from app import db
+        from app.models.affiliate_link import AffiliateLink
+
+        return db.session.query(
+            AffiliateLink.id, AffiliateLink.short_code, AffiliateLink.affiliate_url,
+            AffiliateLink.is_active, AffiliateLink.expires_at
+        )
+
+    def _load(self):
+        """전체 테이블을 새로 만들어 한 번에 교체"""
+        started = time.monotonic()
+        by_id = {}
+        by_code = {}
+        for row in self._rows().yield_per(5000):
+            target = LinkTarget.from_values(row._asdict())
+            by_id[target.id] = target
+            if target.code:
+                by_code[target.code] = target.id
+
+        self._by_id, self._by_code = by_id, by_code
+        self._loaded_at = time.monotonic()
+        self._missing.clear()
+        logger.info(f"제휴 링크 리다이렉트 테이블 적재: {len(by_id)}건 ({(self._loaded_at - started) * 1000:.0f}ms)")
+
+    def _schedule_reload(self):
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+
+        app = self._app or (current_app._get_current_object() if has_app_context() else None)
+
+        def reload():
+            try:
+                with app.app_context():
+                    self._load()
+            except Exception as e:
+                logger.error(f"제휴 링크 리다이렉트 테이블 적재 실패: {e}")
+                self._loaded_at = time.monotonic()  # 실패해도 다음 주기까지 재시도하지 않음
+            finally:
+                self._reloading = False
+
+        threading.Thread(target=reload, name='link-resolver-reload', daemon=True).start()
+
+    def _put(self, target):
+        if self._by_id is None:
+            return
+        previous = self._by_id.get(target.id)
+        if previous is not None and previous.code and previous.code != target.code:
+            self._by_code.pop(previous.code, None)
+        self._by_id[target.id] = target
+        if target.code:
+            self._by_code[target.code] = target.id
+            self._missing.delete(target.code)
+        self._missing.delete(target.id)
+
+    def _remove(self, link_id):
+        if self._by_id is None:
+            return
+        previous = self._by_id.pop(link_id, None)
+        if previous is not None and previous.code:
+            self._by_code.pop(previous.code, None)
+
+    def _on_message(self, message):
+        op = message.get('op')
+        if op == 'reset':
+            # 구독이 끊긴 동안 놓친 변경이 있을 수 있음
+            if self._by_id is not None:
+                self._schedule_reload()
+        elif op == MESSAGE_OP:
+            for data in message.get('upserts', []):
+                self._put(LinkTarget(**data))
+            for link_id in message.get('deletes', []):
+                self._remove(link_id)
+            if message.get('reload'):
+                self._schedule_reload()
+
+    def _register_hooks(self):
+        if self._hooks_registered:
+            return
+        self._hooks_registered = True
+
+        from app.models.affiliate_link import AffiliateLink
+
+        @on_commit(AffiliateLink, ignore=COUNTER_COLUMNS)
+        def broadcast_link_changes(changes):
+            upserts, deletes, reload = [], [], False
+            for change in changes:
+                if change.op == 'delete':
+                    deletes.append(change.pk)
+                elif REQUIRED_VALUES <= change.values.keys():
+                    upserts.append(LinkTarget.from_values(change.values).to_message())
+                else:
+                    # flush 시점에 필요한 값이 로드되어 있지 않음
+                    reload = True
+            tiered_cache.publish({'op': MESSAGE_OP, 'upserts': upserts, 'deletes': deletes, 'reload': reload})
+
+
+link_resolver = LinkResolver()
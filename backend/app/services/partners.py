@@ -0,0 +1,237 @@
+"""
+제휴사 상품 검색 API 어댑터 (쿠팡 파트너스, 네이버 쇼핑)
+
+- 제휴사별로 연결 풀을 둔 requests.Session을 재사용합니다 (프로세스별, fork 후 새로 생성).
+- 연결/응답 타임아웃은 제휴사별로 설정합니다 (PARTNER_API_TIMEOUTS).
+- 연속으로 실패한 제휴사는 회로 차단기가 잠시 호출하지 않으므로, 장애 중인 제휴사가
+  검색 요청마다 타임아웃까지 스레드를 붙잡지 않습니다.
+- search()는 CatalogProduct 컬럼 이름을 키로 쓰는 dict 목록을 반환합니다.
+"""
+
+import hashlib
+import hmac
+import os
+import re
+import threading
+import time
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+# 프론트엔드 플랫폼 이름 → 제휴사
+PARTNER_ALIASES = {'naver': 'naver_shopping'}
+
+DEFAULT_TIMEOUT = (1.0, 2.5)  # (연결, 응답) 초
+
+TAGS = re.compile(r'<[^>]+>')
+
+
+class PartnerError(Exception):
+    """제휴사 API 호출 실패 (설정 없음, HTTP 오류, 응답 형식 오류, 회로 열림)"""
+
+
+class PartnerAdapter:
+    """제휴사 검색 API 공통 처리"""
+
+    name = None
+    max_limit = 50
+
+    def __init__(self):
+        self.base_url = None
+        self.timeout = DEFAULT_TIMEOUT
+        self.pool_size = 10
+        self.breaker = CircuitBreaker(self.name)
+        self._session = None
+        self._session_pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.timeout = tuple(app.config.get('PARTNER_API_TIMEOUTS', {}).get(self.name, DEFAULT_TIMEOUT))
+        self.pool_size = app.config.get('PARTNER_HTTP_POOL_SIZE', 10)
+        self.breaker = CircuitBreaker(
+            self.name,
+            failure_threshold=app.config.get('PARTNER_CIRCUIT_FAILURES', 5),
+            reset_timeout=app.config.get('PARTNER_CIRCUIT_RESET', 30)
+        )
+
+    @property
+    def configured(self):
+        return bool(self.base_url)
+
+    @property
+    def session(self):
+        # fork된 프로세스는 부모의 소켓을 쓰면 안 됨
+        if self._session is None or self._session_pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+                    self._session_pid = os.getpid()
+        return self._session
+
+    def search(self, query, limit):
+        """상품 검색. 실패하면 PartnerError"""
+        if not self.configured:
+            raise PartnerError(f'{self.name}: API 설정 없음')
+
+        try:
+            response = self.breaker.call(self._request, query, min(limit, self.max_limit))
+        except CircuitOpenError:
+            raise PartnerError(f'{self.name}: 연속 실패로 호출 중단')
+        except (requests.RequestException, ValueError) as e:
+            raise PartnerError(f'{self.name}: {e}') from e
+
+        try:
+            return [product for product in map(self._product, self._items(response)) if product]
+        except (KeyError, TypeError, ValueError) as e:
+            raise PartnerError(f'{self.name}: 응답 형식 오류 ({e})') from e
+
+    def lookup(self, partner_product_id, name):
+        """상품 하나의 현재 정보. 상품 이름으로 검색한 결과에 없으면 None
+
+        두 API 모두 상품 ID 조회를 제공하지 않으므로 검색 결과에서 ID로 찾습니다. 상위 결과에만
+        없을 수도 있으므로 None이 판매 종료를 뜻하지는 않습니다.
+        """
+        for product in self.search(name, self.max_limit):
+            if product['partner_product_id'] == partner_product_id:
+                return product
+        return None
+
+    def _request(self, query, limit):
+        """API 호출 후 JSON 본문 반환 (HTTP 오류는 예외)"""
+        raise NotImplementedError
+
+    def _items(self, body):
+        raise NotImplementedError
+
+    def _product(self, item):
+        """API 항목 → CatalogProduct 컬럼 dict (건너뛸 항목은 None)"""
+        raise NotImplementedError
+
+
+class CoupangAdapter(PartnerAdapter):
+    """쿠팡 파트너스 Open API 상품 검색 (HMAC 서명)"""
+
+    name = 'coupang'
+    max_limit = 10  # API 제한
+    path = '/v2/providers/affiliate_open_api/apis/openapi/products/search'
+
+    def init_app(self, app):
+        super().init_app(app)
+        self.access_key = app.config.get('COUPANG_PARTNER_ID')
+        self.secret_key = app.config.get('COUPANG_PARTNER_SECRET')
+        self.base_url = app.config.get('COUPANG_API_BASE_URL') if self.access_key and self.secret_key else None
+
+    def _authorization(self, method, path, query_string):
+        signed_date = time.strftime('%y%m%dT%H%M%SZ', time.gmtime())
+        message = f'{signed_date}{method}{path}{query_string}'
+        signature = hmac.new(self.secret_key.encode(), message.encode(), hashlib.sha256).hexdigest()
+        return (
+            f'CEA algorithm=HmacSHA256, access-key={self.access_key}, '
+            f'signed-date={signed_date}, signature={signature}'
+        )
+
+    def _request(self, query, limit):
+        query_string = urlencode({'keyword': query, 'limit': limit})
+        response = self.session.get(
+            f'{self.base_url}{self.path}?{query_string}',
+            headers={'Authorization': self._authorization('GET', self.path, query_string)},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _items(self, body):
+        if str(body.get('rCode', '0')) != '0':
+            raise ValueError(body.get('rMessage') or body.get('rCode'))
+        return (body.get('data') or {}).get('productData') or []
+
+    def _product(self, item):
+        product_id = item.get('productId')
+        if not product_id or not item.get('productUrl'):
+            return None
+        return {
+            'partner': self.name,
+            'partner_product_id': str(product_id),
+            'name': item['productName'][:300],
+            'price': int(item['productPrice']) if item.get('productPrice') is not None else None,
+            'image_url': item.get('productImage'),
+            'category': (item.get('categoryName') or '')[:100] or None,
+            'product_url': f'https://www.coupang.com/vp/products/{product_id}',
+            'affiliate_url': item['productUrl'],  # 파트너스 트래킹 링크
+            'commission_rate': None,
+            'rating': None,
+            'review_count': None,
+        }
+
+
+class NaverShoppingAdapter(PartnerAdapter):
+    """네이버 쇼핑 검색 API"""
+
+    name = 'naver_shopping'
+    max_limit = 100  # API 제한
+    path = '/v1/search/shop.json'
+
+    def init_app(self, app):
+        super().init_app(app)
+        self.client_id = app.config.get('NAVER_SHOPPING_CLIENT_ID')
+        self.client_secret = app.config.get('NAVER_SHOPPING_CLIENT_SECRET')
+        self.base_url = app.config.get('NAVER_SHOPPING_API_BASE_URL') if self.client_id and self.client_secret else None
+
+    def _request(self, query, limit):
+        response = self.session.get(
+            f'{self.base_url}{self.path}',
+            params={'query': query, 'display': limit},
+            headers={'X-Naver-Client-Id': self.client_id, 'X-Naver-Client-Secret': self.client_secret},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _items(self, body):
+        return body.get('items') or []
+
+    def _product(self, item):
+        product_id = item.get('productId')
+        if not product_id or not item.get('link'):
+            return None
+        return {
+            'partner': self.name,
+            'partner_product_id': str(product_id),
+            'name': TAGS.sub('', item.get('title') or '')[:300],  # 검색어 강조 <b> 제거
+            'price': int(item['lprice']) if item.get('lprice') else None,
+            'image_url': item.get('image'),
+            'category': (item.get('category2') or item.get('category1') or '')[:100] or None,
+            'product_url': item['link'],
+            'affiliate_url': item['link'],
+            'commission_rate': None,
+            'rating': None,
+            'review_count': None,
+        }
+
+
+class Partners:
+    """제휴사 어댑터 레지스트리"""
+
+    def __init__(self, *adapters):
+        self.adapters = {adapter.name: adapter for adapter in adapters}
+
+    def init_app(self, app):
+        for adapter in self.adapters.values():
+            adapter.init_app(app)
+
+    def get(self, name):
+        """제휴사 이름(또는 프론트엔드 플랫폼 이름)으로 어댑터 조회"""
+        return self.adapters.get(PARTNER_ALIASES.get(name, name))
+
+    def configured(self):
+        return [adapter for adapter in self.adapters.values() if adapter.configured]
+
+
+partners = Partners(CoupangAdapter(), NaverShoppingAdapter())
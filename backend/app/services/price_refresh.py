@@ -0,0 +1,222 @@
+"""
+제휴 상품 가격/이미지 갱신
+
+AffiliateLink.product_price/product_image는 링크를 만들 때 한 번 저장되므로 주기적으로 제휴사 API에서
+다시 확인합니다. `flask links refresh-prices`(--loop로 상시 실행)가 실행합니다.
+
+- 확인할 때가 된 링크(PRICE_REFRESH_INTERVAL)를 제휴사별 배치로 가져오면서 바로 price_checked_at을
+  기록합니다 (FOR UPDATE SKIP LOCKED). 여러 프로세스를 띄우면 서로 다른 링크를 나누어 처리합니다.
+- 같은 상품을 가리키는 링크는 배치 안에서 한 번만 조회합니다.
+- 제휴사별 동시 호출 수(PRICE_REFRESH_CONCURRENCY)와 초당 호출 수(PRICE_REFRESH_RATE_LIMITS)를
+  넘지 않습니다. 회로 차단기가 열리면 해당 제휴사는 이번 실행에서 멈춥니다.
+- 가격/이미지가 바뀐 링크만 executemany UPDATE하고, 가격 이력은 상품 단위로 바뀐 시점만 남깁니다.
+- 제휴사 API에는 상품 ID 조회가 없어 상품 이름 검색 결과에서 찾으므로, 찾지 못했다고 판매 종료는
+  아닙니다. 찾지 못한 링크는 price_check_misses만 올리고(비활성화하지 않음), 연속
+  PRICE_REFRESH_REVIEW_AFTER번 찾지 못하면 확인 필요로 집계/기록합니다. 링크가 실제로 열리는지는
+  링크 상태 점검(link_health)이 확인합니다.
+- 조회에 실패한 상품은 PRICE_REFRESH_RETRY_AFTER 뒤에 다시 확인합니다.
+"""
+
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app import db
+from app.services.partners import PartnerError, partners
+from app.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# 조회에 실패한 상품 (찾지 못한 상품은 None)
+FAILED = object()
+
+# 배치로 가져올 링크 컬럼
+CLAIM_COLUMNS = (
+    'id', 'partner', 'partner_product_id', 'product_name', 'product_price', 'product_image', 'price_check_misses'
+)
+
+IMAGE_LENGTH = 255  # affiliate_links.product_image
+
+
+def diff_links(rows, found, review_after, now):
+    """배치 링크와 조회 결과 비교. (바뀐 링크 UPDATE 파라미터, 이력 행, 이번에 확인 필요가 된 링크)
+
+    found: partner_product_id → 상품 dict, None(찾지 못함) 또는 FAILED
+    찾지 못한 링크는 price_check_misses만 올리고 가격/이미지/활성 상태는 그대로 둡니다.
+    """
+    updates = []
+    history = {}
+    flagged = []
+    for row in rows:
+        product = found.get(row['partner_product_id'], FAILED)
+        if product is FAILED:
+            continue
+
+        price, image, misses = row['product_price'], row['product_image'], 0
+        if product is None:
+            misses = min(row['price_check_misses'] + 1, 1000)
+            if misses == review_after:
+                flagged.append(row)
+        else:
+            if product['price'] is not None:
+                price = product['price']
+            if product['image_url']:
+                image = product['image_url'][:IMAGE_LENGTH]
+            if price != row['product_price']:
+                history.setdefault((row['partner'], row['partner_product_id']), price)
+
+        if (price, image, misses) != (row['product_price'], row['product_image'], row['price_check_misses']):
+            updates.append({'link_id': row['id'], 'new_price': price, 'new_image': image, 'new_misses': misses})
+
+    history_rows = [
+        {'partner': partner, 'partner_product_id': product_id, 'changed_at': now, 'price': price, 'is_available': True}
+        for (partner, product_id), price in history.items()
+    ]
+    return updates, history_rows, flagged
+
+
+class PriceRefresher:
+    """제휴 링크 가격/이미지 주기 갱신"""
+
+    def __init__(self):
+        self.interval = timedelta(hours=24)
+        self.retry_after = timedelta(hours=1)
+        self.batch_size = 200
+        self.concurrency = 4
+        self.rate_limits = {}
+        self.review_after = 3
+
+    def init_app(self, app):
+        self.interval = timedelta(seconds=app.config.get('PRICE_REFRESH_INTERVAL', 24 * 3600))
+        self.retry_after = timedelta(seconds=app.config.get('PRICE_REFRESH_RETRY_AFTER', 3600))
+        self.batch_size = app.config.get('PRICE_REFRESH_BATCH_SIZE', 200)
+        self.concurrency = app.config.get('PRICE_REFRESH_CONCURRENCY', 4)
+        self.rate_limits = app.config.get('PRICE_REFRESH_RATE_LIMITS', {})
+        self.review_after = app.config.get('PRICE_REFRESH_REVIEW_AFTER', 3)
+
+    def run(self, names=None, max_links=None):
+        """확인할 때가 된 링크 갱신. 제휴사별 {'checked', 'changed', 'missing', 'review', 'failed'}
+
+        제휴사마다 스레드 하나에서 배치를 처리합니다 (호출 한도는 제휴사별로 독립).
+        """
+        adapters = [adapter for adapter in partners.configured() if not names or adapter.name in names]
+        if not adapters:
+            return {}
+
+        app = current_app._get_current_object()
+        with ThreadPoolExecutor(max_workers=len(adapters), thread_name_prefix='price-refresh') as executor:
+            futures = {
+                executor.submit(self._run_partner, app, adapter, max_links): adapter.name
+                for adapter in adapters
+            }
+        return {name: future.result() for future, name in futures.items()}
+
+    def _run_partner(self, app, adapter, max_links):
+        with app.app_context():
+            stats = Counter()
+            bucket = TokenBucket(self.rate_limits.get(adapter.name, 1.0))
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix=f'price-{adapter.name}') as lookups:
+                while max_links is None or stats['checked'] < max_links:
+                    if adapter.breaker.state == 'open':
+                        logger.warning(f"{adapter.name}: 연속 실패로 가격 갱신 중단")
+                        break
+                    size = self.batch_size if max_links is None else min(self.batch_size, max_links - stats['checked'])
+                    rows = self._claim(adapter.name, size)
+                    if not rows:
+                        break
+                    stats.update(self._apply(rows, self._lookup(lookups, bucket, adapter, rows)))
+            return dict(stats)
+
+    def _claim(self, partner, size):
+        """확인할 때가 된 링크를 가져오며 price_checked_at 기록 (다른 프로세스가 잡은 행은 건너뜀)"""
+        from app.models.affiliate_link import AffiliateLink
+
+        links = AffiliateLink.__table__
+        now = datetime.utcnow()
+        due = select(links.c.id).where(
+            links.c.partner == partner,
+            links.c.is_active == True,
+            links.c.partner_product_id.isnot(None),
+            or_(links.c.price_checked_at.is_(None), links.c.price_checked_at < now - self.interval)
+        ).order_by(links.c.price_checked_at.asc().nulls_first()).limit(size).with_for_update(skip_locked=True)
+
+        # 확인 기록만으로 updated_at(onupdate)을 바꾸지 않음
+        stmt = update(links).where(links.c.id.in_(due.scalar_subquery())).values(
+            price_checked_at=now, updated_at=links.c.updated_at
+        ).returning(*(links.c[column] for column in CLAIM_COLUMNS))
+        rows = [dict(row) for row in db.session.execute(stmt).mappings()]
+        db.session.commit()
+        return rows
+
+    def _lookup(self, executor, bucket, adapter, rows):
+        """상품별로 한 번씩 조회 (호출 한도 안에서 동시에)"""
+        names = {}
+        for row in rows:
+            names.setdefault(row['partner_product_id'], row['product_name'])
+
+        def lookup(product_id, name):
+            bucket.acquire()
+            return adapter.lookup(product_id, name)
+
+        futures = {executor.submit(lookup, product_id, name): product_id for product_id, name in names.items()}
+        found = {}
+        errors = []
+        for future in as_completed(futures):
+            try:
+                found[futures[future]] = future.result()
+            except PartnerError as e:
+                found[futures[future]] = FAILED
+                errors.append(e)
+        if errors:
+            logger.warning(f"{adapter.name}: 상품 {len(errors)}건 조회 실패 (예: {errors[0]})")
+        return found
+
+    def _apply(self, rows, found):
+        """바뀐 링크만 UPDATE, 이력 추가, 실패한 링크는 재시도 시각으로 되돌림 (활성 상태는 바꾸지 않음)"""
+        from app.models.affiliate_link import AffiliateLink, AffiliatePriceHistory
+
+        links = AffiliateLink.__table__
+        now = datetime.utcnow()
+        updates, history, flagged = diff_links(rows, found, self.review_after, now)
+        retries = [{'link_id': row['id']} for row in rows if found.get(row['partner_product_id'], FAILED) is FAILED]
+
+        if updates:
+            db.session.execute(
+                update(links).where(links.c.id == bindparam('link_id')).values(
+                    product_price=bindparam('new_price'),
+                    product_image=bindparam('new_image'),
+                    price_check_misses=bindparam('new_misses'),
+                    updated_at=now
+                ),
+                updates
+            )
+        if retries:
+            db.session.execute(
+                update(links).where(links.c.id == bindparam('link_id')).values(
+                    price_checked_at=now - self.interval + self.retry_after,
+                    updated_at=links.c.updated_at
+                ),
+                retries
+            )
+        if history:
+            db.session.execute(insert(AffiliatePriceHistory.__table__).on_conflict_do_nothing(), history)
+        db.session.commit()
+
+        if flagged:
+            logger.warning(
+                f"제휴사 검색에서 {self.review_after}번 연속 찾지 못한 링크 {len(flagged)}건, 확인 필요 "
+                f"(예: {', '.join(row['id'] for row in flagged[:5])})"
+            )
+        return {
+            'checked': len(rows), 'changed': len(updates),
+            'missing': sum(1 for row in rows if found.get(row['partner_product_id'], FAILED) is None),
+            'review': len(flagged), 'failed': len(retries)
+        }
+
+
+price_refresher = PriceRefresher()
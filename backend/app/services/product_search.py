@@ -0,0 +1,230 @@
+"""
+제휴 상품 검색 (제휴사 API 동시 호출 + 로컬 카탈로그)
+
+1. 정규화한 검색어로 2단계 캐시를 찾습니다 (soft TTL이 지나면 기존 결과를 반환하며 백그라운드 갱신).
+   캐시와 제휴사 호출은 항상 MAX_RESULTS개 기준이며, 요청한 limit만큼은 꺼낸 뒤 자릅니다.
+2. 캐시에 없으면 로컬 카탈로그(partner_catalog)에서 최근에 받은 상품을 찾고,
+   PRODUCT_SEARCH_CATALOG_MIN개 이상이면 그대로 반환합니다.
+3. 부족하면 제휴사 API를 스레드 풀에서 동시에 호출하고 전체 마감 시간(PRODUCT_SEARCH_DEADLINE)까지만
+   기다립니다. 늦거나 실패한 제휴사는 빼고 응답하며, 받은 상품은 카탈로그에 upsert합니다.
+4. 그래도 부족하면 오래된 카탈로그 상품으로 채웁니다.
+
+일부 제휴사가 빠진 결과(failed)는 PRODUCT_SEARCH_PARTIAL_TIMEOUT이 지나면 다시 검색하도록 예약합니다.
+"""
+
+import logging
+import os
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy.dialects.postgresql import insert
+
+from app import db
+from app.services.cache import tiered_cache
+from app.services.partners import PartnerError, partners
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = 'product-search'
+MAX_QUERY_LENGTH = 100
+MAX_RESULTS = 50  # 검색 한 번에 반환할 수 있는 최대 상품 수
+
+
+def normalize_query(query):
+    """캐시 키/카탈로그 검색용 검색어 (전각/반각 통일, 대소문자 무시, 공백 정리)"""
+    query = unicodedata.normalize('NFKC', query or '').casefold()
+    return ' '.join(query.split())[:MAX_QUERY_LENGTH]
+
+
+def _like_pattern(token):
+    escaped = token.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def _interleave(results):
+    """제휴사별 목록을 번갈아 합치고 (partner, partner_product_id) 중복 제거"""
+    seen = set()
+    merged = []
+    for rank in range(max((len(products) for products in results), default=0)):
+        for products in results:
+            if rank < len(products):
+                product = products[rank]
+                key = (product['partner'], product['partner_product_id'])
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(product)
+    return merged
+
+
+class ProductSearch:
+    """제휴 상품 검색"""
+
+    def __init__(self):
+        self.timeout = 1800
+        self.soft_timeout = 300
+        self.partial_timeout = 30
+        self.deadline = 3.0
+        self.catalog_min = 20
+        self.catalog_fresh = timedelta(hours=6)
+        self.workers = 8
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.timeout = app.config.get('PRODUCT_SEARCH_CACHE_TIMEOUT', 1800)
+        self.soft_timeout = app.config.get('PRODUCT_SEARCH_CACHE_SOFT_TIMEOUT', 300)
+        self.partial_timeout = app.config.get('PRODUCT_SEARCH_PARTIAL_TIMEOUT', 30)
+        self.deadline = app.config.get('PRODUCT_SEARCH_DEADLINE', 3.0)
+        self.catalog_min = app.config.get('PRODUCT_SEARCH_CATALOG_MIN', 20)
+        self.catalog_fresh = timedelta(seconds=app.config.get('PARTNER_CATALOG_FRESH_SECONDS', 6 * 3600))
+        self.workers = app.config.get('PRODUCT_SEARCH_WORKERS', 8)
+        partners.init_app(app)
+
+    @property
+    def executor(self):
+        # fork된 프로세스는 부모의 스레드 풀을 쓸 수 없음
+        if self._executor is None or self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._executor_pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='partner-search')
+                    self._executor_pid = os.getpid()
+        return self._executor
+
+    def search(self, query, partner=None, limit=20):
+        """상품 검색 결과 {'products', 'failed', 'searched_at'}
+
+        partner: 제휴사 이름 (없으면 전체). 알 수 없는 제휴사는 ValueError
+        limit: 반환할 상품 수 (최대 MAX_RESULTS, 캐시 키에는 포함하지 않음)
+        """
+        if partner:
+            adapter = partners.get(partner)
+            if adapter is None:
+                raise ValueError(f'지원하지 않는 제휴사입니다: {partner}')
+            names = [adapter.name]
+        else:
+            names = list(partners.adapters)
+
+        normalized = normalize_query(query)
+        key = f"{','.join(names)}:{normalized}"
+
+        def compute():
+            return self._search(normalized, names, MAX_RESULTS)
+
+        result = tiered_cache.get_or_compute(NAMESPACE, key, compute, self.timeout, self.soft_timeout)
+        if result['failed'] and time.time() - result['searched_at'] > self.partial_timeout:
+            tiered_cache.schedule_refresh(NAMESPACE, key, compute, self.timeout, self.soft_timeout)
+        return {**result, 'products': result['products'][:min(limit, MAX_RESULTS)]}
+
+    def _search(self, query, names, limit):
+        searched_at = time.time()
+        products = self._catalog(query, names, limit, fresh=True)
+        if len(products) >= min(self.catalog_min, limit):
+            return {'products': products, 'failed': [], 'searched_at': searched_at}
+
+        fetched, failed = self._fetch(query, names, limit)
+        if fetched:
+            self._store(fetched)
+
+        products = self._merge(self._rows_to_dicts(fetched), products, limit)
+        if len(products) < limit:
+            products = self._merge(products, self._catalog(query, names, limit, fresh=False), limit)
+        return {'products': products, 'failed': failed, 'searched_at': searched_at}
+
+    def _fetch(self, query, names, limit):
+        """제휴사 API 동시 호출. (상품 행 목록, 실패한 제휴사 목록)"""
+        adapters = [partners.adapters[name] for name in names if partners.adapters[name].configured]
+        if not adapters:
+            return [], []
+
+        futures = {self.executor.submit(adapter.search, query, limit): adapter.name for adapter in adapters}
+        done, not_done = wait(futures, timeout=self.deadline)
+
+        results = []
+        failed = []
+        for future in futures:
+            name = futures[future]
+            if future in not_done:
+                # 스레드는 제휴사별 타임아웃까지 계속 돌고 결과는 버림
+                future.cancel()
+                failed.append(name)
+                logger.warning(f"제휴 상품 검색 마감 시간 초과: {name}")
+                continue
+            try:
+                results.append(future.result())
+            except PartnerError as e:
+                failed.append(name)
+                logger.warning(f"제휴 상품 검색 실패: {e}")
+        return _interleave(results), failed
+
+    def _catalog(self, query, names, limit, fresh):
+        """로컬 카탈로그에서 모든 검색어 토큰을 이름에 포함한 상품"""
+        from app.models.partner_catalog import CatalogProduct
+
+        tokens = query.split()
+        if not tokens:
+            return []
+
+        q = CatalogProduct.query.filter(
+            CatalogProduct.partner.in_(names),
+            CatalogProduct.is_available == True,
+            *[CatalogProduct.name.ilike(_like_pattern(token), escape='\\') for token in tokens]
+        )
+        if fresh:
+            q = q.filter(CatalogProduct.fetched_at >= datetime.utcnow() - self.catalog_fresh)
+        products = q.order_by(
+            db.func.similarity(CatalogProduct.name, query).desc(),
+            CatalogProduct.fetched_at.desc()
+        ).limit(limit).all()
+        return [product.to_dict() for product in products]
+
+    def _store(self, rows):
+        """받은 상품을 카탈로그에 upsert (실패해도 검색 결과는 반환)"""
+        from app.models.partner_catalog import CatalogProduct
+
+        now = datetime.utcnow()
+        # 동시 upsert 교착을 피하려고 키 순서로 정렬
+        values = sorted(
+            ({**row, 'fetched_at': now, 'is_available': True} for row in rows),
+            key=lambda value: (value['partner'], value['partner_product_id'])
+        )
+        stmt = insert(CatalogProduct.__table__).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['partner', 'partner_product_id'],
+            set_={
+                column: stmt.excluded[column]
+                for column in values[0]
+                if column not in ('partner', 'partner_product_id')
+            }
+        )
+        try:
+            db.session.execute(stmt)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"제휴 상품 카탈로그 저장 실패: {e}")
+
+    @staticmethod
+    def _rows_to_dicts(rows):
+        from app.models.partner_catalog import CatalogProduct
+
+        return [CatalogProduct(**row, is_available=True).to_dict() for row in rows]
+
+    @staticmethod
+    def _merge(products, extra, limit):
+        seen = {product['id'] for product in products}
+        merged = list(products)
+        for product in extra:
+            if len(merged) >= limit:
+                break
+            if product['id'] not in seen:
+                seen.add(product['id'])
+                merged.append(product)
+        return merged[:limit]
+
+
+product_search = ProductSearch()
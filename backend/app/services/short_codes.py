@@ -0,0 +1,80 @@
+"""
+제휴 링크 단축 코드 할당
+
+단축 코드는 데이터베이스 시퀀스 값을 base62(0-9a-zA-Z)로 인코딩한 문자열이므로 충돌하지 않고,
+생성 후 중복 확인이나 재시도가 필요 없습니다.
+
+시퀀스는 INCREMENT BY SHORT_CODE_BLOCK_SIZE로 만들어 nextval 한 번이 블록 하나를 예약합니다.
+각 워커는 예약한 블록 [start, start + size) 안의 값을 조율 없이 차례로 사용하고, 다 쓰면 다음
+블록을 예약합니다. 워커가 재시작되면 남은 값은 버려지지만(코드에 빈 번호가 생길 뿐) 재사용되지 않습니다.
+"""
+
+import os
+import string
+import threading
+
+from app import db
+from app.models.affiliate_link import SHORT_CODE_BLOCK_SIZE, short_code_sequence
+
+ALPHABET = string.digits + string.ascii_lowercase + string.ascii_uppercase
+BASE = len(ALPHABET)
+MAX_LENGTH = 16  # affiliate_links.short_code 컬럼 길이
+_INDEX = {char: index for index, char in enumerate(ALPHABET)}
+
+
+def encode(number):
+    """0 이상의 정수를 base62 문자열로 인코딩"""
+    if number < 0:
+        raise ValueError('음수는 인코딩할 수 없습니다.')
+    chars = []
+    while True:
+        number, remainder = divmod(number, BASE)
+        chars.append(ALPHABET[remainder])
+        if not number:
+            return ''.join(reversed(chars))
+
+
+def decode(code):
+    """base62 문자열을 정수로 디코딩 (잘못된 문자는 ValueError)"""
+    number = 0
+    for char in code:
+        try:
+            number = number * BASE + _INDEX[char]
+        except KeyError:
+            raise ValueError(f'잘못된 단축 코드 문자: {char!r}')
+    return number
+
+
+def is_valid(code):
+    """단축 코드 형식인지 (조회 전에 잘못된 입력을 걸러냄)"""
+    return 0 < len(code) <= MAX_LENGTH and all(char in _INDEX for char in code)
+
+
+class ShortCodeAllocator:
+    """블록 단위로 예약한 시퀀스 값으로 단축 코드 발급 (프로세스별)"""
+
+    def __init__(self, block_size=SHORT_CODE_BLOCK_SIZE):
+        self.block_size = block_size
+        self._next = 0
+        self._end = 0
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def allocate(self):
+        """새 단축 코드 (블록을 다 쓴 경우에만 데이터베이스 왕복)"""
+        with self._lock:
+            # fork된 워커가 부모가 예약한 블록을 함께 쓰지 않도록 프로세스가 바뀌면 새로 예약
+            if self._pid != os.getpid() or self._next >= self._end:
+                self._reserve()
+            number = self._next
+            self._next += 1
+        return encode(number)
+
+    def _reserve(self):
+        # nextval은 트랜잭션이 롤백되어도 되돌려지지 않으므로 같은 블록이 두 번 예약되지 않음
+        start = db.session.execute(short_code_sequence.next_value()).scalar()
+        self._next, self._end = start, start + self.block_size
+        self._pid = os.getpid()
+
+
+short_codes = ShortCodeAllocator()
@@ -0,0 +1,358 @@
+"""
+정적 스냅샷 발행
+
+카테고리 목록, 추천 사업체, 태그 클라우드, 사이트맵처럼 자주 조회되지만 드물게 바뀌는
+공개 문서를 nginx와 공유하는 볼륨에 정적 파일로 발행합니다. nginx가 sendfile과
+gzip_static으로 직접 서빙하므로 Flask는 관여하지 않습니다.
+
+파일 구성 (SNAPSHOT_PATH):
+    {name}.{digest}.json[.gz|.br]   내용 해시로 버전이 붙은 불변 파일 (장기 캐시)
+    {name}.json[.gz|.br]            최신 버전 별칭 (짧은 캐시)
+    manifest.json                   {name: {url, digest, size, published_at}}
+
+- 모든 파일은 같은 디렉터리의 임시 파일에 쓴 뒤 os.replace로 교체하므로 nginx가 쓰다 만
+  파일을 서빙하지 않습니다.
+- 관련 엔티티가 커밋되면 잠시 모았다가(debounce) 백그라운드에서 다시 발행하며,
+  내용이 같으면 버전 파일을 다시 쓰지 않습니다.
+- 여러 워커가 동시에 발행하지 않도록 디렉터리의 락 파일(flock)로 직렬화합니다.
+"""
+
+import fcntl
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+from flask import current_app, has_app_context
+
+from app.services.commit_hooks import on_commit
+
+try:
+    import brotli
+except ImportError:  # .br 파일 없이 gzip만 발행
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = 'manifest.json'
+LOCK_FILE = '.publish.lock'
+SITEMAP_LIMIT = 50000  # 사이트맵 프로토콜의 파일당 최대 URL 수
+
+
+class Snapshot:
+    """발행 대상 문서 정의"""
+
+    def __init__(self, name, render, extension='json'):
+        self.name = name
+        self.render = render  # () -> bytes
+        self.extension = extension
+
+    @property
+    def alias(self):
+        return f'{self.name}.{self.extension}'
+
+    def versioned(self, digest):
+        return f'{self.name}.{digest}.{self.extension}'
+
+
+class SnapshotPublisher:
+    """공유 볼륨에 버전별 사전 압축 정적 파일 발행"""
+
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.url_prefix = '/snapshots'
+        self.keep_versions = 3
+        self.debounce = 2
+        self._snapshots = {}
+        self._pending = set()
+        self._worker = None
+        self._lock = threading.Lock()
+        self._manifest = (None, {})  # (mtime, manifest)
+        self._hooks_registered = False
+
+    def init_app(self, app):
+        self.enabled = app.config.get('SNAPSHOTS_ENABLED', False)
+        self.path = app.config.get('SNAPSHOT_PATH')
+        self.url_prefix = app.config.get('SNAPSHOT_URL_PREFIX', '/snapshots').rstrip('/')
+        self.keep_versions = app.config.get('SNAPSHOT_KEEP_VERSIONS', 3)
+        self.debounce = app.config.get('SNAPSHOT_DEBOUNCE', 2)
+        self._register_hooks()
+
+    def register(self, name, extension='json'):
+        """문서 렌더러 등록 데코레이터 (렌더러는 bytes 반환)"""
+        def decorator(render):
+            self._snapshots[name] = Snapshot(name, render, extension)
+            return render
+        return decorator
+
+    @property
+    def names(self):
+        return list(self._snapshots)
+
+    # 조회
+
+    def manifest(self):
+        """현재 발행된 스냅샷 목록 (manifest.json, 변경 시에만 다시 읽음)"""
+        if not self.enabled or not self.path:
+            return {}
+
+        path = os.path.join(self.path, MANIFEST)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return {}
+
+        cached_mtime, manifest = self._manifest
+        if cached_mtime != mtime:
+            try:
+                with open(path, 'rb') as f:
+                    manifest = current_app.json.loads(f.read())
+            except (OSError, ValueError) as e:
+                logger.warning(f"스냅샷 매니페스트 읽기 실패: {e}")
+                return manifest
+            self._manifest = (mtime, manifest)
+        return manifest
+
+    def url(self, name):
+        """최신 버전 스냅샷 URL (발행되지 않았으면 None)"""
+        entry = self.manifest().get(name)
+        return entry['url'] if entry else None
+
+    def link(self, response, *names):
+        """응답에 스냅샷 Link 헤더 추가 (rel="alternate")"""
+        links = [
+            f'<{url}>; rel="alternate"; type="{self._content_type(name)}"'
+            for name in names
+            if (url := self.url(name))
+        ]
+        if links:
+            response.headers.add('Link', ', '.join(links))
+        return response
+
+    # 발행
+
+    def publish(self, *names):
+        """스냅샷을 렌더링해 발행하고 갱신된 매니페스트 반환"""
+        if not self.path:
+            raise RuntimeError('SNAPSHOT_PATH가 설정되지 않았습니다.')
+
+        unknown = set(names) - set(self._snapshots)
+        if unknown:
+            raise KeyError(f"알 수 없는 스냅샷: {', '.join(sorted(unknown))}")
+
+        snapshots = [self._snapshots[name] for name in (names or self._snapshots)]
+        rendered = [(snapshot, snapshot.render()) for snapshot in snapshots]
+
+        os.makedirs(self.path, exist_ok=True)
+        with self._exclusive():
+            manifest = self._read_manifest()
+            for snapshot, body in rendered:
+                manifest[snapshot.name] = self._write(snapshot, body)
+                self._prune(snapshot, keep=manifest[snapshot.name]['file'])
+            self._replace(MANIFEST, current_app.json.dumps_bytes(manifest))
+
+        return manifest
+
+    def schedule_publish(self, *names):
+        """debounce 후 백그라운드 스레드에서 발행 (프로세스당 워커 하나)"""
+        if not self.enabled or not self.path:
+            return
+
+        app = current_app._get_current_object() if has_app_context() else None
+        if app is None:
+            return
+
+        with self._lock:
+            self._pending.update(names or self._snapshots)
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(
+                target=self._drain, args=(app,), name='snapshot-publisher', daemon=True
+            )
+            self._worker.start()
+
+    def _drain(self, app):
+        while True:
+            time.sleep(self.debounce)
+            with self._lock:
+                names = self._pending
+                self._pending = set()
+                if not names:
+                    self._worker = None
+                    return
+            try:
+                with app.app_context():
+                    self.publish(*sorted(names))
+            except Exception as e:
+                logger.error(f"스냅샷 발행 실패 ({', '.join(sorted(names))}): {e}")
+
+    # 파일 쓰기
+
+    def _write(self, snapshot, body):
+        digest = hashlib.sha256(body).hexdigest()[:12]
+        filename = snapshot.versioned(digest)
+        variants = self._encode(body)
+
+        # 버전 파일은 내용이 같으면 그대로 두고, 별칭은 항상 최신 버전으로 교체
+        for suffix, data in variants.items():
+            if not os.path.exists(os.path.join(self.path, filename + suffix)):
+                self._replace(filename + suffix, data)
+        for suffix, data in variants.items():
+            self._replace(snapshot.alias + suffix, data)
+
+        return {
+            'url': f'{self.url_prefix}/{filename}',
+            'file': filename,
+            'digest': digest,
+            'size': len(body),
+            'published_at': datetime.utcnow()
+        }
+
+    def _encode(self, body):
+        variants = {'': body, '.gz': gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['.br'] = brotli.compress(body, quality=11)
+        return variants
+
+    def _replace(self, filename, data):
+        """같은 디렉터리의 임시 파일에 쓴 뒤 원자적으로 교체"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, os.path.join(self.path, filename))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def _prune(self, snapshot, keep):
+        """최근 버전 몇 개만 남기고 삭제 (이전 매니페스트를 받은 클라이언트용)"""
+        prefix = f'{snapshot.name}.'
+        suffix = f'.{snapshot.extension}'
+        versions = []
+        for entry in os.scandir(self.path):
+            name = entry.name
+            if name.startswith(prefix) and name.endswith(suffix) and name not in (keep, snapshot.alias):
+                versions.append((entry.stat().st_mtime, name))
+
+        versions.sort(reverse=True)
+        for _, name in versions[max(self.keep_versions - 1, 0):]:
+            for variant in ('', '.gz', '.br'):
+                try:
+                    os.unlink(os.path.join(self.path, name + variant))
+                except FileNotFoundError:
+                    pass
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.path, MANIFEST), 'rb') as f:
+                return current_app.json.loads(f.read())
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logger.warning("스냅샷 매니페스트가 손상되어 새로 작성합니다.")
+            return {}
+
+    @contextmanager
+    def _exclusive(self):
+        with open(os.path.join(self.path, LOCK_FILE), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _content_type(self, name):
+        snapshot = self._snapshots.get(name)
+        return 'application/xml' if snapshot and snapshot.extension == 'xml' else 'application/json'
+
+    def _register_hooks(self):
+        if self._hooks_registered:
+            return
+        self._hooks_registered = True
+
+        from app.models import Business, BlogPost, Tag
+
+        # 카운터만 바뀐 경우는 다음 발행 때 반영
+        @on_commit(Business, ignore=('view_count', 'favorite_count'))
+        def publish_business_snapshots(changes):
+            self.schedule_publish('categories', 'featured-businesses', 'sitemap')
+
+        @on_commit(BlogPost, ignore=('view_count', 'like_count', 'comment_count', 'share_count'))
+        def publish_blog_snapshots(changes):
+            self.schedule_publish('sitemap')
+
+        @on_commit(Tag)
+        def publish_tag_snapshots(changes):
+            self.schedule_publish('tags')
+
+
+snapshots = SnapshotPublisher()
+
+
+# 발행 문서
+
+def _json(data):
+    """API 응답과 같은 형태({'success', 'data'})로 인코딩"""
+    return current_app.json.dumps_bytes({'success': True, 'data': data})
+
+
+@snapshots.register('categories')
+def render_categories():
+    from app.models import Business
+    return _json(Business.get_category_counts())
+
+
+@snapshots.register('featured-businesses')
+def render_featured_businesses():
+    from app.models import Business
+    return _json([business.to_dict() for business in Business.get_featured()])
+
+
+@snapshots.register('tags')
+def render_tag_cloud():
+    from app.models import Tag
+    limit = current_app.config.get('SNAPSHOT_TAG_CLOUD_SIZE', 50)
+    return _json([tag.to_dict() for tag in Tag.get_trending(limit=limit)])
+
+
+@snapshots.register('sitemap', extension='xml')
+def render_sitemap():
+    from app import db
+    from app.models import Business, BlogPost
+
+    site_url = current_app.config.get('SITE_URL', '').rstrip('/')
+    urls = [(f'{site_url}/', None), (f'{site_url}/businesses', None), (f'{site_url}/blog', None)]
+
+    businesses = db.session.query(Business.id, Business.updated_at).filter(
+        Business.status == 'approved'
+    ).order_by(Business.updated_at.desc()).limit(SITEMAP_LIMIT)
+    urls.extend((f'{site_url}/businesses/{business_id}', updated_at) for business_id, updated_at in businesses)
+
+    posts = db.session.query(BlogPost.slug, BlogPost.updated_at).filter(
+        BlogPost.status == 'published'
+    ).order_by(BlogPost.updated_at.desc()).limit(SITEMAP_LIMIT - len(urls))
+    urls.extend((f'{site_url}/blog/{slug}', updated_at) for slug, updated_at in posts)
+
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+    ]
+    for loc, lastmod in urls[:SITEMAP_LIMIT]:
+        entry = f'<url><loc>{escape(loc)}</loc>'
+        if lastmod:
+            entry += f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+        lines.append(entry + '</url>')
+    lines.append('</urlset>')
+    return '\n'.join(lines).encode('utf-8')
@@ -0,0 +1,269 @@
+"""
+델타 동기화 (오프라인 클라이언트용)
+
+동기화 대상 엔티티가 flush될 때마다 같은 트랜잭션에서 change_log에 (seq, xid) 행을 기록하고,
+클라이언트는 마지막으로 받은 토큰 이후에 생성/변경/삭제된 행만 받아 갑니다.
+
+토큰: "{xmin}:{seq}" (초기 전체 동기화 중에는 "{xmin}:{seq}:{cursor}")
+- seq: 클라이언트가 반영한 마지막 변경 시퀀스
+- xmin: 토큰 발급 시점 스냅샷에서 아직 진행 중이던 가장 오래된 트랜잭션 ID
+
+seq는 기록 순서대로 발급되지만 커밋 순서는 다를 수 있으므로, 다음 요청에서는
+seq > since 인 행과 함께 xid >= xmin 인 행(이전 조회 때 커밋되지 않았던 트랜잭션)을
+다시 확인합니다. updated_at 비교와 달리 서버/클라이언트 시계와 무관합니다.
+
+change_log는 순서와 ID만 담고, 응답 데이터는 현재 행을 읽어 만듭니다. 같은 엔티티의
+여러 변경은 하나로 합쳐지며, 조회 대상이 아니게 된 행(비승인, 비활성화 등)은 삭제로 전달합니다.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from flask import current_app
+from sqlalchemy import func, insert, select, text
+
+from app import db
+from app.services.commit_hooks import on_flush
+
+
+class InvalidSyncToken(ValueError):
+    """해석할 수 없는 동기화 토큰"""
+
+
+@dataclass
+class SyncToken:
+    xmin: int
+    seq: int
+    cursor: Optional[str] = None  # 초기 전체 동기화의 마지막 기본 키
+
+    @classmethod
+    def parse(cls, raw):
+        parts = raw.split(':', 2)
+        try:
+            xmin, seq = int(parts[0]), int(parts[1])
+        except (IndexError, ValueError):
+            raise InvalidSyncToken(raw)
+        if xmin < 0 or seq < 0:
+            raise InvalidSyncToken(raw)
+        return cls(xmin, seq, parts[2] if len(parts) == 3 and parts[2] else None)
+
+    def __str__(self):
+        token = f'{self.xmin}:{self.seq}'
+        return f'{token}:{self.cursor}' if self.cursor else token
+
+
+@dataclass
+class SyncFeed:
+    """동기화 가능한 엔티티 정의"""
+    name: str
+    entity_type: str
+    model: type
+    serialize: Callable
+    visible: Callable = lambda query: query  # 클라이언트에 보일 행만 남기는 필터
+    options: tuple = ()  # 직렬화에 필요한 관계 로딩 옵션
+    scope: Optional[str] = None  # 사용자별 피드의 소유자 컬럼 (user_id 등)
+    ignore: tuple = ()  # 이 컬럼만 바뀐 update는 기록하지 않음
+
+    def query(self, user_id=None):
+        query = self.visible(self.model.query)
+        if self.scope:
+            query = query.filter(getattr(self.model, self.scope) == user_id)
+        return query.options(*self.options)
+
+
+_feeds = {}
+
+
+def register_feed(feed):
+    """동기화 피드 등록 및 변경 기록 훅 연결"""
+    _feeds[feed.name] = feed
+
+    @on_flush(feed.model, ignore=feed.ignore)
+    def record_changes(session, changes):
+        _record(session, feed, changes)
+
+    return feed
+
+
+def get_feed(name):
+    return _feeds.get(name)
+
+
+def _record(session, feed, changes):
+    from app.models.change_log import ChangeLog
+
+    rows = [
+        {
+            'entity_type': feed.entity_type,
+            'entity_id': str(change.pk),
+            'scope_user_id': change.values.get(feed.scope) if feed.scope else None,
+            'op': 'delete' if change.op == 'delete' else 'upsert'
+        }
+        for change in changes
+    ]
+    session.connection().execute(insert(ChangeLog), rows)
+
+
+# 조회
+
+def _watermark():
+    """(현재 스냅샷 xmin, 마지막 seq). 변경 조회보다 먼저 읽어야 누락이 없음"""
+    return db.session.execute(text(
+        'SELECT txid_snapshot_xmin(txid_current_snapshot()), '
+        '(SELECT COALESCE(MAX(seq), 0) FROM change_log)'
+    )).one()
+
+
+def _is_expired(token):
+    """토큰 이후 변경 로그가 정리되었는지 (정리된 경우 전체 동기화 필요)"""
+    from app.models.change_log import ChangeLog
+
+    if token.seq == 0:
+        return False
+    oldest = db.session.query(func.min(ChangeLog.seq)).scalar()
+    return oldest is not None and token.seq < oldest - 1
+
+
+def sync(feed, token=None, user_id=None, limit=500):
+    """토큰 이후 변경분 반환
+
+    Returns:
+        {'upserts': [...], 'deletes': [id, ...], 'next': token, 'has_more': bool, 'reset': bool}
+        reset이 True이면 클라이언트는 로컬 데이터를 비우고 upserts로 다시 채워야 합니다.
+    """
+    reset = token is None or _is_expired(token)
+    if reset:
+        xmin, seq = _watermark()
+        return _full_page(feed, SyncToken(xmin, seq), user_id, limit, reset=True)
+    if token.cursor:
+        return _full_page(feed, token, user_id, limit, reset=False)
+    return _delta_page(feed, token, user_id, limit)
+
+
+def _full_page(feed, token, user_id, limit, reset):
+    """초기 전체 동기화: 기본 키 순으로 현재 행을 페이지 단위로 반환
+
+    전체 동기화를 시작한 시점의 토큰을 유지했다가, 마지막 페이지에서 델타 토큰으로 넘겨
+    전체 동기화 중에 일어난 변경을 다음 델타 요청에서 받도록 합니다.
+    """
+    pk = feed.model.__mapper__.primary_key[0]
+    query = feed.query(user_id)
+    if token.cursor:
+        query = query.filter(pk > token.cursor)
+    rows = query.order_by(pk).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    cursor = str(getattr(rows[-1], pk.key)) if has_more else None
+
+    return {
+        'upserts': [feed.serialize(row) for row in rows],
+        'deletes': [],
+        'next': str(SyncToken(token.xmin, token.seq, cursor)),
+        'has_more': has_more,
+        'reset': reset
+    }
+
+
+def _delta_page(feed, token, user_id, limit):
+    from app.models.change_log import ChangeLog
+
+    xmin, last_seq = _watermark()
+
+    feed_filter = (
+        ChangeLog.entity_type == feed.entity_type,
+        ChangeLog.scope_user_id == user_id if feed.scope else ChangeLog.scope_user_id.is_(None)
+    )
+    columns = (ChangeLog.seq, ChangeLog.entity_id, ChangeLog.op)
+
+    # 이전 조회 시점에 진행 중이던 트랜잭션이 그 뒤에 커밋한 변경 (seq <= since)
+    late = db.session.execute(
+        select(*columns).where(*feed_filter, ChangeLog.xid >= token.xmin, ChangeLog.seq <= token.seq)
+    ).all()
+    entries = db.session.execute(
+        select(*columns).where(*feed_filter, ChangeLog.seq > token.seq)
+        .order_by(ChangeLog.seq).limit(limit + 1)
+    ).all()
+
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if has_more:
+        next_seq = entries[-1].seq
+    else:
+        # 이 피드의 변경이 없던 구간도 건너뛰어 다음 조회 범위를 줄임
+        next_seq = max(last_seq, token.seq, entries[-1].seq if entries else 0)
+
+    # 같은 엔티티의 변경은 마지막 것만 반영
+    ops = {}
+    for entry in sorted([*late, *entries], key=lambda entry: entry.seq):
+        ops[entry.entity_id] = entry.op
+
+    upsert_ids = [entity_id for entity_id, op in ops.items() if op == 'upsert']
+    rows = {}
+    if upsert_ids:
+        pk = feed.model.__mapper__.primary_key[0]
+        rows = {
+            str(getattr(row, pk.key)): row
+            for row in feed.query(user_id).filter(pk.in_(upsert_ids)).all()
+        }
+
+    return {
+        'upserts': [feed.serialize(rows[entity_id]) for entity_id in upsert_ids if entity_id in rows],
+        'deletes': [entity_id for entity_id in ops if entity_id not in rows],
+        'next': str(SyncToken(xmin, next_seq)),
+        'has_more': has_more,
+        'reset': False
+    }
+
+
+def prune(days=None):
+    """보관 기간이 지난 변경 로그 삭제. 삭제한 행 수 반환
+
+    이보다 오래된 토큰을 가진 클라이언트는 다음 요청에서 전체 동기화(reset)를 받습니다.
+    """
+    from app.models.change_log import ChangeLog
+
+    days = days if days is not None else current_app.config.get('SYNC_CHANGE_LOG_RETENTION_DAYS', 30)
+    deleted = ChangeLog.query.filter(
+        ChangeLog.created_at < datetime.utcnow() - timedelta(days=days)
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+
+def register_default_feeds():
+    """사업체, 카테고리, 내 리뷰, 내 알림 피드 등록"""
+    if _feeds:
+        return
+
+    from sqlalchemy.orm import configure_mappers, selectinload
+
+    from app.models import Business, Category, Notification, Review
+
+    # backref(Review.business 등)는 매퍼 구성 후에 생김
+    configure_mappers()
+
+    register_feed(SyncFeed(
+        name='businesses', entity_type='business', model=Business,
+        serialize=lambda business: business.to_dict(),
+        visible=lambda query: query.filter(Business.status == 'approved'),
+        ignore=('view_count',)
+    ))
+    register_feed(SyncFeed(
+        name='categories', entity_type='category', model=Category,
+        serialize=lambda category: category.to_dict(include_stats=True),
+        visible=lambda query: query.filter(Category.is_active == True)
+    ))
+    register_feed(SyncFeed(
+        name='reviews', entity_type='review', model=Review,
+        serialize=lambda review: review.to_dict(include_user=False, include_business=True),
+        options=(selectinload(Review.business),),
+        scope='user_id',
+        ignore=('helpful_count', 'report_count')
+    ))
+    register_feed(SyncFeed(
+        name='notifications', entity_type='notification', model=Notification,
+        serialize=lambda notification: notification.to_dict(),
+        scope='user_id'
+    ))
@@ -0,0 +1,50 @@
+from flask import current_app
+from app.services.entity_cache import entity_cache
+
+
+def parse_ids(raw_ids, limit=None):
+    """쉼표로 구분된 ID 문자열 파싱 (입력 순서 유지, 중복 제거)"""
+    if limit is None:
+        limit = current_app.config.get('BATCH_MAX_IDS', 100)
+
+    ids = []
+    seen = set()
+    for value in (raw_ids or '').split(','):
+        value = value.strip()
+        if value and value not in seen:
+            seen.add(value)
+            ids.append(value)
+
+    if len(ids) > limit:
+        raise ValueError(f'한 번에 최대 {limit}개까지 조회할 수 있습니다.')
+
+    return ids
+
+
+def fetch_by_ids(model, ids, options=None, predicate=None):
+    """단일 WHERE id IN (...) 쿼리로 조회 후 입력 순서대로 반환
+
+    엔티티 캐시 대상 모델은 캐시에 없는 ID만 DB에서 조회합니다.
+    predicate를 통과하지 못한 엔티티는 찾지 못한 것으로 처리합니다.
+
+    Returns:
+        (입력 순서대로 정렬된 엔티티 목록, 찾지 못한 ID 목록)
+    """
+    if not ids:
+        return [], []
+
+    if not options and entity_cache.handles(model):
+        found = entity_cache.get_many(model, ids)
+    else:
+        query = model.query
+        if options:
+            query = query.options(*options)
+        found = {entity.id: entity for entity in query.filter(model.id.in_(ids)).all()}
+
+    if predicate:
+        found = {entity_id: entity for entity_id, entity in found.items() if predicate(entity)}
+
+    entities = [found[entity_id] for entity_id in ids if entity_id in found]
+    missing = [entity_id for entity_id in ids if entity_id not in found]
+
+    return entities, missing
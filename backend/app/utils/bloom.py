@@ -0,0 +1,40 @@
+"""
+회전 블룸 필터 (Redis 비트맵)
+
+시간 창(window)마다 새 비트맵 키(세대)를 쓰고, 현재 세대와 직전 세대 중 하나에라도 있으면
+최근에 본 값으로 판단합니다. 따라서 같은 값은 최소 window, 최대 2 × window 동안 중복으로 걸러지고,
+오래된 세대는 만료로 사라지므로 메모리가 일정합니다 (세대당 size 비트).
+
+비트 위치 계산만 담당하며, 실제 확인/기록은 호출하는 쪽의 Lua 스크립트에서 원자적으로 합니다.
+"""
+
+import hashlib
+import math
+
+
+class RotatingBloomFilter:
+    """세대별 비트맵 키와 비트 위치 계산"""
+
+    def __init__(self, prefix, window, capacity, error_rate=0.001):
+        self.prefix = prefix
+        self.window = window
+        # 세대당 capacity개를 넣었을 때 오탐률이 error_rate가 되는 크기와 해시 수
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.size / capacity * math.log(2)), 1)
+
+    def keys(self, timestamp):
+        """(현재 세대 키, 직전 세대 키)"""
+        generation = int(timestamp // self.window)
+        return f'{self.prefix}:{generation}', f'{self.prefix}:{generation - 1}'
+
+    @property
+    def ttl(self):
+        """세대 키 보관 시간 (직전 세대로 쓰이는 동안 유지)"""
+        return self.window * 2
+
+    def offsets(self, member):
+        """값의 비트 위치 (double hashing)"""
+        digest = hashlib.blake2b(member.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
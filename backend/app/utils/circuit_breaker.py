@@ -0,0 +1,68 @@
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 호출하지 않음"""
+
+
+class CircuitBreaker:
+    """연속 실패 시 일정 시간 호출을 차단하는 회로 차단기 (프로세스별, 스레드 안전)
+
+    - closed: 정상 호출. 연속 failure_threshold번 실패하면 open
+    - open: reset_timeout 동안 호출하지 않고 CircuitOpenError
+    - half-open: reset_timeout이 지나면 한 번만 시험 호출, 성공하면 closed, 실패하면 다시 open
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return 'closed'
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        """지금 호출해도 되는지 (half-open에서는 한 스레드만 허용)"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def call(self, func, *args, **kwargs):
+        """func를 호출하고 결과에 따라 상태 갱신. 회로가 열려 있으면 CircuitOpenError"""
+        if not self.allow():
+            raise CircuitOpenError(self.name)
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
@@ -0,0 +1,70 @@
+"""
+조건부 GET (ETag / Last-Modified)
+
+응답을 직렬화하기 전에 updated_at, 캐시 네임스페이스 버전 등 응답을 결정하는 값만으로
+검증자를 만들고, If-None-Match / If-Modified-Since가 일치하면 관계 로딩과 직렬화 없이
+304를 반환합니다.
+
+    validators = Validators('business', business.id, business.updated_at,
+                            last_modified=business.updated_at)
+    if validators.matches():
+        return validators.not_modified()
+    ...
+    return validators.apply(jsonify(data)), 200
+"""
+
+import hashlib
+from datetime import datetime, timezone
+
+from flask import current_app, request
+
+
+def _utc(value):
+    """naive UTC datetime을 초 단위 aware datetime으로 변환"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+class Validators:
+    """응답 검증자 (약한 ETag + 선택적 Last-Modified)
+
+    요청 쿼리 문자열은 ETag에 자동으로 포함됩니다.
+    """
+
+    def __init__(self, *parts, last_modified=None):
+        raw = '|'.join(
+            part.isoformat() if isinstance(part, datetime) else str(part)
+            for part in (*parts, request.query_string.decode('utf-8', 'replace'))
+        )
+        self.etag = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+        if isinstance(last_modified, (list, tuple)):
+            last_modified = max((value for value in last_modified if value is not None), default=None)
+        self.last_modified = _utc(last_modified)
+
+    def matches(self):
+        """클라이언트가 가진 응답이 최신인지 여부 (GET/HEAD만)"""
+        if request.method not in ('GET', 'HEAD'):
+            return False
+
+        # If-None-Match가 있으면 If-Modified-Since는 무시 (RFC 9110)
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(self.etag)
+
+        if self.last_modified and request.if_modified_since:
+            return self.last_modified <= request.if_modified_since
+
+        return False
+
+    def not_modified(self):
+        """본문 없는 304 응답"""
+        return self.apply(current_app.response_class(status=304))
+
+    def apply(self, response):
+        """응답에 ETag / Last-Modified 헤더 설정"""
+        response.set_etag(self.etag, weak=True)
+        if self.last_modified:
+            response.last_modified = self.last_modified
+        return response
@@ -0,0 +1,94 @@
+"""
+IP 대역 → 국가/도시 조회 테이블
+
+로컬 CSV(시작 IP, 끝 IP, 국가 코드, 도시)를 읽어 시작 주소 순으로 정렬된 배열로 만들고
+이진 탐색(bisect)으로 조회합니다. 외부 서비스를 호출하지 않으며 조회는 O(log n)입니다.
+
+CSV 형식 (DB-IP / IP2Location LITE의 city CSV를 변환한 것, 헤더 없음):
+    1.0.0.0,1.0.0.255,AU,Brisbane
+    2001:200::,2001:200:ffff:ffff:ffff:ffff:ffff:ffff,JP,Tokyo
+"""
+
+import csv
+import gzip
+import ipaddress
+from array import array
+from bisect import bisect_right
+
+
+class _Ranges:
+    """한 주소 체계(IPv4/IPv6)의 정렬된 대역 목록"""
+
+    def __init__(self, typecode):
+        # IPv4는 정수 배열로 메모리를 줄이고, IPv6(128비트)는 파이썬 정수 리스트
+        self.starts = array(typecode) if typecode else []
+        self.ends = array(typecode) if typecode else []
+        self.locations = []  # 인덱스별 (country, city)
+
+    def add(self, start, end, location):
+        self.starts.append(start)
+        self.ends.append(end)
+        self.locations.append(location)
+
+    def sort(self):
+        order = sorted(range(len(self.starts)), key=self.starts.__getitem__)
+        for name in ('starts', 'ends'):
+            values = getattr(self, name)
+            sorted_values = [values[index] for index in order]
+            setattr(self, name, array(values.typecode, sorted_values) if isinstance(values, array) else sorted_values)
+        self.locations = [self.locations[index] for index in order]
+
+    def lookup(self, address):
+        index = bisect_right(self.starts, address) - 1
+        if index >= 0 and address <= self.ends[index]:
+            return self.locations[index]
+        return None
+
+
+class IPRangeTable:
+    """IP → (country, city)"""
+
+    def __init__(self):
+        self._ranges = {4: _Ranges('Q'), 6: _Ranges(None)}
+
+    def __len__(self):
+        return sum(len(ranges.starts) for ranges in self._ranges.values())
+
+    @classmethod
+    def load(cls, path):
+        """CSV(.csv 또는 .csv.gz)에서 테이블 생성"""
+        table = cls()
+        interned = {}  # 같은 (국가, 도시) 튜플 공유
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8', newline='') as f:
+            for row in csv.reader(f):
+                if len(row) < 3 or row[0].startswith('#'):
+                    continue
+                try:
+                    start = ipaddress.ip_address(row[0].strip())
+                    end = ipaddress.ip_address(row[1].strip())
+                except ValueError:
+                    continue  # 헤더 등
+                if start.version != end.version:
+                    continue
+
+                city = row[3].strip() if len(row) > 3 else ''
+                location = (row[2].strip() or None, city or None)
+                location = interned.setdefault(location, location)
+                table._ranges[start.version].add(int(start), int(end), location)
+
+        for ranges in table._ranges.values():
+            ranges.sort()
+        return table
+
+    def lookup(self, ip):
+        """(country, city). 형식이 잘못되었거나 대역에 없으면 (None, None)"""
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return None, None
+
+        # IPv4-mapped IPv6 (::ffff:1.2.3.4)
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        return self._ranges[address.version].lookup(int(address)) or (None, None)
@@ -0,0 +1,77 @@
+"""
+orjson 기반 JSON 응답 프로바이더
+
+- datetime/date/time, UUID, dataclass, numpy 타입을 orjson이 직접 직렬화
+  (naive datetime은 isoformat()과 같은 형식)
+- Decimal 등 orjson이 모르는 타입은 default()에서 변환
+- raw_json()으로 감싼 미리 인코딩된 JSON 바이트는 다시 파싱하지 않고 그대로 삽입
+- response()는 str로 디코딩하지 않고 bytes를 바로 응답 본문으로 사용
+"""
+
+import decimal
+
+import orjson
+from flask.json.provider import JSONProvider
+
+# orjson 3.9 미만에는 Fragment가 없으므로 파싱 후 재직렬화로 대체
+_Fragment = getattr(orjson, 'Fragment', None)
+
+
+def raw_json(data):
+    """미리 인코딩된 JSON(bytes/str)을 응답에 그대로 삽입하기 위한 래퍼"""
+    if _Fragment is not None:
+        return _Fragment(data)
+    return orjson.loads(data)
+
+
+def _default(obj):
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask 기본 JSON 프로바이더 대체 (app.json)"""
+
+    # orjson 기본 옵션 (numpy 배열/스칼라, 문자열이 아닌 dict 키 허용)
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    # 키 정렬은 비용이 커서 기본으로 끔 (Flask 기본값은 정렬)
+    sort_keys = False
+
+    # None이면 디버그 모드에서만 들여쓰기
+    compact = None
+
+    mimetype = 'application/json'
+
+    def _option(self, sort_keys=None, indent=False):
+        option = self.option
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps_bytes(self, obj, **kwargs):
+        return orjson.dumps(
+            obj, default=_default,
+            option=self._option(kwargs.get('sort_keys'), bool(kwargs.get('indent')))
+        )
+
+    def dumps(self, obj, **kwargs):
+        return self.dumps_bytes(obj, **kwargs).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=self._option(indent=indent)),
+            mimetype=self.mimetype
+        )
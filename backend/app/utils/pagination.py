@@ -0,0 +1,180 @@
+import hashlib
+import json
+import threading
+
+from flask import current_app, request
+from sqlalchemy import func, select, text
+
+from app import db
+from app.services.cache import tiered_cache
+from app.utils.batch import fetch_by_ids
+
+COUNT_MODES = ('exact', 'estimate', 'none')
+# 응답의 count 값에는 캐시된 정확한 개수를 뜻하는 'cached'도 있음 (최대 PAGINATION_COUNT_CACHE_TIMEOUT 전 값)
+
+# 필터별 정확한 개수 캐시 네임스페이스
+COUNT_CACHE_NAMESPACE = 'page_counts'
+
+
+class Page:
+    """paginate() 결과와 같은 속성을 제공하는 페이지 객체
+
+    total이 None이면(count=none) pages도 None이며, has_next는 per_page + 1개 조회로 판단합니다.
+    """
+
+    def __init__(self, items, page, per_page, total, has_next=None, count='exact'):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.count = count
+        self._has_next = has_next
+
+    @property
+    def pages(self):
+        if self.total is None:
+            return None
+        if not self.per_page or not self.total:
+            return 0
+        return (self.total + self.per_page - 1) // self.per_page
+
+    @property
+    def has_prev(self):
+        return self.page > 1
+
+    @property
+    def has_next(self):
+        if self._has_next is not None:
+            return self._has_next
+        return self.page < self.pages
+
+
+def get_count_mode():
+    """요청의 ?count=exact|estimate|none 값 (없거나 잘못된 값이면 설정 기본값)"""
+    mode = request.args.get('count', '').lower()
+    if mode in COUNT_MODES:
+        return mode
+    return current_app.config.get('PAGINATION_COUNT_MODE', 'exact')
+
+
+def paginate(query, page, per_page, count=None):
+    """LIMIT per_page + 1로 페이지를 조회하고 count 모드에 따라 전체 개수 계산"""
+    page = max(page, 1)
+    offset = (page - 1) * per_page
+
+    items = query.limit(per_page + 1).offset(offset).all()
+    has_next = len(items) > per_page
+    items = items[:per_page]
+
+    total, count = _count(query, count, offset, len(items), has_next)
+    return Page(items, page, per_page, total, has_next=has_next, count=count)
+
+
+def paginate_ids(query, model, page, per_page, options=None, count=None):
+    """2단계 페이지네이션 (ID 페이지 조회 → 엔티티 로드)
+
+    1. 필터/정렬이 적용된 query에서 기본 키만 LIMIT/OFFSET으로 조회
+    2. 해당 ID만 WHERE id IN (...)으로 로드하고 options(selectinload 등)로 관계를 일괄 로드
+
+    컬렉션 JOIN으로 행이 늘어나지 않으므로 LIMIT/COUNT가 정확하며,
+    쿼리 수는 페이지 크기와 관계없이 일정합니다.
+    query에는 eager load 옵션을 넣지 말고 options로 전달해야 합니다.
+    """
+    page = max(page, 1)
+    offset = (page - 1) * per_page
+
+    # 동일한 정렬 값이 페이지 경계에 걸려도 순서가 고정되도록 기본 키를 보조 정렬로 추가
+    ids = [
+        row[0] for row in
+        query.with_entities(model.id)
+        .order_by(model.id)
+        .limit(per_page + 1)
+        .offset(offset)
+        .all()
+    ]
+    has_next = len(ids) > per_page
+    ids = ids[:per_page]
+
+    items, _ = fetch_by_ids(model, ids, options=options)
+
+    total, count = _count(query, count, offset, len(ids), has_next)
+    return Page(items, page, per_page, total, has_next=has_next, count=count)
+
+
+def _count(query, mode, offset, page_size, has_next):
+    """전체 개수와 실제 사용된 count 모드 반환"""
+    mode = mode or get_count_mode()
+    if mode == 'none':
+        return None, mode
+
+    # 마지막 페이지면 COUNT 없이 정확한 개수를 알 수 있음
+    if not has_next and (page_size or not offset):
+        return offset + page_size, 'exact'
+
+    # 최소한 현재 페이지 다음 행까지는 존재 (범위를 벗어난 페이지는 알 수 없음)
+    floor = offset + page_size + (1 if has_next else 0) if page_size else 0
+    inner = query.enable_eagerloads(False).order_by(None).statement
+
+    if mode == 'estimate':
+        try:
+            # 실패해도 요청 트랜잭션은 계속 쓸 수 있게 세이브포인트 안에서 실행
+            with db.session.begin_nested():
+                estimate = _estimate_count(inner)
+        except Exception as e:
+            current_app.logger.warning(f"개수 추정 실패, 정확한 개수로 대체: {str(e)}")
+            estimate = None
+        if estimate is not None:
+            return max(estimate, floor), 'estimate'
+
+    total, cached = _cached_exact_count(inner)
+    return max(total, floor), 'cached' if cached else 'exact'
+
+
+def _cached_exact_count(inner):
+    """정규화된 필터(SQL + 파라미터)별 COUNT 캐시 (만료 임박 시 백그라운드 갱신)
+
+    (개수, 캐시된 값인지) 반환
+    """
+    stmt = select(func.count()).select_from(inner.subquery())
+    compiled = stmt.compile(dialect=db.engine.dialect)
+    key = hashlib.sha1(
+        f'{compiled.string}|{sorted(compiled.params.items())!r}'.encode('utf-8')
+    ).hexdigest()
+
+    computed_by = set()
+
+    def compute():
+        computed_by.add(threading.get_ident())
+        return db.session.execute(stmt).scalar() or 0
+
+    total = tiered_cache.get_or_compute(
+        COUNT_CACHE_NAMESPACE, key, compute,
+        timeout=current_app.config.get('PAGINATION_COUNT_CACHE_TIMEOUT', 600),
+        soft_timeout=current_app.config.get('PAGINATION_COUNT_SOFT_TIMEOUT', 30)
+    )
+    # 백그라운드 갱신 스레드가 계산한 경우는 이번 요청이 받은 값과 무관
+    return total, threading.get_ident() not in computed_by
+
+
+def _estimate_count(inner):
+    """플래너 통계 기반 개수 추정
+
+    필터가 없는 단일 테이블은 pg_class.reltuples, 그 외에는 EXPLAIN의 예상 행 수를 사용합니다.
+    """
+    froms = inner.get_final_froms()
+    if inner.whereclause is None and len(froms) == 1 and hasattr(froms[0], 'fullname'):
+        reltuples = db.session.execute(
+            text('SELECT reltuples FROM pg_class WHERE oid = to_regclass(:name)'),
+            {'name': froms[0].fullname}
+        ).scalar()
+        # ANALYZE 전이면 -1(또는 0)이므로 EXPLAIN으로 대체
+        if reltuples is not None and reltuples > 0:
+            return int(reltuples)
+
+    # in_() 등의 확장 파라미터(POSTCOMPILE)를 실제 자리표시자로 펼침
+    compiled = inner.compile(dialect=db.engine.dialect, compile_kwargs={'render_postcompile': True})
+    row = db.session.connection().exec_driver_sql(
+        f'EXPLAIN (FORMAT JSON) {compiled.string}', compiled.params
+    ).scalar()
+    plan = json.loads(row) if isinstance(row, str) else row
+    return int(plan[0]['Plan']['Plan Rows'])
@@ -0,0 +1,73 @@
+"""
+User-Agent 문자열에서 기기 종류, 브라우저, 운영체제 추출 및 봇 판별
+
+통계 집계용으로 이름만 구분하며 버전은 보지 않습니다. 국내 인앱 브라우저(네이버, 카카오톡,
+삼성 인터넷, 웨일)는 Chrome/Safari 토큰을 함께 보내므로 먼저 확인합니다.
+"""
+
+import re
+
+# (이름, 패턴) - 앞에서부터 처음 일치하는 항목 사용
+BROWSERS = (
+    ('NAVER', re.compile(r'NAVER\(inapp')),
+    ('KakaoTalk', re.compile(r'KAKAOTALK', re.I)),
+    ('Samsung Internet', re.compile(r'SamsungBrowser/')),
+    ('Whale', re.compile(r'Whale/')),
+    ('Edge', re.compile(r'Edg(e|A|iOS)?/')),
+    ('Opera', re.compile(r'OPR/|Opera')),
+    ('Firefox', re.compile(r'Firefox/|FxiOS/')),
+    ('Chrome', re.compile(r'Chrome/|CriOS/')),
+    ('Safari', re.compile(r'Version/[\d.]+.*Safari/')),
+    ('Internet Explorer', re.compile(r'MSIE |Trident/')),
+)
+
+OPERATING_SYSTEMS = (
+    ('iOS', re.compile(r'iPhone|iPad|iPod')),
+    ('Android', re.compile(r'Android')),
+    ('Windows', re.compile(r'Windows')),
+    ('macOS', re.compile(r'Macintosh|Mac OS X')),
+    ('ChromeOS', re.compile(r'CrOS')),
+    ('Linux', re.compile(r'Linux')),
+)
+
+# 검색/SNS 크롤러, 링크 미리보기, 모니터링, HTTP 라이브러리, 헤드리스 브라우저
+BOTS = re.compile(
+    r'bot\b|bot/|crawl|spider|slurp|scrap|fetch|preview|monitor|archiver|'
+    r'Yeti|Daumoa|facebookexternalhit|Google-InspectionTool|Mediapartners|'
+    r'HeadlessChrome|PhantomJS|Lighthouse|'
+    r'^(curl|Wget|python-requests|python-urllib|aiohttp|Go-http-client|okhttp|Java|axios|node-fetch|libwww-perl)',
+    re.I
+)
+
+TABLET = re.compile(r'iPad|Tablet|Android(?!.*Mobile)|Silk/|Kindle')
+MOBILE = re.compile(r'Mobi|iPhone|iPod|Android.*Mobile|Windows Phone')
+
+
+def _match(patterns, user_agent):
+    for name, pattern in patterns:
+        if pattern.search(user_agent):
+            return name
+    return 'other'
+
+
+def is_bot(user_agent):
+    """알려진 봇 User-Agent인지 (User-Agent가 없는 요청도 봇으로 봄)"""
+    return not user_agent or BOTS.search(user_agent) is not None
+
+
+def parse_user_agent(user_agent):
+    """(device_type, browser, os). 빈 값이면 모두 None
+
+    device_type: mobile, tablet, desktop
+    """
+    if not user_agent:
+        return None, None, None
+
+    if TABLET.search(user_agent):
+        device_type = 'tablet'
+    elif MOBILE.search(user_agent):
+        device_type = 'mobile'
+    else:
+        device_type = 'desktop'
+
+    return device_type, _match(BROWSERS, user_agent), _match(OPERATING_SYSTEMS, user_agent)
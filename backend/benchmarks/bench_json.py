@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+JSON 응답 직렬화 벤치마크: Flask 기본 프로바이더(json) vs OrjsonProvider
+
+사업체 목록/리뷰 목록과 같은 형태의 페이로드를 만들어 응답 객체 생성까지의
+평균 시간을 비교합니다. 데이터베이스는 필요하지 않습니다.
+
+    python benchmarks/bench_json.py --items 50 --iterations 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.utils.json_provider import OrjsonProvider, raw_json
+
+
+def make_business(index, now):
+    return {
+        'id': str(uuid.uuid4()),
+        'name': f'반려동물 카페 {index}',
+        'description': '강아지와 함께 갈 수 있는 넓은 카페입니다. ' * 4,
+        'category': 'restaurant',
+        'phone': '02-1234-5678',
+        'website': 'https://example.com',
+        'address': '서울특별시 강남구 테헤란로 123',
+        'address_detail': f'{index}층',
+        'latitude': 37.5 + index / 1000,
+        'longitude': 127.0 + index / 1000,
+        'business_hours': {day: '09:00-21:00' for day in ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')},
+        'holiday_info': '연중무휴',
+        'parking_available': True,
+        'wifi_available': True,
+        'outdoor_seating': False,
+        'pet_allowed_types': ['dog', 'cat'],
+        'pet_size_limit': 'all',
+        'pet_fee': 5000,
+        'pet_facilities': ['water_bowl', 'treats', 'playground'],
+        'pet_rules': '목줄 필수',
+        'main_image': f'/uploads/{index}.jpg',
+        'gallery_images': [f'/uploads/{index}-{n}.jpg' for n in range(5)],
+        'status': 'approved',
+        'is_premium': False,
+        'is_featured': index % 5 == 0,
+        'view_count': index * 17,
+        'favorite_count': index * 3,
+        'review_count': index,
+        'average_rating': 4.5,
+        'created_at': now - timedelta(days=index),
+        'updated_at': now,
+    }
+
+
+def make_review(index, now):
+    return {
+        'id': str(uuid.uuid4()),
+        'rating': index % 5 + 1,
+        'title': '다시 방문하고 싶어요',
+        'content': '직원분들이 친절하고 반려견 전용 공간이 잘 되어 있습니다. ' * 6,
+        'images': [f'/uploads/review-{index}-{n}.jpg' for n in range(3)],
+        'pet_type': 'dog',
+        'pet_size': 'medium',
+        'visited_with_pet': True,
+        'cleanliness_rating': 5,
+        'service_rating': 4,
+        'facilities_rating': 4,
+        'pet_friendliness_rating': 5,
+        'tags': ['좋은음식', '친절한직원', '넓은공간'],
+        'visit_purpose': '식사',
+        'status': 'approved',
+        'is_verified': True,
+        'helpful_count': index,
+        'created_at': now - timedelta(hours=index),
+        'updated_at': now,
+        'visit_date': (now - timedelta(days=index)).date(),
+        'author': {
+            'id': str(uuid.uuid4()),
+            'name': f'사용자{index}',
+            'nickname': f'멍멍이{index}',
+            'profile_image': None
+        }
+    }
+
+
+def isoformatted(items):
+    """기존 to_dict()처럼 날짜를 미리 문자열로 바꾼 페이로드"""
+    return [
+        {key: value.isoformat() if hasattr(value, 'isoformat') else value for key, value in item.items()}
+        for item in items
+    ]
+
+
+def envelope(key, items):
+    return {
+        'success': True,
+        'data': {
+            key: items,
+            'pagination': {'page': 1, 'per_page': len(items), 'total': 1284, 'pages': 26,
+                           'has_next': True, 'has_prev': False}
+        }
+    }
+
+
+def measure(app, provider, payload, iterations):
+    with app.app_context():
+        provider.response(payload)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            provider.response(payload)
+        return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, default=50, help='목록 항목 수')
+    parser.add_argument('--iterations', type=int, default=2000, help='반복 횟수')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+    orjson_provider = OrjsonProvider(app)
+
+    now = datetime.utcnow()
+    businesses = [make_business(index, now) for index in range(args.items)]
+    reviews = [make_review(index, now) for index in range(args.items)]
+    encoded_businesses = [orjson_provider.dumps_bytes(business) for business in businesses]
+
+    cases = [
+        ('businesses', [
+            ('json (isoformat)', default_provider, envelope('businesses', isoformatted(businesses))),
+            ('orjson (isoformat)', orjson_provider, envelope('businesses', isoformatted(businesses))),
+            ('orjson (datetime)', orjson_provider, envelope('businesses', businesses)),
+            ('orjson (fragment)', orjson_provider,
+             envelope('businesses', [raw_json(raw) for raw in encoded_businesses])),
+        ]),
+        ('reviews', [
+            ('json (isoformat)', default_provider, envelope('reviews', isoformatted(reviews))),
+            ('orjson (isoformat)', orjson_provider, envelope('reviews', isoformatted(reviews))),
+            ('orjson (datetime)', orjson_provider, envelope('reviews', reviews)),
+        ]),
+    ]
+
+    print(f"{'페이로드':<12} {'방식':<20} {'µs/응답':>10} {'배율':>8}")
+    for name, variants in cases:
+        baseline = None
+        for label, provider, payload in variants:
+            elapsed = measure(app, provider, payload, args.iterations)
+            baseline = baseline or elapsed
+            print(f"{name:<12} {label:<20} {elapsed:>10.1f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
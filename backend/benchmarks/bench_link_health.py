@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+제휴 링크 상태 점검 벤치마크
+
+127.0.0.1~127.0.0.N에 가짜 쇼핑몰 서버를 띄우고 LinkHealthChecker의 HealthClient로 URL을
+동시에 점검합니다. 경로별로 기대하는 결과와 비교하고 처리량(URL/초)을 출력합니다.
+데이터베이스는 필요하지 않습니다.
+
+    /ok/<n>        200
+    /gone/<n>      404 (failed)
+    /redirect/<n>  302 → /ok/<n>
+    /loop/<n>      자기 자신으로 302 (failed, 리다이렉트 반복)
+    /nohead/<n>    HEAD는 405, GET은 200
+    /flaky/<n>     처음에는 503 + Retry-After: 1, 다음부터 200
+    /slow/<n>      요청 타임아웃보다 늦게 응답 (unreachable)
+
+    python benchmarks/bench_link_health.py --urls 20000 --hosts 8
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.link_health import FAILED, OK, UNREACHABLE, LinkHealthChecker
+
+# 경로 → (비율, 기대 결과)
+PATHS = {
+    'ok': (0.80, OK),
+    'gone': (0.05, FAILED),
+    'redirect': (0.05, OK),
+    'loop': (0.01, FAILED),
+    'nohead': (0.04, OK),
+    'flaky': (0.005, OK),
+    'slow': (0.002, UNREACHABLE),
+}
+
+
+def start_servers(hosts, slow_delay):
+    """가짜 쇼핑몰 서버 목록 [(주소, 서버)]"""
+    flaky_seen = set()
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_HEAD(self):
+            self.handle_request(head=True)
+
+        def do_GET(self):
+            self.handle_request(head=False)
+
+        def handle_request(self, head):
+            kind = self.path.strip('/').split('/')[0]
+            if kind == 'ok':
+                return self.reply(200)
+            if kind == 'gone':
+                return self.reply(404)
+            if kind == 'redirect':
+                return self.reply(302, {'Location': self.path.replace('/redirect/', '/ok/')})
+            if kind == 'loop':
+                return self.reply(302, {'Location': self.path})
+            if kind == 'nohead':
+                return self.reply(405 if head else 200)
+            if kind == 'flaky':
+                with lock:
+                    first = self.path not in flaky_seen
+                    flaky_seen.add(self.path)
+                return self.reply(503, {'Retry-After': '1'}) if first else self.reply(200)
+            if kind == 'slow':
+                time.sleep(slow_delay)
+                return self.reply(200)
+            self.reply(404)
+
+        def reply(self, status, headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    servers = []
+    for index in range(hosts):
+        server = ThreadingHTTPServer((f'127.0.0.{index + 1}', 0), Handler)
+        server.daemon_threads = True
+        server.request_queue_size = 256
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append((f'http://127.0.0.{index + 1}:{server.server_port}', server))
+    return servers
+
+
+def make_urls(bases, count):
+    kinds = random.choices(list(PATHS), weights=[weight for weight, _ in PATHS.values()], k=count)
+    return [(f'{random.choice(bases)}/{kind}/{index}', PATHS[kind][1]) for index, kind in enumerate(kinds)]
+
+
+async def check_all(checker, urls):
+    async with checker.client() as client:
+        return await asyncio.gather(*(client.check(url) for url, _ in urls))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--urls', type=int, default=5000)
+    parser.add_argument('--hosts', type=int, default=8)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--per-host', type=int, default=16)
+    parser.add_argument('--timeout', type=float, default=2.0)
+    args = parser.parse_args()
+
+    random.seed(42)
+    servers = start_servers(args.hosts, slow_delay=args.timeout * 2)
+    urls = make_urls([base for base, _ in servers], args.urls)
+
+    checker = LinkHealthChecker()
+    checker.concurrency = args.concurrency
+    checker.per_host = args.per_host
+    checker.timeout = args.timeout
+    checker.retries = 1
+    checker.backoff = 0.2
+
+    started = time.perf_counter()
+    results = asyncio.run(check_all(checker, urls))
+    elapsed = time.perf_counter() - started
+
+    kinds = Counter(kind for kind, _, _ in results)
+    mismatches = [(url, expected, result) for (url, expected), result in zip(urls, results) if result[0] != expected]
+    print(f"URL {len(urls)}개, 호스트 {args.hosts}개, 동시 {args.concurrency} (호스트별 {args.per_host})")
+    print(f"{elapsed:.1f}초, {len(urls) / elapsed:.0f} URL/초, 결과 {dict(kinds)}")
+    print(f"기대와 다른 결과 {len(mismatches)}건")
+    for url, expected, result in mismatches[:10]:
+        print(f"  {url}: 기대 {expected}, 결과 {result}")
+
+    for _, server in servers:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
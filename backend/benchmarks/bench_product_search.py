@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+제휴 상품 검색 벤치마크: 제휴사 API 순차 호출 vs 동시 호출(마감 시간)
+
+로컬에 쿠팡 파트너스/네이버 쇼핑 검색 API를 흉내 내는 서버를 띄우고, 어댑터를 순서대로
+호출할 때와 ProductSearch가 스레드 풀로 동시에 호출할 때의 응답 시간을 비교합니다.
+--slow-partner로 한 제휴사를 마감 시간보다 느리게 만들면 부분 결과로 응답하는지 확인할 수 있습니다.
+데이터베이스와 Redis는 필요하지 않습니다.
+
+    python benchmarks/bench_product_search.py --delay 0.3 --iterations 20
+    python benchmarks/bench_product_search.py --slow-partner naver_shopping --deadline 1.0
+
+--serve는 가짜 API 서버만 띄워 둡니다. COUPANG_API_BASE_URL, NAVER_SHOPPING_API_BASE_URL을 이 주소로
+지정하면(키/시크릿은 아무 값) 상품 검색과 `flask links refresh-prices`를 로컬에서 확인할 수 있습니다.
+--vary-prices를 주면 가격이 분마다 바뀌고, 상품 ID 끝자리가 0인 상품은 검색 결과에서 빠집니다.
+
+    python benchmarks/bench_product_search.py --serve --port 8089 --vary-prices
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from app.services.partners import CoupangAdapter, PartnerError, partners
+from app.services.product_search import ProductSearch
+
+
+def price(base, vary):
+    return base + (int(time.time()) // 60 % 3) * 100 if vary else base
+
+
+def listed(product_id, vary):
+    return not vary or product_id % 10 != 0
+
+
+def coupang_body(query, limit, vary=False):
+    return {
+        'rCode': '0',
+        'rMessage': '',
+        'data': {
+            'landingUrl': 'https://link.coupang.com/a/search',
+            'productData': [
+                {
+                    'productId': 1000000 + index,
+                    'productName': f'{query} 쿠팡 상품 {index + 1}',
+                    'productPrice': price(29900 + index * 1000, vary),
+                    'productImage': f'https://thumbnail.coupangcdn.com/{index}.jpg',
+                    'productUrl': f'https://link.coupang.com/re/AFFSDP?pageKey={1000000 + index}',
+                    'categoryName': '반려동물용품',
+                }
+                for index in range(limit)
+                if listed(1000000 + index, vary)
+            ]
+        }
+    }
+
+
+def naver_body(query, limit, vary=False):
+    return {
+        'total': limit,
+        'items': [
+            {
+                'productId': str(2000000 + index),
+                'title': f'<b>{query}</b> 네이버 상품 {index + 1}',
+                'link': f'https://search.shopping.naver.com/catalog/{2000000 + index}',
+                'image': f'https://shopping-phinf.pstatic.net/{index}.jpg',
+                'lprice': str(price(25900 + index * 500, vary)),
+                'category1': '생활/건강',
+                'category2': '반려동물',
+            }
+            for index in range(limit)
+            if listed(2000000 + index, vary)
+        ]
+    }
+
+
+def start_server(delays, port=0, vary_prices=False):
+    """(연결 주소, 서버). delays: 제휴사별 응답 지연 (초)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            if url.path == CoupangAdapter.path:
+                if not self.headers.get('Authorization', '').startswith('CEA algorithm=HmacSHA256'):
+                    return self.reply(401, {'rCode': '401', 'rMessage': 'unauthorized'})
+                time.sleep(delays['coupang'])
+                return self.reply(200, coupang_body(params.get('keyword', ''), int(params.get('limit', 10)), vary_prices))
+            if url.path == '/v1/search/shop.json':
+                time.sleep(delays['naver_shopping'])
+                return self.reply(200, naver_body(params.get('query', ''), int(params.get('display', 10)), vary_prices))
+            self.reply(404, {})
+
+        def reply(self, status, body):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}', server
+
+
+def sequential(query, limit):
+    products = []
+    failed = []
+    for adapter in partners.adapters.values():
+        try:
+            products.extend(adapter.search(query, limit))
+        except PartnerError:
+            failed.append(adapter.name)
+    return products, failed
+
+
+def timed(func, iterations):
+    func()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        result = func()
+    return (time.perf_counter() - started) / iterations * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--delay', type=float, default=0.3, help='제휴사 응답 지연 (초)')
+    parser.add_argument('--slow-partner', choices=['coupang', 'naver_shopping'], help='마감 시간보다 느린 제휴사')
+    parser.add_argument('--deadline', type=float, default=1.0, help='동시 호출 마감 시간 (초)')
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--serve', action='store_true', help='가짜 API 서버만 실행')
+    parser.add_argument('--port', type=int, default=0, help='--serve 포트')
+    parser.add_argument('--vary-prices', action='store_true', help='가격 변동과 검색 결과 누락 흉내')
+    args = parser.parse_args()
+
+    delays = {'coupang': args.delay, 'naver_shopping': args.delay}
+    if args.slow_partner:
+        delays[args.slow_partner] = args.deadline * 2
+    base_url, server = start_server(delays, args.port, args.vary_prices)
+    if args.serve:
+        print(f"가짜 제휴사 API: {base_url} (Ctrl+C로 종료)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+
+    app = Flask(__name__)
+    app.config.update(
+        COUPANG_PARTNER_ID='bench', COUPANG_PARTNER_SECRET='bench', COUPANG_API_BASE_URL=base_url,
+        NAVER_SHOPPING_CLIENT_ID='bench', NAVER_SHOPPING_CLIENT_SECRET='bench', NAVER_SHOPPING_API_BASE_URL=base_url,
+        PARTNER_API_TIMEOUTS={name: (1.0, args.deadline * 3) for name in delays},
+        PRODUCT_SEARCH_DEADLINE=args.deadline,
+    )
+    search = ProductSearch()
+    search.init_app(app)
+    names = list(partners.adapters)
+
+    print(f"제휴사 지연: {delays}, 마감 시간 {args.deadline}s, limit={args.limit}")
+    results = [
+        ('순차 호출', timed(lambda: sequential('강아지 사료', args.limit), args.iterations)),
+        ('동시 호출', timed(lambda: search._fetch('강아지 사료', names, args.limit), args.iterations)),
+    ]
+    for label, (elapsed, (products, failed)) in results:
+        print(f"{label:8} {elapsed:9.1f} ms/검색  상품 {len(products):3d}건  실패 {failed or '-'}")
+
+    search.executor.shutdown(wait=False, cancel_futures=True)
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
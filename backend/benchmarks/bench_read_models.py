@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+목록 조회 경로 벤치마크: ORM 인스턴스 + to_dict() vs Core 컬럼 조회 + 슬롯 읽기 모델
+
+설정된 DATABASE_URL의 데이터로 사업체/리뷰/블로그 목록을 같은 조건으로 조회·직렬화하며
+요청당 평균 시간과 tracemalloc 최대 메모리를 비교합니다.
+
+    python benchmarks/bench_read_models.py --limit 50 --iterations 200
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import desc
+from sqlalchemy.orm import selectinload
+
+from app import create_app, db
+from app.models.blog_post import BlogPost
+from app.models.business import Business
+from app.models.review import Review
+from app.read_models import BlogPostSummary, BusinessSummary, ReviewSummary
+
+
+def orm_businesses(limit):
+    query = Business.query.filter_by(status='approved').order_by(Business.average_rating.desc())
+    return [business.to_dict() for business in query.limit(limit).all()]
+
+
+def dto_businesses(limit):
+    query = Business.query.filter_by(status='approved').order_by(Business.average_rating.desc())
+    rows = BusinessSummary.select_from(query).limit(limit).all()
+    return [business.to_dict() for business in BusinessSummary.from_rows(rows)]
+
+
+def orm_reviews(limit):
+    query = Review.query.options(selectinload(Review.author)).order_by(desc(Review.created_at))
+    return [review.to_dict() for review in query.limit(limit).all()]
+
+
+def dto_reviews(limit):
+    query = Review.query.order_by(desc(Review.created_at))
+    rows = ReviewSummary.select_from(query).limit(limit).all()
+    return [review.to_dict() for review in ReviewSummary.from_rows(rows)]
+
+
+def orm_blog_posts(limit):
+    query = BlogPost.query.options(selectinload(BlogPost.author)).order_by(desc(BlogPost.created_at))
+    return [
+        {
+            'id': post.id,
+            'title': post.title,
+            'slug': post.slug,
+            'excerpt': post.excerpt,
+            'category': post.category,
+            'featured_image': post.featured_image,
+            'status': post.status,
+            'view_count': post.view_count,
+            'like_count': post.like_count,
+            'created_at': post.created_at.isoformat() if post.created_at else None,
+            'updated_at': post.updated_at.isoformat() if post.updated_at else None,
+            'author': {
+                'id': post.author.id,
+                'name': post.author.name,
+                'email': post.author.email
+            } if post.author else None,
+            'tags': post.tags or []
+        }
+        for post in query.limit(limit).all()
+    ]
+
+
+def dto_blog_posts(limit):
+    query = BlogPost.query.order_by(desc(BlogPost.created_at))
+    rows = BlogPostSummary.select_from(query).limit(limit).all()
+    return [post.to_dict() for post in BlogPostSummary.from_rows(rows)]
+
+
+CASES = [
+    ('businesses', orm_businesses, dto_businesses),
+    ('reviews', orm_reviews, dto_reviews),
+    ('blog_posts', orm_blog_posts, dto_blog_posts),
+]
+
+
+def measure(func, limit, iterations):
+    """요청당 평균 시간(ms)과 최대 할당 메모리(KiB)"""
+    # 커넥션/컴파일 캐시 예열
+    func(limit)
+    db.session.remove()
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func(limit)
+        db.session.remove()
+    elapsed = (time.perf_counter() - started) / iterations * 1000
+
+    tracemalloc.start()
+    rows = len(func(limit))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.session.remove()
+
+    return elapsed, peak / 1024, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--limit', type=int, default=50, help='요청당 행 수')
+    parser.add_argument('--iterations', type=int, default=200, help='반복 횟수')
+    parser.add_argument('--config', default=os.environ.get('FLASK_ENV', 'development'))
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    with app.app_context():
+        print(f"{'목록':<12} {'경로':<6} {'행':>5} {'ms/요청':>10} {'최대 KiB':>10}")
+        for name, orm_func, dto_func in CASES:
+            results = {}
+            for label, func in (('orm', orm_func), ('dto', dto_func)):
+                elapsed, peak, rows = measure(func, args.limit, args.iterations)
+                results[label] = (elapsed, peak)
+                print(f"{name:<12} {label:<6} {rows:>5} {elapsed:>10.3f} {peak:>10.1f}")
+
+            orm_ms, orm_peak = results['orm']
+            dto_ms, dto_peak = results['dto']
+            if dto_ms and dto_peak:
+                print(f"{'':<12} {'배율':<6} {'':>5} {orm_ms / dto_ms:>9.2f}x {orm_peak / dto_peak:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
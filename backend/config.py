@@ -45,11 +45,66 @@ class Config:
     # Redis Configuration (for caching and sessions)
     REDIS_URL = os.environ.get('REDIS_URL') or 'redis://localhost:6379/0'
     
+    # 2단계 공유 캐시 (프로세스 내 LRU + Redis, pub/sub 무효화)
+    TIERED_CACHE_ENABLED = os.environ.get('TIERED_CACHE_ENABLED', 'True').lower() == 'true'
+    TIERED_CACHE_TIMEOUT = 300  # Redis 기본 TTL (초)
+    CACHE_L1_SIZE = int(os.environ.get('CACHE_L1_SIZE') or 4096)  # 프로세스당 항목 수
+    CACHE_L1_TTL = 300  # 무효화 메시지 유실 대비 L1 최대 보관 시간 (초)
+    CACHE_COMPUTE_LOCK_TIMEOUT = 30  # 캐시 재계산 락 유지 시간 (초)
+    CACHE_COMPUTE_WAIT_TIMEOUT = 5  # 다른 워커의 계산 결과 대기 시간 (초)
+    
+    # 목록 캐시 (추천 사업체, 카테고리별 개수)
+    LIST_CACHE_TIMEOUT = 600  # Redis TTL (초)
+    LIST_CACHE_SOFT_TIMEOUT = 60  # 이 시간이 지나면 기존 값을 반환하며 백그라운드 갱신 (초)
+    
+    # 엔티티 캐시 (Business, User 기본 키 조회)
+    ENTITY_CACHE_ENABLED = os.environ.get('ENTITY_CACHE_ENABLED', 'True').lower() == 'true'
+    ENTITY_CACHE_TIMEOUT = 300  # Redis TTL (초)
+    
+    # 목록 항목 JSON 프래그먼트 캐시 (키에 updated_at 포함)
+    FRAGMENT_CACHE_ENABLED = os.environ.get('FRAGMENT_CACHE_ENABLED', 'True').lower() == 'true'
+    FRAGMENT_CACHE_TIMEOUT = 600  # Redis TTL (초), updated_at을 바꾸지 않는 카운터의 최대 지연
+    
+    # nginx 프록시 캐시 (익명 공개 GET, Surrogate-Key 퍼지)
+    EDGE_CACHE_ENABLED = os.environ.get('EDGE_CACHE_ENABLED', 'False').lower() == 'true'
+    EDGE_CACHE_TTL = 300  # nginx 보관 시간 (X-Accel-Expires, 초)
+    EDGE_CACHE_BROWSER_MAX_AGE = 0  # 브라우저는 매번 ETag로 재검증
+    NGINX_CACHE_PATH = os.environ.get('NGINX_CACHE_PATH') or '/var/cache/nginx/api'  # nginx와 공유하는 볼륨
+    NGINX_CACHE_LEVELS = '1:2'  # nginx.conf proxy_cache_path levels와 동일해야 함
+    
+    # 홈 피드 (미리 계산된 비개인화 섹션)
+    HOME_FEED_TIMEOUT = 3600  # Redis TTL (초)
+    HOME_FEED_SOFT_TIMEOUT = 300  # 이후 요청은 기존 문서를 반환하며 백그라운드 갱신 (초)
+    HOME_FEATURED_BUSINESSES = 10
+    HOME_FEATURED_POSTS = 5
+    HOME_TRENDING_TAGS = 10
+    HOME_NEARBY_LIMIT = 10
+    
+    # 정적 스냅샷 (nginx가 공유 볼륨에서 직접 서빙하는 공개 JSON/사이트맵)
+    SNAPSHOTS_ENABLED = os.environ.get('SNAPSHOTS_ENABLED', 'False').lower() == 'true'
+    SNAPSHOT_PATH = os.environ.get('SNAPSHOT_PATH') or '/var/www/snapshots'  # nginx와 공유하는 볼륨
+    SNAPSHOT_URL_PREFIX = '/snapshots'  # nginx.conf location과 동일해야 함
+    SNAPSHOT_KEEP_VERSIONS = 3  # 이전 매니페스트를 받은 클라이언트를 위해 남겨둘 버전 수
+    SNAPSHOT_DEBOUNCE = 2  # 변경 커밋 후 모아서 발행하기까지 대기 시간 (초)
+    SNAPSHOT_TAG_CLOUD_SIZE = 50
+    SITE_URL = os.environ.get('SITE_URL') or 'https://xn--2q1b33lznbu5v.xn--h32bi4v.xn--3e0b707e'  # 사이트맵 URL
+    
     # Pagination
     POSTS_PER_PAGE = 20
     BUSINESSES_PER_PAGE = 20
+    PAGINATION_COUNT_MODE = os.environ.get('PAGINATION_COUNT_MODE', 'exact')  # exact | estimate | none
+    PAGINATION_COUNT_CACHE_TIMEOUT = 600  # 필터별 정확한 개수 캐시 TTL (초)
+    PAGINATION_COUNT_SOFT_TIMEOUT = 30  # 이후 요청은 기존 값을 반환하며 백그라운드 갱신 (초)
     REVIEWS_PER_PAGE = 10
     
+    # 다건 조회 (?ids=...) 최대 ID 수
+    BATCH_MAX_IDS = 100
+    
+    # 델타 동기화 (/api/sync)
+    SYNC_PAGE_SIZE = 500
+    SYNC_MAX_PAGE_SIZE = 1000
+    SYNC_CHANGE_LOG_RETENTION_DAYS = 30  # 이보다 오래된 토큰은 전체 동기화(reset)
+    
     # API Rate Limiting
     RATELIMIT_STORAGE_URL = REDIS_URL
     RATELIMIT_DEFAULT = "100 per hour"
@@ -66,11 +121,70 @@ class Config:
     GOOGLE_MAPS_API_KEY = os.environ.get('GOOGLE_MAPS_API_KEY')
     GOOGLE_PLACES_API_KEY = os.environ.get('GOOGLE_PLACES_API_KEY')
     
+    # 제휴 링크 클릭 로그 (Redis 스트림 버퍼 → flask clicks worker가 일괄 반영)
+    AFFILIATE_CLICK_STREAM = 'affiliate:clicks'
+    AFFILIATE_CLICK_GROUP = 'click-flusher'
+    AFFILIATE_CLICK_SPOOL_PATH = os.environ.get('AFFILIATE_CLICK_SPOOL_PATH') or '/var/spool/petplace/clicks'  # Redis 장애 시 기록
+    AFFILIATE_CLICK_BATCH_SIZE = 500  # 한 번에 INSERT할 클릭 수
+    AFFILIATE_CLICK_FLUSH_INTERVAL = 1  # 스트림 대기 시간 (초)
+    AFFILIATE_CLICK_CLAIM_IDLE = 60  # 이 시간 동안 ACK되지 않은 엔트리는 다른 워커가 가져감 (초)
+    AFFILIATE_CLICK_MAX_DELIVERIES = 5  # 이 횟수를 넘게 반영에 실패한 엔트리는 실패 스트림으로, 스풀 세그먼트는 .failed로
+    AFFILIATE_CLICK_DEAD_STREAM = None  # 실패 스트림 (기본 '{AFFILIATE_CLICK_STREAM}:dead')
+    AFFILIATE_CLICK_DEAD_MAXLEN = 100000  # 실패 스트림 최대 길이 (근사)
+    AFFILIATE_RESOLVER_RELOAD_INTERVAL = 600  # 리다이렉트 테이블 전체 재적재 주기 (변경 알림 유실 대비, 초)
+    AFFILIATE_RESOLVER_MISS_TTL = 60  # 없는 링크 ID/코드를 기억하는 시간 (초)
+    AFFILIATE_CLICK_DEDUPE_WINDOW = 1800  # 같은 (링크, IP, User-Agent) 반복 클릭을 거르는 시간 창 (초, 실제 30~60분)
+    AFFILIATE_CLICK_DEDUPE_CAPACITY = 1000000  # 창 하나에 들어오는 예상 클릭 수 (블룸 필터 크기, 약 1.8MB/세대)
+    AFFILIATE_CLICK_DEDUPE_ERROR_RATE = 0.001  # 처음 클릭을 반복으로 잘못 거를 확률
+    AFFILIATE_CLICK_ENRICH_WORKERS = int(os.environ.get('AFFILIATE_CLICK_ENRICH_WORKERS', 2))  # 부가 정보 프로세스 풀 크기 (0이면 워커에서 직접)
+    AFFILIATE_CLICK_UA_CACHE_SIZE = 10000  # 파싱한 User-Agent LRU 캐시 크기
+    AFFILIATE_CLICK_IP_CACHE_SIZE = 100000  # 조회한 IP 위치 LRU 캐시 크기
+    GEOIP_RANGES_PATH = os.environ.get('GEOIP_RANGES_PATH')  # IP 대역 → 국가/도시 CSV (app/utils/ip_ranges.py)
+    AFFILIATE_STATS_VISITOR_PREFIX = 'affiliate:visitors'  # 순 방문자 HyperLogLog (Redis 키 접두사)
+    AFFILIATE_STATS_VISITOR_RETENTION_DAYS = 90  # 일별 HyperLogLog 보관 기간 (이전 범위는 버킷 합으로 조회)
+    
     # Affiliate Marketing APIs
     COUPANG_PARTNER_ID = os.environ.get('COUPANG_PARTNER_ID')
     COUPANG_PARTNER_SECRET = os.environ.get('COUPANG_PARTNER_SECRET')
     NAVER_SHOPPING_CLIENT_ID = os.environ.get('NAVER_SHOPPING_CLIENT_ID')
     NAVER_SHOPPING_CLIENT_SECRET = os.environ.get('NAVER_SHOPPING_CLIENT_SECRET')
+    COUPANG_API_BASE_URL = os.environ.get('COUPANG_API_BASE_URL') or 'https://api-gateway.coupang.com'
+    NAVER_SHOPPING_API_BASE_URL = os.environ.get('NAVER_SHOPPING_API_BASE_URL') or 'https://openapi.naver.com'
+    PARTNER_API_TIMEOUTS = {  # 제휴사별 (연결, 응답) 타임아웃 (초)
+        'coupang': (1.0, 2.5),
+        'naver_shopping': (0.5, 1.5),
+    }
+    PARTNER_HTTP_POOL_SIZE = 10  # 제휴사별 유지할 HTTP 연결 수 (프로세스당)
+    PARTNER_CIRCUIT_FAILURES = 5  # 연속 실패가 이만큼이면 호출 중단
+    PARTNER_CIRCUIT_RESET = 30  # 호출 중단 후 다시 시도하기까지 (초)
+    PARTNER_CATALOG_FRESH_SECONDS = 6 * 3600  # 이 시간 안에 받은 카탈로그 상품은 API 호출 없이 사용
+    PRODUCT_SEARCH_DEADLINE = 3.0  # 제휴사 API 동시 호출 전체 마감 시간 (초)
+    PRODUCT_SEARCH_CATALOG_MIN = 20  # 최근 카탈로그 상품이 이만큼 있으면 제휴사 API를 호출하지 않음
+    PRODUCT_SEARCH_WORKERS = 8  # 제휴사 API 호출 스레드 수 (프로세스당)
+    PRODUCT_SEARCH_CACHE_TIMEOUT = 1800  # 검색 결과 Redis TTL (초)
+    PRODUCT_SEARCH_CACHE_SOFT_TIMEOUT = 300  # 이후 요청은 기존 결과를 반환하며 백그라운드 갱신 (초)
+    PRODUCT_SEARCH_PARTIAL_TIMEOUT = 30  # 일부 제휴사가 빠진 결과를 다시 검색하기까지 (초)
+    PRICE_REFRESH_INTERVAL = 24 * 3600  # 제휴 링크 가격/이미지 확인 주기 (초)
+    PRICE_REFRESH_RETRY_AFTER = 3600  # 조회에 실패한 링크를 다시 확인하기까지 (초)
+    PRICE_REFRESH_BATCH_SIZE = 200  # 한 번에 가져와 커밋하는 링크 수
+    PRICE_REFRESH_CONCURRENCY = 4  # 제휴사별 동시 호출 수
+    PRICE_REFRESH_RATE_LIMITS = {  # 제휴사별 초당 호출 수 (제휴사 API 한도에 맞게 조정)
+        'coupang': 0.5,
+        'naver_shopping': 2.0,
+    }
+    PRICE_REFRESH_REVIEW_AFTER = 3  # 제휴사 검색에서 연속으로 이만큼 찾지 못한 링크는 확인 필요로 기록 (비활성화하지 않음)
+    PRICE_REFRESH_POLL_INTERVAL = 300  # refresh-prices --loop 실행 간격 (초)
+    LINK_HEALTH_CONCURRENCY = 200  # 링크 상태 점검 전체 동시 요청 수
+    LINK_HEALTH_PER_HOST = 16  # 호스트별 동시 요청 수
+    LINK_HEALTH_TIMEOUT = 10  # 요청 하나의 전체 시간 (리다이렉트 포함, 초)
+    LINK_HEALTH_CONNECT_TIMEOUT = 3  # 연결 시간 (초)
+    LINK_HEALTH_RETRIES = 2  # 429/5xx/네트워크 오류 재시도 횟수
+    LINK_HEALTH_BACKOFF = 1.0  # 첫 재시도 대기 시간, 이후 두 배씩 (초)
+    LINK_HEALTH_MAX_BACKOFF = 60  # 재시도/Retry-After 최대 대기 시간 (초)
+    LINK_HEALTH_BATCH_SIZE = 1000  # 링크를 읽고 결과를 저장하는 단위
+    LINK_HEALTH_FAIL_AFTER = 2  # 연속으로 이만큼 실패하면 broken으로 표시
+    AFFILIATE_WEBHOOK_SECRET = os.environ.get('AFFILIATE_WEBHOOK_SECRET')  # 전환 웹훅 HMAC 서명 키 (없으면 웹훅 비활성)
+    CONVERSION_CHUNK_SIZE = 500  # 전환 보고를 한 트랜잭션에서 반영하는 행 수
     
     # Google AdSense
     GOOGLE_ADSENSE_CLIENT_ID = os.environ.get('GOOGLE_ADSENSE_CLIENT_ID')
@@ -141,6 +255,11 @@ class TestingConfig(Config):
     # Use in-memory SQLite for testing
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     
+    # Redis 없이 실행
+    TIERED_CACHE_ENABLED = False
+    ENTITY_CACHE_ENABLED = False
+    FRAGMENT_CACHE_ENABLED = False
+    
     # Disable email sending in tests
     MAIL_SUPPRESS_SEND = True
     
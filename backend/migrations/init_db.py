@@ -9,6 +9,8 @@ import sys
 import logging
 from datetime import datetime
 
+from sqlalchemy import text
+
 # Flask 앱 경로 추가
 sys.path.append('/app')
 
@@ -18,8 +20,11 @@ from app.models.business import Business
 from app.models.review import Review
 from app.models.blog_post import BlogPost
 from app.models.category import Category
-from app.models.affiliate_link import AffiliateLink
+from app.models.affiliate_link import AffiliateLink, SHORT_CODE_BLOCK_SIZE
 from app.models.notification import Notification
+from app.models.change_log import ChangeLog
+from app.models.affiliate_stats import AffiliateStatsHourly, AffiliateStatsDaily
+from app.models.partner_catalog import CatalogProduct
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -48,6 +53,78 @@ def create_database_tables():
         logger.error(f"❌ 데이터베이스 테이블 생성 실패: {str(e)}")
         raise
 
+def upgrade_existing_tables():
+    """기존 테이블에 추가된 컬럼/시퀀스 반영 (create_all은 이미 있는 테이블을 변경하지 않음)"""
+    try:
+        logger.info("기존 테이블 스키마 갱신 시작...")
+        
+        app = create_app()
+        
+        with app.app_context():
+            with db.engine.begin() as conn:
+                # 제휴 링크 단축 코드 (블록 단위 예약 시퀀스, INCREMENT BY = SHORT_CODE_BLOCK_SIZE)
+                conn.execute(text(
+                    "CREATE SEQUENCE IF NOT EXISTS affiliate_short_code_seq "
+                    "START WITH :block INCREMENT BY :block"
+                ).bindparams(block=SHORT_CODE_BLOCK_SIZE))
+                conn.execute(text(
+                    "ALTER TABLE affiliate_links ADD COLUMN IF NOT EXISTS short_code VARCHAR(16)"
+                ))
+                conn.execute(text(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS affiliate_links_short_code_key "
+                    "ON affiliate_links (short_code)"
+                ))
+                # 제휴 상품 가격/판매 상태 갱신 (app/services/price_refresh.py)
+                conn.execute(text(
+                    "ALTER TABLE affiliate_links ADD COLUMN IF NOT EXISTS price_checked_at TIMESTAMP"
+                ))
+                conn.execute(text(
+                    "ALTER TABLE affiliate_links "
+                    "ADD COLUMN IF NOT EXISTS price_check_misses SMALLINT NOT NULL DEFAULT 0"
+                ))
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS idx_affiliate_price_due "
+                    "ON affiliate_links (partner, price_checked_at NULLS FIRST)"
+                ))
+                # 제휴 링크 상태 점검 (app/services/link_health.py)
+                for column in (
+                    "health_status VARCHAR(20)",
+                    "health_code SMALLINT",
+                    "health_error VARCHAR(200)",
+                    "health_failures SMALLINT NOT NULL DEFAULT 0",
+                    "health_checked_at TIMESTAMP",
+                ):
+                    conn.execute(text(f"ALTER TABLE affiliate_links ADD COLUMN IF NOT EXISTS {column}"))
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS idx_affiliate_health ON affiliate_links (health_status)"
+                ))
+                # 제휴 전환 보고 upsert (app/services/conversions.py)
+                conn.execute(text(
+                    "ALTER TABLE affiliate_link_conversions ADD COLUMN IF NOT EXISTS cancelled_at TIMESTAMP"
+                ))
+                conn.execute(text(
+                    "ALTER TABLE affiliate_link_conversions ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP"
+                ))
+                conn.execute(text(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS uq_conversion_link_order "
+                    "ON affiliate_link_conversions (affiliate_link_id, order_id)"
+                ))
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS idx_conversion_order ON affiliate_link_conversions (order_id)"
+                ))
+                # 제휴 상품 카탈로그 이름 검색 (ILIKE '%토큰%', similarity 정렬)
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS idx_partner_catalog_name_trgm "
+                    "ON partner_catalog USING gin (name gin_trgm_ops)"
+                ))
+            
+            logger.info("✅ 기존 테이블 스키마가 갱신되었습니다.")
+            
+    except Exception as e:
+        logger.error(f"❌ 기존 테이블 스키마 갱신 실패: {str(e)}")
+        raise
+
 def create_initial_data():
     """초기 데이터 생성"""
     try:
@@ -168,10 +245,13 @@ def main():
         # 2. 테이블 생성
         create_database_tables()
         
-        # 3. 초기 데이터 생성
+        # 3. 기존 테이블 스키마 갱신
+        upgrade_existing_tables()
+        
+        # 4. 초기 데이터 생성
         create_initial_data()
         
-        # 4. 추가 인덱스 생성
+        # 5. 추가 인덱스 생성
         create_indexes()
         
         logger.info("✅ 데이터베이스 마이그레이션이 성공적으로 완료되었습니다!")
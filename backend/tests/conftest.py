@@ -0,0 +1,148 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import event
+
+from app import db
+from app.services.partners import CoupangAdapter, NaverShoppingAdapter
+
+
+class FakePartnerServer:
+    """쿠팡 파트너스/네이버 쇼핑 검색 API를 흉내 내는 로컬 서버
+
+    delays: 제휴사별 응답 지연 (초), failing: 500으로 응답할 제휴사, requests: 제휴사별 요청 수
+    """
+
+    def __init__(self):
+        self.delays = Counter()
+        self.failing = set()
+        self.requests = Counter()
+        self._server = None
+
+    @property
+    def base_url(self):
+        return f'http://127.0.0.1:{self._server.server_port}'
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                if url.path == CoupangAdapter.path:
+                    partner, body = 'coupang', fake.coupang_body(params.get('keyword', ''), int(params.get('limit', 10)))
+                elif url.path == NaverShoppingAdapter.path:
+                    partner, body = 'naver_shopping', fake.naver_body(params.get('query', ''), int(params.get('display', 10)))
+                else:
+                    return self.reply(404, {})
+
+                fake.requests[partner] += 1
+                time.sleep(fake.delays[partner])
+                if partner in fake.failing:
+                    return self.reply(500, {})
+                self.reply(200, body)
+
+            def reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @staticmethod
+    def coupang_body(query, limit):
+        return {
+            'rCode': '0',
+            'data': {
+                'productData': [
+                    {
+                        'productId': 1000000 + index,
+                        'productName': f'{query} 쿠팡 상품 {index + 1}',
+                        'productPrice': 29900 + index * 1000,
+                        'productImage': f'https://thumbnail.coupangcdn.com/{index}.jpg',
+                        'productUrl': f'https://link.coupang.com/re/AFFSDP?pageKey={1000000 + index}',
+                        'categoryName': '반려동물용품',
+                    }
+                    for index in range(limit)
+                ]
+            }
+        }
+
+    @staticmethod
+    def naver_body(query, limit):
+        return {
+            'items': [
+                {
+                    'productId': str(2000000 + index),
+                    'title': f'<b>{query}</b> 네이버 상품 {index + 1}',
+                    'link': f'https://search.shopping.naver.com/catalog/{2000000 + index}',
+                    'lprice': str(25900 + index * 500),
+                    'category2': '반려동물',
+                }
+                for index in range(limit)
+            ]
+        }
+
+
+@pytest.fixture
+def partner_server():
+    server = FakePartnerServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def app(partner_server):
+    """가짜 제휴사 서버와 SQLite 메모리 DB를 쓰는 최소 앱 (Redis 캐시는 사용하지 않음)"""
+    app = Flask(__name__)
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI='sqlite://',
+        COUPANG_PARTNER_ID='test', COUPANG_PARTNER_SECRET='test', COUPANG_API_BASE_URL=partner_server.base_url,
+        NAVER_SHOPPING_CLIENT_ID='test', NAVER_SHOPPING_CLIENT_SECRET='test',
+        NAVER_SHOPPING_API_BASE_URL=partner_server.base_url,
+        PARTNER_API_TIMEOUTS={'coupang': (1.0, 3.0), 'naver_shopping': (1.0, 3.0)},
+        PARTNER_CIRCUIT_FAILURES=3,
+        PRODUCT_SEARCH_DEADLINE=0.5,
+        PRODUCT_SEARCH_CATALOG_MIN=5,
+    )
+    db.init_app(app)
+
+    with app.app_context():
+        # 카탈로그 검색 정렬에 쓰는 pg_trgm similarity() 대용
+        @event.listens_for(db.engine, 'connect')
+        def register_similarity(connection, _):
+            connection.create_function('similarity', 2, lambda name, query: float(query in (name or '')))
+
+        from app.models.partner_catalog import CatalogProduct
+
+        CatalogProduct.__table__.create(db.engine)
+        yield app
+        db.session.remove()
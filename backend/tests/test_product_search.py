@@ -0,0 +1,76 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from app import db
+from app.models.partner_catalog import CatalogProduct
+from app.services.partners import PartnerError, partners
+from app.services.product_search import ProductSearch
+
+
+@pytest.fixture
+def search(app):
+    search = ProductSearch()
+    search.init_app(app)
+    yield search
+    search.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def test_merges_results_from_both_partners(search, partner_server):
+    result = search.search('강아지 사료', limit=20)
+
+    assert result['failed'] == []
+    assert {product['partner'] for product in result['products']} == {'coupang', 'naver_shopping'}
+    # 제휴사별 결과를 번갈아 합침
+    assert [product['partner'] for product in result['products'][:4]] == ['coupang', 'naver_shopping'] * 2
+    assert len(result['products']) == 20
+    assert partner_server.requests == {'coupang': 1, 'naver_shopping': 1}
+
+
+def test_slow_partner_is_reported_and_search_returns_by_deadline(search, partner_server):
+    partner_server.delays['naver_shopping'] = 2.0
+
+    started = time.monotonic()
+    result = search.search('고양이 모래', limit=10)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 1.5
+    assert result['failed'] == ['naver_shopping']
+    assert result['products']
+    assert {product['partner'] for product in result['products']} == {'coupang'}
+
+
+def test_circuit_breaker_opens_after_repeated_failures(app, partner_server):
+    partners.init_app(app)
+    partner_server.failing.add('coupang')
+    adapter = partners.get('coupang')
+
+    for _ in range(3):
+        with pytest.raises(PartnerError):
+            adapter.search('간식', 10)
+    assert adapter.breaker.state == 'open'
+
+    # 회로가 열리면 제휴사를 호출하지 않음
+    with pytest.raises(PartnerError):
+        adapter.search('간식', 10)
+    assert partner_server.requests['coupang'] == 3
+
+
+def test_fresh_catalog_hit_makes_no_partner_calls(search, partner_server):
+    db.session.add_all([
+        CatalogProduct(
+            partner='coupang', partner_product_id=str(index), name=f'강아지 사료 {index}kg',
+            price=10000 + index, product_url=f'https://www.coupang.com/vp/products/{index}',
+            affiliate_url=f'https://link.coupang.com/a/{index}', fetched_at=datetime.utcnow()
+        )
+        for index in range(5)
+    ])
+    db.session.commit()
+
+    result = search.search('강아지  사료', partner='coupang', limit=3)
+
+    assert partner_server.requests == {}
+    assert result['failed'] == []
+    assert len(result['products']) == 3
+    assert all(product['id'].startswith('coupang:') for product in result['products'])
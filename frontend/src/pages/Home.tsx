@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import { businessAPI, Business } from '../services/api';
+import { homeAPI, Business } from '../services/api';
 import ProductRecommendation from '../components/Affiliate/ProductRecommendation';
 import SponsoredContent from '../components/Ads/SponsoredContent';
 import AdUnit from '../components/Ads/AdUnit';
@@ -16,8 +16,8 @@ const Home: React.FC = () => {
 
   const loadFeaturedBusinesses = async () => {
     try {
-      const response = await businessAPI.getFeatured();
-      setFeaturedBusinesses(response.data.data);
+      const response = await homeAPI.getFeed();
+      setFeaturedBusinesses(response.data.data.featured_businesses);
     } catch (error) {
       console.error('Featured businesses loading error:', error);
     } finally {
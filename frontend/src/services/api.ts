@@ -180,6 +180,9 @@ export const businessAPI = {
   getBusiness: (id: string): Promise<AxiosResponse<{ data: Business }>> =>
     api.get(`/businesses/${id}`),
 
+  getBusinessesByIds: (ids: string[]): Promise<AxiosResponse<{ data: { businesses: Business[]; missing: string[] } }>> =>
+    api.get('/businesses', { params: { ids: ids.join(',') } }),
+
   createBusiness: (data: Partial<Business>): Promise<AxiosResponse<{ data: Business }>> =>
     api.post('/businesses', data),
 
@@ -491,4 +494,19 @@ export const affiliateAPI = {
     api.get('/affiliate/earnings/report', { params })
 };
 
+// Home API
+export interface HomeFeed {
+  featured_businesses: Business[];
+  featured_posts: BlogPost[];
+  trending_tags: Array<{ id: string; name: string; slug: string; usage_count: number }>;
+  categories: Array<{ code: string; name: string; count: number }>;
+  nearby: Array<Business & { distance: number }>;
+  generated_at: string;
+}
+
+export const homeAPI = {
+  getFeed: (location?: { lat: number; lng: number; radius?: number }): Promise<AxiosResponse<{ data: HomeFeed }>> =>
+    api.get('/home', { params: location })
+};
+
 export default api;
\ No newline at end of file